@@ -0,0 +1,75 @@
+"""Hit-testing benchmark for Window.find_at and Window.find_in.
+
+Scatters n small circles, rectangles and polygons over a headless window
+and times building the spatial index, point queries, area queries and
+keeping the index current while objects move.
+
+    python benchmarks/bench_hit_test.py [--count 100000] [--queries 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Circle, Point, Polygon, Rectangle, Window  # noqa: E402
+
+SIZE = 500
+
+
+def make_shape(rand):
+    x, y = rand.randrange(SIZE), rand.randrange(SIZE)
+    kind = rand.randrange(3)
+    if kind == 0:
+        return Circle(Point(x, y), rand.randrange(1, 6))
+    if kind == 1:
+        return Rectangle(Point(x, y), Point(x + rand.randrange(1, 8),
+                                            y + rand.randrange(1, 8)))
+    return Polygon([Point(x, y), Point(x + 6, y + 2), Point(x + 2, y + 7)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    rand = random.Random(42)
+    win = Window("Hit test", SIZE, SIZE, autoflush=False, backend="headless")
+    shapes = [make_shape(rand) for _ in range(args.count)]
+    for shape in shapes:
+        shape.draw(win)
+
+    start = time.perf_counter()
+    win.find_at(Point(0, 0))
+    print(f"index build:  {(time.perf_counter() - start) * 1000:8.1f} ms "
+          f"for {args.count} objects")
+
+    points = [Point(rand.randrange(SIZE), rand.randrange(SIZE))
+              for _ in range(args.queries)]
+    start = time.perf_counter()
+    hits = sum(len(win.find_at(p)) for p in points)
+    elapsed = time.perf_counter() - start
+    print(f"find_at:      {elapsed / args.queries * 1000:8.3f} ms per query "
+          f"({hits / args.queries:.1f} hits on average)")
+
+    areas = [Rectangle(p, Point(p.x + 20, p.y + 20)) for p in points]
+    start = time.perf_counter()
+    for area in areas:
+        win.find_in(area)
+    elapsed = time.perf_counter() - start
+    print(f"find_in:      {elapsed / args.queries * 1000:8.3f} ms per query")
+
+    moving = shapes[:args.queries]
+    start = time.perf_counter()
+    for shape in moving:
+        shape.move(17, 9)
+    elapsed = time.perf_counter() - start
+    print(f"move+reindex: {elapsed / len(moving) * 1e6:8.2f} us per move")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Import-time benchmark for graphix.
+
+Runs "python -X importtime -c 'import graphix'" several times in fresh
+interpreters and reports the median cumulative import time of the graphix
+module. Exits with status 1 if the median is over the budget, so it can be
+used as a check in CI.
+
+    python benchmarks/bench_import.py [--budget-ms 60] [--runs 9]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_us(module="graphix"):
+    """Returns the cumulative import time of module in microseconds, as
+    reported by -X importtime in a fresh interpreter."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = REPO
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             f"import {module}"],
+                            env=env, capture_output=True, text=True,
+                            check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+
+    import_time_us()  # warm up: writes the bytecode cache
+    times = [import_time_us() / 1000 for _ in range(args.runs)]
+    median = statistics.median(times)
+    print(f"import graphix: median {median:.1f} ms, "
+          f"min {min(times):.1f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        print("FAIL: import time over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
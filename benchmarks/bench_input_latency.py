@@ -0,0 +1,92 @@
+"""Click-to-return latency benchmark for Window.get_mouse and get_key.
+
+Synthesises clicks and key presses with Tk's event_generate at a known
+moment and measures how long get_mouse/get_key take to return after it.
+Also reports the CPU time used while get_mouse sits idle waiting for a
+click that never comes. Needs a display (a real one or Xvfb).
+
+    python benchmarks/bench_input_latency.py [--samples 50]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Window  # noqa: E402
+
+
+def click_latency(win, samples):
+    """Returns a list of seconds from generating a click to get_mouse
+    returning it."""
+    latencies = []
+    for i in range(samples):
+        sent = []
+
+        def click(x=i % win.width):
+            sent.append(time.perf_counter())
+            win.event_generate("<Button-1>", x=x, y=10, when="tail")
+
+        win.after(5, click)
+        win.get_mouse()
+        latencies.append(time.perf_counter() - sent[0])
+    return latencies
+
+
+def key_latency(win, samples):
+    """Returns a list of seconds from generating a key press to get_key
+    returning it."""
+    latencies = []
+    win.focus_force()
+    for _ in range(samples):
+        sent = []
+
+        def press():
+            sent.append(time.perf_counter())
+            win.event_generate("<Key>", keysym="a", when="tail")
+
+        win.after(5, press)
+        win.get_key()
+        latencies.append(time.perf_counter() - sent[0])
+    return latencies
+
+
+def idle_cpu(win, seconds):
+    """Returns the CPU seconds used by get_mouse while waiting seconds for
+    a click that doesn't arrive."""
+    start = time.process_time()
+    win.get_mouse(timeout=seconds)
+    return time.process_time() - start
+
+
+def report(name, latencies):
+    ms = sorted(t * 1000 for t in latencies)
+    print(f"{name}: median {statistics.median(ms):.2f} ms, "
+          f"p95 {ms[int(len(ms) * 0.95) - 1]:.2f} ms, max {ms[-1]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    try:
+        win = Window("Latency", 200, 200)
+    except tk.TclError as e:
+        print(f"skipped: no display ({e})")
+        return
+    report("get_mouse", click_latency(win, args.samples))
+    report("get_key", key_latency(win, args.samples))
+    cpu = idle_cpu(win, args.idle_seconds)
+    print(f"idle get_mouse: {cpu * 1000:.1f} ms CPU "
+          f"over {args.idle_seconds:.1f} s")
+    win.close()
+
+
+if __name__ == "__main__":
+    main()
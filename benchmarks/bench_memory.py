@@ -0,0 +1,53 @@
+"""Memory-per-object benchmark for the graphix shapes.
+
+Uses tracemalloc to measure the memory held by n undrawn instances of each
+shape class, and reports the average per object.
+
+    python benchmarks/bench_memory.py [--count 10000]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Circle, Line, Oval, Point, Polygon, Rectangle, Text  # noqa: E402
+
+FACTORIES = {
+    "Point": lambda i: Point(i, i),
+    "Rectangle": lambda i: Rectangle(Point(i, i), Point(i + 5, i + 5)),
+    "Oval": lambda i: Oval(Point(i, i), Point(i + 5, i + 9)),
+    "Circle": lambda i: Circle(Point(i, i), 5),
+    "Line": lambda i: Line(Point(i, i), Point(i + 5, i + 5)),
+    "Polygon(8)": lambda i: Polygon([Point(i + k, i * k) for k in range(8)]),
+    "Text": lambda i: Text(Point(i, i), "label"),
+}
+
+
+def bytes_per_object(factory, count):
+    """Returns the average number of bytes held by one object made by
+    factory, measured over count objects."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding the objects
+    held = after - before - sys.getsizeof(objects)
+    del objects
+    return held / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+    for name, factory in FACTORIES.items():
+        size = bytes_per_object(factory, args.count)
+        print(f"{name:>12}: {size:8.1f} bytes per object")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Parallel scene building benchmark: build_parallel against one process.
+
+Builds a Mandelbrot set picture out of small coloured rectangles, one
+chunk of rows per call, and draws it in a headless window: first by
+calling the chunk function in this process, then with build_parallel for
+each number of workers asked for. Reports the times and the pickled size
+of the objects sent back per rectangle.
+
+    python benchmarks/bench_parallel.py [--side 300] [--workers 1,2,4]
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Point, Rectangle, Window, build_parallel  # noqa: E402
+
+CELL = 2
+ITERATIONS = 200
+COLOURS = ["black", "navy", "blue", "light blue", "cyan", "white"]
+
+
+def mandelbrot_rows(rows):
+    """Returns a rectangle for every cell outside the set in rows, a
+    (first, last, side) tuple."""
+    first, last, side = rows
+    shapes = []
+    for row in range(first, last):
+        ci = (row / side - 0.5) * 2.4
+        for column in range(side):
+            cr = column / side * 3.0 - 2.1
+            zr = zi = 0.0
+            steps = 0
+            while steps < ITERATIONS and zr * zr + zi * zi < 4.0:
+                zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+                steps += 1
+            if steps < ITERATIONS:
+                x, y = column * CELL, row * CELL
+                shape = Rectangle(Point(x, y), Point(x + CELL, y + CELL))
+                shape.fill_colour = COLOURS[steps % len(COLOURS)]
+                shape.outline_width = 0
+                shapes.append(shape)
+    return shapes
+
+
+def chunks(side, size=10):
+    return [(first, min(first + size, side), side)
+            for first in range(0, side, size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--side", type=int, default=300,
+                        help="cells along each side of the picture")
+    parser.add_argument("--workers", default=f"1,2,{os.cpu_count() or 1}")
+    args = parser.parse_args()
+    size = args.side * CELL
+
+    win = Window("Serial", size, size, autoflush=False, backend="headless")
+    start = time.perf_counter()
+    count = 0
+    for chunk in chunks(args.side):
+        shapes = mandelbrot_rows(chunk)
+        with win.batch():
+            for shape in shapes:
+                shape.draw(win)
+        count += len(shapes)
+    serial = time.perf_counter() - start
+    print(f"{count} rectangles")
+    print(f"  one process:     {serial:7.2f} s")
+
+    sample = mandelbrot_rows(chunks(args.side)[len(chunks(args.side)) // 2])
+    pickled = len(pickle.dumps(sample, pickle.HIGHEST_PROTOCOL))
+    for workers in sorted({int(n) for n in args.workers.split(",")}):
+        win = Window("Parallel", size, size, autoflush=False,
+                     backend="headless")
+        start = time.perf_counter()
+        built = build_parallel(mandelbrot_rows, chunks(args.side), win,
+                               workers=workers)
+        elapsed = time.perf_counter() - start
+        assert len(built) == count == len(win.get_items())
+        print(f"  {workers:2d} workers:      {elapsed:7.2f} s  "
+              f"({serial / elapsed:.1f}x)")
+    print(f"  pickled size:    {pickled / max(1, len(sample)):7.1f} bytes "
+          f"per rectangle")
+
+
+if __name__ == "__main__":
+    main()
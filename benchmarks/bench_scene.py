@@ -0,0 +1,56 @@
+"""Scene registry benchmark: drawing, undrawing and clearing many objects.
+
+Draws n small rectangles into a headless window, then undraws them
+newest first (the worst case for a list-based registry, where every
+removal scans the whole list), draws them again, clears the window in
+one call and finally redraws it.
+
+    python benchmarks/bench_scene.py [--count 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Point, Rectangle, Window  # noqa: E402
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>8}: {elapsed:8.3f} s  "
+          f"({elapsed / count * 1e6:6.2f} us per object)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    win = Window("Scene", 500, 500, autoflush=False, backend="headless")
+    shapes = [Rectangle(Point(i % 500, i // 500 % 500),
+                        Point(i % 500 + 2, i // 500 % 500 + 2))
+              for i in range(args.count)]
+
+    def draw_all():
+        for shape in shapes:
+            shape.draw(win)
+
+    def undraw_all():
+        for shape in reversed(shapes):
+            shape.undraw()
+
+    timed("draw", draw_all, args.count)
+    timed("undraw", undraw_all, args.count)
+    draw_all()
+    timed("clear", win.clear, args.count)
+    draw_all()
+    timed("redraw", win.redraw, args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Scene file benchmark: save_scene/load_scene against pickle and against
+running the code that built the scene again.
+
+Builds a scene of n mixed rectangles, circles, lines, polygons and labels
+in a headless window, then times rebuilding it from scratch, saving and
+loading it as a scene file, and pickling and unpickling the objects and
+drawing them again. Reports the file sizes too.
+
+    python benchmarks/bench_scene_file.py [--count 100000]
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import (Circle, Line, Point, Polygon, Rectangle,  # noqa: E402
+                     Text, Window)
+
+SIDE = 500
+COLOURS = ["red", "green", "blue", "yellow", "grey50", "light blue"]
+
+
+def build(count, seed=1):
+    """Returns a headless window with count objects drawn in it."""
+    rand = random.Random(seed)
+    win = Window("Scene", SIDE, SIDE, autoflush=False, backend="headless")
+    with win.batch():
+        for i in range(count):
+            x, y = rand.randrange(SIDE), rand.randrange(SIDE)
+            kind = i % 5
+            if kind == 0:
+                shape = Rectangle(Point(x, y), Point(x + 6, y + 4))
+            elif kind == 1:
+                shape = Circle(Point(x, y), rand.randrange(1, 8))
+            elif kind == 2:
+                shape = Line(Point(x, y), Point(x + 9, y + 3))
+            elif kind == 3:
+                shape = Polygon([Point(x + dx, y + dy)
+                                 for dx, dy in ((0, 0), (6, 1), (4, 7))])
+            else:
+                shape = Text(Point(x, y), f"#{i % 100}")
+            if kind != 4:
+                shape.fill_colour = rand.choice(COLOURS)
+            shape.draw(win)
+    return win
+
+
+def timed(func):
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rebuild_time, win = timed(lambda: build(args.count))
+    with tempfile.TemporaryDirectory() as folder:
+        scene_path = os.path.join(folder, "scene.grx")
+        pickle_path = os.path.join(folder, "scene.pickle")
+
+        save_time, _ = timed(lambda: win.save_scene(scene_path))
+        load_time, loaded = timed(
+            lambda: Window.load_scene(scene_path, backend="headless"))
+        assert len(loaded.get_items()) == args.count
+
+        def pickle_dump():
+            objects = [item.clone() for item in win.get_items()]
+            with open(pickle_path, "wb") as pickle_file:
+                pickle.dump(objects, pickle_file, pickle.HIGHEST_PROTOCOL)
+
+        def pickle_load():
+            with open(pickle_path, "rb") as pickle_file:
+                objects = pickle.load(pickle_file)
+            other = Window("Scene", SIDE, SIDE, autoflush=False,
+                           backend="headless")
+            with other.batch():
+                for obj in objects:
+                    obj.draw(other)
+            return other
+
+        dump_time, _ = timed(pickle_dump)
+        unpickle_time, _ = timed(pickle_load)
+        scene_size = os.path.getsize(scene_path)
+        pickle_size = os.path.getsize(pickle_path)
+
+    print(f"{args.count} objects")
+    print(f"  rebuild from code:     {rebuild_time:7.3f} s")
+    print(f"  save_scene:            {save_time:7.3f} s  "
+          f"{scene_size / 1e6:6.2f} MB")
+    print(f"  load_scene:            {load_time:7.3f} s")
+    print(f"  pickle dump:           {dump_time:7.3f} s  "
+          f"{pickle_size / 1e6:6.2f} MB")
+    print(f"  pickle load and draw:  {unpickle_time:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Live chart benchmark: a Line per segment against one Series.
+
+Plots n samples of a noisy signal in a headless window, first as a new
+Line for every segment (undrawing the oldest once the chart is full) and
+then by appending to a Series, scrolling it as it goes, and reports
+samples per second and how many canvas commands each way sent. The
+Series is also fed from a NumPy array with extend, a block of samples at
+a time.
+
+    python benchmarks/bench_series.py [--samples 100000] [--width 500]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+import graphix  # noqa: E402
+from graphix import Line, Point, Series, Window  # noqa: E402
+
+HEIGHT = 200
+BLOCK = 250
+
+
+def signal(count):
+    """A flat list of heights for count samples of a noisy wave."""
+    return [int(HEIGHT / 2 + 60 * math.sin(i / 40) + 20 * math.sin(i * 1.7))
+            for i in range(count)]
+
+
+def segments(win, heights, width):
+    # One Line per pair of samples, keeping only the latest width of them
+    shown = deque()
+    for i in range(1, len(heights)):
+        line = Line(Point(i - 1, heights[i - 1]), Point(i, heights[i]))
+        line.draw(win)
+        shown.append(line)
+        if len(shown) >= width:
+            shown.popleft().undraw()
+    return len(shown) + 1
+
+
+def series(win, heights, width):
+    # Appends to one Series, moving it left a quarter of the window at a
+    #   time to keep the newest samples in view
+    plot = Series(max_points=width)
+    plot.draw(win)
+    step = max(1, width // 4)
+    scrolled = 0
+    for i, y in enumerate(heights):
+        if i - scrolled >= width:
+            plot.move(-step, 0)
+            scrolled += step
+        plot.append(i - scrolled, y)
+    return len(plot)
+
+
+def series_blocks(win, heights, width):
+    # Extends one Series with a NumPy array of BLOCK samples at a time
+    plot = Series(max_points=width)
+    plot.draw(win)
+    xs = np.arange(len(heights), dtype=np.int32)
+    ys = np.array(heights, dtype=np.int32)
+    block = np.column_stack((xs, ys))
+    for start in range(0, len(heights), BLOCK):
+        plot.extend(block[start:start + BLOCK])
+    return len(plot)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--width", type=int, default=500,
+                        help="samples shown at once")
+    args = parser.parse_args()
+    heights = signal(args.samples)
+
+    print(f"{args.samples} samples, {args.width} shown")
+    for label, plot in (("Line per segment", segments),
+                       ("Series.append", series),
+                       ("Series.extend", series_blocks)):
+        win = Window("Series", args.width, HEIGHT, backend="headless")
+        with graphix.profile() as stats:
+            start = time.perf_counter()
+            shown = plot(win, heights, args.width)
+            elapsed = time.perf_counter() - start
+        operations = stats.as_dict()["operations"]
+        calls = sum(row["count"] for name, row in operations.items()
+                    if name != "event_wait")
+        print(f"  {label + ':':18} {args.samples / elapsed / 1000:8.1f}k "
+              f"samples/s  {calls:7d} canvas calls  {shown} points shown")
+        win.close()
+
+
+if __name__ == "__main__":
+    main()
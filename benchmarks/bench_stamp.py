@@ -0,0 +1,101 @@
+"""Shape stamping benchmark: stamp() against clone, move and draw.
+
+Tiles a headless window with n copies of one styled shape of each kind,
+first the way programs did it before stamp() existed (rebuilding the
+shape through its constructor, then moving and drawing it), then with
+clone() followed by move() and draw(), and finally with stamp(), which
+draws each copy in its place with no separate move. The best of several
+runs is reported.
+
+    python benchmarks/bench_stamp.py [--count 10000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Circle, Point, Polygon, Rectangle, Text, Window  # noqa: E402
+
+SIDE = 500
+
+
+def shapes():
+    circle = Circle(Point(5, 5), 4)
+    rectangle = Rectangle(Point(1, 1), Point(8, 6))
+    polygon = Polygon([Point(0, 0), Point(8, 2), Point(6, 8), Point(1, 6)])
+    text = Text(Point(5, 5), "pea")
+    for shape in (circle, rectangle, polygon):
+        shape.fill_colour = "green"
+        shape.outline_width = 2
+    return {"Circle": circle, "Rectangle": rectangle,
+            "Polygon": polygon, "Text": text}
+
+
+def rebuild(shape):
+    # What clone() used to do: go back through the public constructor
+    if isinstance(shape, Circle):
+        other = Circle(shape.get_centre(), shape.radius)
+    elif isinstance(shape, Rectangle):
+        other = Rectangle(shape.get_p1(), shape.get_p2())
+    elif isinstance(shape, Polygon):
+        other = Polygon(shape.get_points())
+    else:
+        other = Text(shape._anchor, shape.text)
+    other._config = shape._config.copy()
+    return other
+
+
+def constructor_move_draw(shape, win, offsets):
+    for dx, dy in offsets:
+        other = rebuild(shape)
+        other.move(dx, dy)
+        other.draw(win)
+
+
+def clone_move_draw(shape, win, offsets):
+    for dx, dy in offsets:
+        other = shape.clone()
+        other.move(dx, dy)
+        other.draw(win)
+
+
+def stamp(shape, win, offsets):
+    for dx, dy in offsets:
+        shape.stamp(win, dx, dy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    offsets = [(i * 10 % SIDE, i * 10 // SIDE * 10 % SIDE)
+               for i in range(args.count)]
+    methods = {"constructor": constructor_move_draw,
+               "clone+move": clone_move_draw,
+               "stamp": stamp}
+    for name, shape in shapes().items():
+        times = dict.fromkeys(methods, float("inf"))
+        for _ in range(args.repeat):
+            for method, func in methods.items():
+                win = Window("Stamp", SIDE, SIDE, autoflush=False,
+                             backend="headless")
+                gc.collect()
+                start = time.perf_counter()
+                func(shape, win, offsets)
+                elapsed = time.perf_counter() - start
+                times[method] = min(times[method], elapsed)
+                win.close()
+        line = "  ".join(f"{method} {elapsed / args.count * 1e6:6.2f} us"
+                         for method, elapsed in times.items())
+        speedup = times["constructor"] / times["stamp"]
+        print(f"{name:>10}: {line}  ({speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
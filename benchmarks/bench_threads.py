@@ -0,0 +1,91 @@
+"""Thread stress test: several producer threads drawing into one window.
+
+Each producer thread draws n rectangles in its own row of a window, then
+moves, recolours and undraws some of them, while the window's thread
+keeps making the queued changes. The command limit is kept small so the
+producers are regularly held back. At the end the window is checked
+against what the producers asked for, and the throughput and the
+longest the queue got are reported.
+
+    python benchmarks/bench_threads.py [--threads 8] [--count 5000]
+                                       [--limit 1000] [--backend headless]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graphix import Point, Rectangle, Window  # noqa: E402
+
+SIDE = 500
+COLOURS = ["red", "green", "blue", "yellow"]
+
+
+def produce(win, row, count, shapes):
+    # Four changes per rectangle, plus an undraw for every fourth one
+    y = row * 6 % SIDE
+    for i in range(count):
+        x = i % (SIDE - 10)
+        shape = Rectangle(Point(x, y), Point(x + 4, y + 4))
+        shape.draw(win)
+        shape.move(1, 1)
+        shape.fill_colour = COLOURS[i % len(COLOURS)]
+        shape.outline_width = 2
+        if i % 4 == 3:
+            shape.undraw()
+        else:
+            shapes.append((shape, x + 1, y + 1, COLOURS[i % len(COLOURS)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=1000,
+                        help="command limit set on the window")
+    parser.add_argument("--backend", default="headless",
+                        choices=["headless", "tk"])
+    args = parser.parse_args()
+
+    win = Window("Threads", SIDE, SIDE, autoflush=False, backend=args.backend)
+    win.set_command_limit(args.limit)
+    expected = [[] for _ in range(args.threads)]
+    producers = [threading.Thread(target=produce,
+                                  args=(win, row, args.count, expected[row]))
+                 for row in range(args.threads)]
+
+    longest = 0
+    start = time.perf_counter()
+    for producer in producers:
+        producer.start()
+    while any(producer.is_alive() for producer in producers):
+        longest = max(longest, len(win._commands))
+        win.flush()
+        time.sleep(0.001)
+    for producer in producers:
+        producer.join()
+    win.flush()
+    elapsed = time.perf_counter() - start
+
+    drawn = set(win.get_items())
+    wanted = [entry for rows in expected for entry in rows]
+    wrong = sum(1 for shape, x, y, colour in wanted
+                if shape not in drawn or shape.get_p1().x != x
+                or shape.get_p1().y != y or shape.fill_colour != colour)
+    calls = args.threads * args.count * 4 + args.threads * args.count // 4
+    print(f"{args.threads} threads x {args.count} rectangles: "
+          f"{calls} calls in {elapsed:.2f} s "
+          f"({calls / elapsed / 1000:.0f}k calls per second)")
+    print(f"  longest queue {longest} (limit {args.limit}), "
+          f"{len(drawn)} drawn, {len(wanted)} expected, {wrong} wrong")
+    win.close()
+    if wrong or len(drawn) != len(wanted):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
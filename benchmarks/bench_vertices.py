@@ -0,0 +1,105 @@
+"""Large vertex count benchmark for Polygon and Polyline.
+
+Builds a Polygon and a Polyline with n vertices (100,000 by default) from
+Points and with from_coords from a list, an array('i') and a NumPy array,
+then times drawing, moving (with hit-testing switched on, so every move
+also updates the spatial index) and reading the points back, and reports
+the memory held per vertex. Runs in a headless window.
+
+    python benchmarks/bench_vertices.py [--count 100000] [--moves 100]
+"""
+
+import argparse
+import gc
+import math
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from graphix import Point, Polygon, Polyline, Window  # noqa: E402
+
+SIDE = 500
+
+
+def outline(count):
+    """A flat coordinate list tracing a wobbly circle of count vertices."""
+    coords = []
+    for i in range(count):
+        angle = 2 * math.pi * i / count
+        radius = 200 + 20 * math.sin(angle * 50)
+        coords.append(int(SIDE / 2 + radius * math.cos(angle)))
+        coords.append(int(SIDE / 2 + radius * math.sin(angle)))
+    return coords
+
+
+def timed(func):
+    gc.collect()
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def memory_per_vertex(func, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    shape = func()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del shape
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--moves", type=int, default=100)
+    args = parser.parse_args()
+
+    coords = outline(args.count)
+    points = [Point(coords[i], coords[i + 1])
+              for i in range(0, len(coords), 2)]
+    sources = {"Points": points, "list": coords,
+               "array('i')": array("i", coords),
+               "numpy": np.array(coords, dtype=np.int32).reshape(-1, 2)}
+
+    for cls in (Polygon, Polyline):
+        print(f"{cls.__name__} with {args.count} vertices")
+        for name, source in sources.items():
+            if name == "Points":
+                build = lambda: cls(source)  # noqa: E731
+            else:
+                build = lambda: cls.from_coords(source)  # noqa: E731
+            elapsed, shape = timed(build)
+            print(f"  build from {name + ':':12} {elapsed * 1000:8.2f} ms")
+        win = Window("Vertices", SIDE, SIDE, autoflush=False,
+                     backend="headless")
+        elapsed, _ = timed(lambda: shape.draw(win))
+        print(f"  {'draw:':23} {elapsed * 1000:8.2f} ms")
+        # Building the spatial index makes every move update it too
+        win.find_at(Point(0, 0))
+
+        def move():
+            for _ in range(args.moves):
+                shape.move(1, 0)
+                win.find_at(Point(0, 0))
+        elapsed, _ = timed(move)
+        print(f"  {'move and hit-test:':23} "
+              f"{elapsed / args.moves * 1e6:8.2f} us per move")
+        elapsed, _ = timed(shape.get_coords)
+        print(f"  {'get_coords:':23} {elapsed * 1000:8.2f} ms")
+        elapsed, _ = timed(shape.get_points)
+        print(f"  {'get_points:':23} {elapsed * 1000:8.2f} ms")
+        used = memory_per_vertex(lambda: cls.from_coords(coords), args.count)
+        print(f"  {'memory:':23} {used:8.2f} bytes per vertex")
+        win.close()
+
+
+if __name__ == "__main__":
+    main()
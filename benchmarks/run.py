@@ -0,0 +1,258 @@
+"""Benchmark suite for the graphix hot paths, with stored baselines.
+
+Times drawing, undrawing, moving, reconfiguring and redrawing n shapes,
+Polygons with n vertices, Text property changes and Entry creation, for
+each n in the chosen sizes, along with the import time of graphix and
+the memory held per object. Every result is a cost, so lower is better:
+times are microseconds per object (or per vertex), memory is bytes per
+object.
+
+Results are compared against a JSON baseline in benchmarks/baselines/,
+one per backend, and the run fails with status 1 if any result is more
+than the threshold (a fraction, 0.25 by default) worse than its
+baseline. --save writes the results as the new baseline instead. The
+headless backend needs no display; the Tk backend needs one (a real one
+or Xvfb). Entry boxes can only be timed with the Tk backend.
+
+    python benchmarks/run.py [--backend headless] [--sizes 10,100,1000]
+                             [--threshold 0.25] [--save] [--only draw,move]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS))
+sys.path.insert(0, BENCHMARKS)
+
+from graphix import (Entry, Point, Polygon, Rectangle, Text,  # noqa: E402
+                     Window)
+from bench_import import import_time_us  # noqa: E402
+from bench_memory import FACTORIES, bytes_per_object  # noqa: E402
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+# Entry boxes are Tk widgets, far heavier than canvas items
+ENTRY_LIMIT = 1_000
+# Small sizes are run enough times to time at least this many objects,
+#   and the fastest run is kept
+MIN_OBJECTS = 20_000
+SIDE = 500
+
+
+def rectangles(n):
+    return [Rectangle(Point(i % SIDE, i // SIDE % SIDE),
+                      Point(i % SIDE + 3, i // SIDE % SIDE + 3))
+            for i in range(n)]
+
+
+def drawn_rectangles(win, n):
+    shapes = rectangles(n)
+    with win.batch():
+        for shape in shapes:
+            shape.draw(win)
+    return shapes
+
+
+def bench_draw(win, n):
+    shapes = rectangles(n)
+    start = time.perf_counter()
+    for shape in shapes:
+        shape.draw(win)
+    return time.perf_counter() - start
+
+
+def bench_undraw(win, n):
+    shapes = drawn_rectangles(win, n)
+    start = time.perf_counter()
+    for shape in shapes:
+        shape.undraw()
+    return time.perf_counter() - start
+
+
+def bench_move(win, n):
+    shapes = drawn_rectangles(win, n)
+    start = time.perf_counter()
+    for shape in shapes:
+        shape.move(1, 1)
+    return time.perf_counter() - start
+
+
+def bench_reconfig(win, n):
+    shapes = drawn_rectangles(win, n)
+    start = time.perf_counter()
+    for shape in shapes:
+        shape.fill_colour = "red"
+    return time.perf_counter() - start
+
+
+def bench_redraw(win, n):
+    drawn_rectangles(win, n)
+    start = time.perf_counter()
+    win.redraw()
+    return time.perf_counter() - start
+
+
+def bench_polygon(win, n):
+    # Builds, draws, moves and undraws one polygon with n vertices
+    points = [Point(i % SIDE, (i * 7) % SIDE) for i in range(n)]
+    start = time.perf_counter()
+    polygon = Polygon(points)
+    polygon.draw(win)
+    polygon.move(1, 1)
+    polygon.get_points()
+    polygon.undraw()
+    return time.perf_counter() - start
+
+
+def bench_text(win, n):
+    labels = [Text(Point(i % SIDE, i // SIDE % SIDE), "label")
+              for i in range(n)]
+    with win.batch():
+        for label in labels:
+            label.draw(win)
+    start = time.perf_counter()
+    for label in labels:
+        label.text = "changed"
+        label.size = 14
+        label.style = "bold"
+    return time.perf_counter() - start
+
+
+def bench_entry(win, n):
+    start = time.perf_counter()
+    for i in range(n):
+        Entry(Point(i % SIDE, i // SIDE % SIDE), 5).draw(win)
+    return time.perf_counter() - start
+
+
+CASES = {
+    "draw": bench_draw,
+    "undraw": bench_undraw,
+    "move": bench_move,
+    "reconfig": bench_reconfig,
+    "redraw": bench_redraw,
+    "polygon": bench_polygon,
+    "text": bench_text,
+    "entry": bench_entry,
+}
+
+
+def time_case(case, backend, n):
+    """Returns the best time in microseconds per object of case over
+    enough runs to cover MIN_OBJECTS objects."""
+    best = None
+    for _ in range(max(1, min(100, MIN_OBJECTS // n))):
+        win = Window("Benchmark", SIDE, SIDE, autoflush=False,
+                     backend=backend)
+        elapsed = case(win, n)
+        win.close()
+        if best is None or elapsed < best:
+            best = elapsed
+    return best / n * 1e6
+
+
+def run(backend, sizes, only):
+    """Runs the chosen benchmarks and returns a dict of results."""
+    results = {}
+    for name, case in CASES.items():
+        if only and name not in only:
+            continue
+        if name == "entry" and backend != "tk":
+            print(f"{name:>18}: skipped (needs the tk backend)")
+            continue
+        for n in sizes:
+            if name == "entry" and n > ENTRY_LIMIT:
+                continue
+            key = f"{name}/{n}"
+            results[key] = time_case(case, backend, n)
+            print(f"{key:>18}: {results[key]:10.2f} us per object")
+    if not only or "import" in only:
+        # Bytecode is cached by the first run
+        import_time_us()
+        results["import"] = min(import_time_us() for _ in range(5)) / 1000
+        print(f"{'import':>18}: {results['import']:10.2f} ms")
+    if not only or "memory" in only:
+        for shape, factory in FACTORIES.items():
+            key = f"memory/{shape}"
+            results[key] = bytes_per_object(factory, 10_000)
+            print(f"{key:>18}: {results[key]:10.1f} bytes per object")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints each result against its baseline and returns the names of
+    those more than threshold worse."""
+    failed = []
+    print(f"\n{'benchmark':>18} {'baseline':>10} {'now':>10} {'change':>8}")
+    for key, value in results.items():
+        before = baseline.get(key)
+        if before is None:
+            print(f"{key:>18} {'-':>10} {value:10.2f}      new")
+            continue
+        change = (value - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            failed.append(key)
+            flag = "  REGRESSED"
+        print(f"{key:>18} {before:10.2f} {value:10.2f} {change:+8.1%}{flag}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="headless",
+                        choices=["headless", "tk"])
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated object counts")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--only", default="",
+                        help="comma separated benchmarks to run, from "
+                             + ", ".join([*CASES, "import", "memory"]))
+    parser.add_argument("--baseline",
+                        help="baseline file (default baselines/BACKEND.json)")
+    parser.add_argument("--save", action="store_true",
+                        help="write the results as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    only = set(filter(None, args.only.split(",")))
+    path = args.baseline or os.path.join(BENCHMARKS, "baselines",
+                                         f"{args.backend}.json")
+    results = run(args.backend, sizes, only)
+
+    if args.save:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path):
+            # Keep the results of benchmarks that weren't run this time
+            with open(path) as baseline_file:
+                saved = json.load(baseline_file)["results"]
+            results = {**saved, **results}
+        with open(path, "w") as baseline_file:
+            json.dump({"backend": args.backend,
+                       "python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "results": results}, baseline_file,
+                      indent=2, sort_keys=True)
+            baseline_file.write("\n")
+        print(f"\nbaseline saved to {path}")
+        return
+    if not os.path.exists(path):
+        print(f"\nno baseline at {path}; run with --save to create one")
+        return
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    failed = compare(results, baseline, args.threshold)
+    if failed:
+        print(f"\nFAIL: {len(failed)} regressed more than "
+              f"{args.threshold:.0%}: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\nOK: nothing regressed more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
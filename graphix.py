@@ -18,7 +18,9 @@ GPL (http://www.gnu.org/licenses/gpl.html).
 PLATFORMS: The package is a wrapper around Tkinter and should run on
 any platform where Tkinter is available.
 
-INSTALLATION: Put this file somewhere where Python can see it.
+INSTALLATION: Put this file somewhere where Python can see it. Tk is
+only started when the first window is opened, so Points and the other
+shapes can be used in programs that never open a window.
 
 OVERVIEW: There are two kinds of objects in the library. The Window
 class implements a window where drawing can be done and various
@@ -38,7 +40,20 @@ def main():
 
 main()
 --------------------------------------------------------------------
-Window objects support mouse and keyboard interaction methods.
+Window objects support mouse and keyboard interaction methods. Every
+click and key press is also kept in a queue, so w.poll_events() and
+w.next_event() can handle each one in order even when the program was
+busy drawing when it happened. Programs built on asyncio can instead
+await w.mouse(), w.key(), w.frame() and w.sleep(), so that many
+coroutines, say one per moving object, share a window without threads;
+graphix.run_async(main()) runs such a program. Objects may also be
+drawn, moved and changed from other threads: such changes are queued and
+made by the window's own thread while it handles events. Undrawn objects
+can be pickled, so graphix.build_parallel can build the shapes of a
+large scene in several processes at once. Drawing many objects at once
+can be made faster by doing it inside a "with w.batch():" block, which
+updates the window only once at the end. The contents of a window can be
+saved as an SVG image with w.export_svg("picture.svg").
 
 The library provides the following graphical classes:
     Point
@@ -47,8 +62,20 @@ The library provides the following graphical classes:
     Oval
     Rectangle
     Polygon
+    Polyline (an open line through many points)
+    Series (a line through a stream of points, for live charts)
     Text
     Entry (for text-based input)
+    Group (several objects moved, styled and undrawn together)
+    PixelImage (an image set pixel by pixel or row by row)
+    RectangleArray, CircleArray and LineArray (many shapes drawn as one
+        object; these need NumPy)
+
+Animations can be run at a steady frame rate with Animator or run_loop,
+which keep handling mouse and keyboard input between frames.
+
+To see where a program's time goes, call graphix.stats.enable() or use
+"with graphix.profile() as p:", then print(p.report()).
 
 Various attributes of graphical objects can be set such as
 outline-colour, fill-colour and line-width. Graphical objects also
@@ -56,9 +83,28 @@ support moving and hiding for animation effects.
 """
 
 from __future__ import annotations
+import binascii
+import copyreg
+import gc
+import heapq
+import html
+import io
+import math
+import os
+import struct
+import sys
+import threading
 import time
 import tkinter as tk
-from typing import Any, cast
+import tkinter.font as tkfont
+import weakref
+import zlib
+from array import array
+from collections import deque
+from functools import lru_cache, wraps
+from itertools import count, repeat
+from contextlib import contextmanager
+from typing import Any, Iterator, cast
 from abc import ABC, abstractmethod
 
 __version__ = "1.0"
@@ -80,8 +126,14 @@ BAD_OPTION = "Illegal option value"
 ##########################################################################
 # global variables and functions
 
-_root = tk.Tk()
-_root.withdraw()
+# The backend used by windows that don't ask for one explicitly: "tk" draws
+#   into a real Tk window; "headless" draws into an in-memory image and
+#   needs neither Tk nor a display.
+_default_backend = os.environ.get("GRAPHIX_BACKEND", "tk")
+
+# The hidden Tk root window. It is only created when the first Tk window or
+#   entry box needs it, so Points and shapes can be used without a display.
+_root: tk.Tk | None = None
 
 _update_lasttime = time.time()
 
@@ -97,61 +149,459 @@ def update(rate:int | None = None) -> None:
         else:
             _update_lasttime = now
 
-    _root.update()
+    if _root is not None:
+        _root.update()
+
+
+_tag_numbers = count(1)
+
+
+def _new_tag() -> str:
+    # Returns a Tk tag not used by any other object
+    return f"graphix{next(_tag_numbers)}"
+
+
+def _get_root() -> tk.Tk:
+    # Returns the Tk root window, starting Tk the first time it is needed
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.withdraw()
+        # MacOS fix 1
+        _root.update()
+    return _root
+
+
+# Named Tk fonts by (typeface, size, style), shared by every Text and Entry
+#   using the same font so Tk only has to make each font once
+_fonts: dict[tuple[str, int, str], tkfont.Font] = {}
+
+
+def _named_font(spec: tuple[str, int, str]) -> str:
+    # Returns the name of the shared Tk font for spec
+    font = _fonts.get(spec)
+    if font is None:
+        face, size, style = spec
+        font = tkfont.Font(root=_get_root(), family=face, size=size,
+                           weight="bold" if "bold" in style else "normal",
+                           slant="italic" if "italic" in style else "roman")
+        _fonts[spec] = font
+    return font.name
+
+
+def _tk_options(backend, options):
+    # The options to give backend for options: Tk canvases take the shared
+    #    named font for a font
+    if "font" in options and isinstance(backend, tk.Canvas):
+        return dict(options, font=_named_font(options["font"]))
+    return options
+
+
+@lru_cache(maxsize=4096)
+def _measure(backend: str, spec: tuple[str, int, str],
+             text: str) -> tuple[int, int]:
+    # Width and height in pixels of text drawn in a font by a backend
+    if _BACKENDS[backend] is not None:
+        return _text_extent(text, spec[1])
+    _named_font(spec)
+    font = _fonts[spec]
+    lines = text.split("\n")
+    return (max(font.measure(line) for line in lines),
+            font.metrics("linespace") * len(lines))
+
+
+def set_backend(name: str) -> None:
+    """Sets the backend used by windows created without a backend argument.
+    The name must be one of "tk" or "headless"."""
+    global _default_backend
+    if name not in _BACKENDS:
+        raise GraphixError(BAD_OPTION)
+    _default_backend = name
+
+# How often, in milliseconds, a Tk window makes the changes queued by
+#   other threads, and the most it makes at a time. While nothing is
+#   queued the wait doubles each time, up to _DRAIN_IDLE_MS, so an idle
+#   window hardly wakes.
+_DRAIN_MS = 10
+_DRAIN_IDLE_MS = 200
+_DRAIN_BATCH = 5000
+
+
+def _threadsafe(method):
+    # Wraps a method changing a GraphixObject so that, called from another
+    #   thread while the object is drawn, it is queued for the thread of
+    #   the object's window instead of touching Tk
+    @wraps(method)
+    def call(self, *args, **kwargs):
+        window = self._canvas
+        if window is not None:
+            if window._thread != threading.get_ident() and not window._closed:
+                window._post(method, self, args, kwargs)
+                return None
+            if self._id is None:
+                self._settle()
+        return method(self, *args, **kwargs)
+    return call
+
+
+def _window_threadsafe(method):
+    # The same for methods of Window itself
+    @wraps(method)
+    def call(self, *args, **kwargs):
+        if self._thread != threading.get_ident() and not self._closed:
+            self._post(method, self, args, kwargs)
+            return None
+        return method(self, *args, **kwargs)
+    return call
+
+
+def _near_segment(x, y, x1, y1, x2, y2, distance):
+    # Returns True if (x, y) is within distance of the segment (x1,y1)-(x2,y2)
+    dx, dy = x2 - x1, y2 - y1
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        t = 0.0
+    else:
+        t = max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length2))
+    px, py = x1 + t * dx - x, y1 + t * dy - y
+    return px * px + py * py <= distance * distance
 
 ############################################################################
 # Graphics classes start here
 
+class _SpatialGrid:
+    # A uniform grid of square cells, each holding the set of objects whose
+    #   bounding boxes overlap it. Objects that would cover more than
+    #   MAX_CELLS cells are kept in a separate set that every query checks.
+
+    CELL = 16
+    MAX_CELLS = 4096
+
+    __slots__ = ["_cells", "_spans", "_large"]
+
+    def __init__(self) -> None:
+        self._cells: dict[tuple[int, int], set[GraphixObject]] = {}
+        self._spans: dict[GraphixObject, tuple[int, ...] | None] = {}
+        self._large: set[GraphixObject] = set()
+
+    def insert(self, item: GraphixObject) -> None:
+        span = self._span(item)
+        self._spans[item] = span
+        if span is None:
+            self._large.add(item)
+        else:
+            cells = self._cells
+            for key in self._keys(span):
+                if key in cells:
+                    cells[key].add(item)
+                else:
+                    cells[key] = {item}
+
+    def remove(self, item: GraphixObject) -> None:
+        span = self._spans.pop(item)
+        if span is None:
+            self._large.discard(item)
+        else:
+            cells = self._cells
+            for key in self._keys(span):
+                members = cells[key]
+                members.discard(item)
+                if not members:
+                    del cells[key]
+
+    def update(self, item: GraphixObject) -> None:
+        if self._spans.get(item, ()) != self._span(item):
+            self.remove(item)
+            self.insert(item)
+
+    def at(self, x: int, y: int) -> set[GraphixObject]:
+        # Objects whose bounding boxes might contain (x, y)
+        cell = self.CELL
+        return self._cells.get((x // cell, y // cell), set()) | self._large
+
+    def within(self, x1: int, y1: int, x2: int, y2: int) -> set[GraphixObject]:
+        # Objects whose bounding boxes might overlap the box
+        cell = self.CELL
+        found = set(self._large)
+        cells = self._cells
+        for cx in range(x1 // cell, x2 // cell + 1):
+            for cy in range(y1 // cell, y2 // cell + 1):
+                members = cells.get((cx, cy))
+                if members:
+                    found |= members
+        return found
+
+    def _span(self, item):
+        # The range of cells covered by the item, () if it covers nothing,
+        #    or None if it covers too many to index
+        bounds = item._bounds()
+        if bounds is None:
+            return ()
+        cell = self.CELL
+        x1, y1, x2, y2 = bounds
+        span = (x1 // cell, y1 // cell, x2 // cell, y2 // cell)
+        if (span[2]-span[0]+1) * (span[3]-span[1]+1) > self.MAX_CELLS:
+            return None
+        return span
+
+    @staticmethod
+    def _keys(span):
+        if not span:
+            return []
+        cx1, cy1, cx2, cy2 = span
+        return [(cx, cy) for cx in range(cx1, cx2 + 1)
+                for cy in range(cy1, cy2 + 1)]
+
+
+class _Scene:
+    # The objects drawn in a window, indexed by their Tk item id. Dicts keep
+    #   insertion order and Tk ids only increase, so iteration runs from the
+    #   bottom of the drawing order to the top. Objects drawn as several
+    #   Tk items are keyed by a Tk tag instead, so each object also gets a
+    #   rank giving its place in the drawing order. The spatial index used
+    #   for hit-testing is built on the first query; objects that move or
+    #   change size after that are noted and put right at the next query.
+
+    __slots__ = ["_by_id", "_rank", "_next_rank", "_grid", "_stale"]
+
+    def __init__(self) -> None:
+        self._by_id: dict[Any, GraphixObject] = {}
+        self._rank: dict[Any, int] = {}
+        self._next_rank = 0
+        self._grid: _SpatialGrid | None = None
+        # Objects whose place in the grid may be out of date
+        self._stale: set[GraphixObject] = set()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[GraphixObject]:
+        return iter(self._by_id.values())
+
+    def add(self, item: GraphixObject) -> None:
+        self._by_id[item._id] = item
+        self._rank[item._id] = self._next_rank
+        self._next_rank += 1
+        if self._grid is not None:
+            self._grid.insert(item)
+
+    def remove(self, item: GraphixObject) -> None:
+        removed = self._by_id.pop(item._id, None)
+        if removed is not None:
+            del self._rank[item._id]
+            if self._grid is not None:
+                self._grid.remove(removed)
+                self._stale.discard(removed)
+
+    def changed(self, item: GraphixObject) -> None:
+        # Called when a drawn object has moved or changed size
+        if self._grid is not None:
+            if isinstance(item, Group):
+                for leaf in item._leaves():
+                    if self._by_id.get(leaf._id) is leaf:
+                        self._stale.add(leaf)
+            else:
+                self._stale.add(item)
+
+    def grid(self) -> _SpatialGrid:
+        if self._grid is None:
+            self._grid = _SpatialGrid()
+            for item in self._by_id.values():
+                self._grid.insert(item)
+        elif self._stale:
+            for item in self._stale:
+                self._grid.update(item)
+            self._stale.clear()
+        return self._grid
+
+    def get(self, item_id: Any) -> GraphixObject | None:
+        return self._by_id.get(item_id)
+
+    def order(self, item: GraphixObject) -> int:
+        # Sort key putting drawn objects in the order they are stacked
+        return self._rank[item._id]
+
+    def clear(self) -> list[GraphixObject]:
+        # Empties the scene and returns what was in it, bottom first
+        items = list(self._by_id.values())
+        self._by_id.clear()
+        self._rank.clear()
+        self._grid = None
+        self._stale.clear()
+        return items
+
+
+class Event:
+    """A mouse click or key press taken from a window's event queue."""
+
+    __slots__ = ["_kind", "_x", "_y", "_key", "_time", "_count"]
+
+    def __init__(self, kind: str, x: int | None, y: int | None, key: str,
+                 when: float) -> None:
+        """Initialises the event. kind is "mouse" or "key"; when is the
+        time.monotonic() time it happened."""
+        self._kind = kind
+        self._x = x
+        self._y = y
+        self._key = key
+        self._time = when
+        self._count = 1
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the event."""
+        if self._kind == "mouse":
+            detail = f"{self._x}, {self._y}"
+        else:
+            detail = repr(self._key)
+        repeats = f" x{self._count}" if self._count > 1 else ""
+        return f"Event({self._kind!r}, {detail}{repeats})"
+
+    @property
+    def kind(self) -> str:
+        """"mouse" for a click, "key" for a key press."""
+        return self._kind
+
+    @property
+    def x(self) -> int | None:
+        """The x coordinate of a click, or None for a key press."""
+        return self._x
+
+    @property
+    def y(self) -> int | None:
+        """The y coordinate of a click, or None for a key press."""
+        return self._y
+
+    @property
+    def key(self) -> str:
+        """The key pressed, named as get_key names it, or "" for a click."""
+        return self._key
+
+    @property
+    def time(self) -> float:
+        """When the event happened, in seconds on the time.monotonic()
+        clock."""
+        return self._time
+
+    @property
+    def count(self) -> int:
+        """How many identical events in a row this one stands for; more
+        than 1 only for events merged by poll_events(coalesce=True)."""
+        return self._count
+
+    def get_point(self) -> Point | None:
+        """Returns where a click happened, or None for a key press."""
+        if self._x is None or self._y is None:
+            return None
+        return Point(self._x, self._y)
+
+    def _repeats(self, other: Event) -> bool:
+        # True if other is the same click or key press as this one
+        return (self._kind == other._kind and self._key == other._key
+                and self._x == other._x and self._y == other._y)
+
+
 class Window(tk.Canvas):
     """A Window is a toplevel window for displaying graphics."""
 
     __slots = ["_items", "_mouse_x", "_mouse_y", "master", "tk", "_autoflush",
                "_name", "_w", "children", "_tclCommands","background_colour",
-               "_mouse_callback", "_closed", "_last_key", "widgetName"]
+               "_mouse_callback", "_closed", "_last_key", "widgetName",
+               "_batch_depth", "_flush_pending", "_backend", "_title",
+               "_wake_var", "_pending_moves", "_groups", "_members", "_events",
+               "_dropped_events", "_async", "_thread", "_commands",
+               "_command_limit", "_command_timeout", "_room",
+               "_drain_queued", "_drain_delay"]
 
     __readonly = ["width", "height"]
 
     def __init__(self, title: str ="Graphix Window",
                  width: int = 400, height: int = 400,
-                 autoflush: bool = True) -> None:
-        """Initialises and opens a graphics window."""
+                 autoflush: bool = True, backend: str | None = None,
+                 max_events: int = 1024) -> None:
+        """Initialises and opens a graphics window. The backend may be "tk"
+        (the default) or "headless" to draw into an in-memory image. Up to
+        max_events clicks and key presses are queued for poll_events and
+        next_event; beyond that the oldest are dropped."""
         if not isinstance(title, str):
             raise GraphixError("Window title must be a string")
         if not isinstance(width, int) or not isinstance(height, int):
             raise GraphixError("Window dimensions must be integers")
         if not isinstance(autoflush, bool):
             raise GraphixError("Window autoflush must be a boolean")
+        if not isinstance(max_events, int) or max_events < 1:
+            raise GraphixError("Window max_events must be a positive integer")
+        if backend is None:
+            backend = _default_backend
+        if backend not in _BACKENDS:
+            raise GraphixError(BAD_OPTION)
 
-        master = tk.Toplevel(_root)
-        master.protocol("WM_DELETE_WINDOW", self.close)
-        tk.Canvas.__init__(self, master, width=width, height=height,
-                           highlightthickness=0, bd=0)
-        self.master.title(title)  # type: ignore
-        self.master.attributes('-topmost', True)    # type: ignore
-        self.pack()
-        master.resizable(0,0)  # type: ignore
+        self._title = title
+        # The thread the window belongs to; see _post
+        self._thread = threading.get_ident()
+        if _BACKENDS[backend] is None:
+            master = tk.Toplevel(_get_root())
+            master.protocol("WM_DELETE_WINDOW", self.close)
+            tk.Canvas.__init__(self, master, width=width, height=height,
+                               highlightthickness=0, bd=0)
+            self.master.title(title)  # type: ignore
+            self.master.attributes('-topmost', True)    # type: ignore
+            self.pack()
+            master.resizable(0,0)  # type: ignore
+            self.bind("<Button-1>", self._on_click)
+            self.bind_all("<Key>", self._on_key)
+            master.lift()
+            # The Tk backend is the canvas itself
+            self._backend = self
+            # Written whenever a waiting get_mouse or get_key should wake up
+            self._wake_var = tk.IntVar(master, 0)
+        else:
+            self._backend = _BACKENDS[backend](width, height)
+            self._wake_var = None
         #self.foreground = "black"
-        self._items: list[GraphixObject] = []
+        self._items = _Scene()
         self._mouse_x = None
         self._mouse_y = None
-        self.bind("<Button-1>", self._on_click)
-        self.bind_all("<Key>", self._on_key)
         self._autoflush = autoflush
+        self._batch_depth = 0
+        self._flush_pending = False
+        # Moves made during a batch, collected per object as
+        #    [Tk id, total dx, total dy] and applied when the batch ends
+        self._pending_moves: dict[GraphixObject, list] = {}
+        # The drawn groups, in the order they were tagged, and the group
+        #    each of their objects belongs to
+        self._groups: dict[Group, None] = {}
+        self._members: dict[GraphixObject, Group] = {}
         self._mouse_callback = None
         self._closed = False
         self.background_colour = "white"
-        master.lift()
         self._last_key = ""
+        # Clicks and key presses not yet taken by poll_events or next_event,
+        #    oldest first, in a ring buffer that drops the oldest when full
+        self._events: deque[Event] = deque(maxlen=max_events)
+        self._dropped_events = 0
+        # Drives the window from asyncio once a coroutine awaits it
+        self._async: _AsyncDriver | None = None
+        # Calls made from other threads, queued for this one to make as
+        #    (function, object, args, kwargs). Producers wait on room while
+        #    the queue holds command_limit calls.
+        self._commands: deque[tuple] = deque()
+        self._command_limit = 10000
+        self._command_timeout: float | None = None
+        self._room = threading.Event()
+        self._drain_queued = False
+        self._drain_delay = _DRAIN_MS
+        if self._backend is self:
+            self.after(_DRAIN_MS, self._drain_tick)
+        _windows.add(self)
         if autoflush:
-            _root.update()
+            self._flush_now()
 
     def __repr__(self) -> str:
         """Returns a string representation of the window."""
         if self.is_closed():
             return "<Closed Window>"
         else:
-            return (f"Window('{self.master.title()}', "  # type: ignore
-                    f"{self.width}, {self.height})")  
+            return f"Window('{self._title}', {self.width}, {self.height})"
 
     def __str__(self) -> str:
         """Returns a string representation of the window."""
@@ -171,37 +621,38 @@ class Window(tk.Canvas):
     @property
     def background_colour(self) -> str:
         """The background colour of the window."""
-        return self.cget("bg")
+        return self._backend.cget("bg")
 
     @background_colour.setter
+    @_window_threadsafe
     def background_colour(self, colour: str) -> None:
         if not isinstance(colour, str):
             raise GraphixError("Background colour must be a string")
         self.__check_open()
-        self.config(bg=colour)
-        self.__autoflush()
+        self._backend.config(bg=colour)
+        self._autoflush_update()
 
     @property
     def height(self) -> int:
         """The height of the window."""
-        return int(self.cget("height"))
+        return int(self._backend.cget("height"))
 
     @property
     def width(self) -> int:
         """The width of the window."""
-        return int(self.cget("width"))
+        return int(self._backend.cget("width"))
 
-    def get_mouse(self) -> Point:
+    def get_mouse(self, timeout: float | None = None) -> Point | None:
         """Waits for a mouse click and returns a Point object representing the
-        click."""
+        click. If timeout (in seconds) is given and passes without a click,
+        returns None."""
+        self.__check_interactive("get_mouse")
         self.update()      # flush any prior clicks
         self._mouse_x = None
         self._mouse_y = None
-        while self._mouse_x is None or self._mouse_y is None:
-            self.update()
-            if self.is_closed():
-                raise GraphixError("get_mouse in closed window")
-            time.sleep(.1) # give up thread
+        if not self._wait_for(lambda: self._mouse_x is not None,
+                               timeout, "get_mouse"):
+            return None
         x,y = cast(int, self._mouse_x), cast(int, self._mouse_y)
         self._mouse_x = None
         self._mouse_y = None
@@ -212,7 +663,7 @@ class Window(tk.Canvas):
         since last call"""
         if self.is_closed():
             raise GraphixError("check_mouse in closed window")
-        self.update()
+        self._flush_now()
         if self._mouse_x is not None and self._mouse_y is not None:
             x,y = self._mouse_x, self._mouse_y
             self._mouse_x = None
@@ -221,15 +672,15 @@ class Window(tk.Canvas):
         else:
             return None
 
-    def get_key(self) -> str:
-        """Waits for user to press a key and returns it as a string."""
+    def get_key(self, timeout: float | None = None) -> str:
+        """Waits for user to press a key and returns it as a string. If
+        timeout (in seconds) is given and passes without a key press,
+        returns an empty string."""
+        self.__check_interactive("get_key")
         self._last_key = ""
-        while self._last_key == "":
-            self.update()
-            if self.is_closed():
-                raise GraphixError("get_key in closed window")
-            time.sleep(.1) # give up thread
-
+        if not self._wait_for(lambda: self._last_key != "",
+                               timeout, "get_key"):
+            return ""
         key = self._last_key
         self._last_key = ""
         return key
@@ -239,18 +690,110 @@ class Window(tk.Canvas):
            last call."""
         if self.is_closed():
             raise GraphixError("check_key in closed window")
-        self.update()
+        self._flush_now()
         key = self._last_key
         self._last_key = ""
         return key
 
+    def poll_events(self, limit: int | None = None,
+                    coalesce: bool = False) -> list[Event]:
+        """Returns the queued clicks and key presses, oldest first, and
+        removes them from the queue. At most limit events are returned if
+        it is given, leaving the rest queued. If coalesce is True, runs of
+        the same key press or of clicks at the same spot are merged into
+        one event whose count says how many there were. The queue is kept
+        apart from get_mouse, check_mouse, get_key and check_key, which
+        neither take events from it nor see events taken from it."""
+        if self.is_closed():
+            raise GraphixError("poll_events in closed window")
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise GraphixError("poll_events limit must be a non-negative "
+                               "integer")
+        self._flush_now()
+        events = self._events
+        found: list[Event] = []
+        while events:
+            event = events[0]
+            if coalesce and found and found[-1]._repeats(event):
+                found[-1]._count += 1
+            elif limit is not None and len(found) >= limit:
+                break
+            else:
+                found.append(event)
+            events.popleft()
+        return found
+
+    def next_event(self, timeout: float | None = None) -> Event | None:
+        """Removes and returns the oldest queued click or key press,
+        waiting for one if the queue is empty. If timeout (in seconds) is
+        given and passes without an event, returns None."""
+        if self.is_closed():
+            raise GraphixError("next_event in closed window")
+        self._flush_now()
+        if not self._events and not self._wait_for(
+                lambda: len(self._events) > 0, timeout, "next_event"):
+            return None
+        return self._events.popleft()
+
+    def dropped_events(self) -> int:
+        """Returns how many events have been dropped from the event queue
+        because it was full."""
+        return self._dropped_events
+
+    async def mouse(self) -> Point:
+        """Waits for a mouse click, letting other coroutines run meanwhile,
+        and returns it as a Point. Coroutines waiting when the window is
+        closed are cancelled."""
+        self.__check_interactive("mouse")
+        driver = self._async_driver("mouse")
+        return await driver.wait(driver.mouse)
+
+    async def key(self) -> str:
+        """Waits for a key press, letting other coroutines run meanwhile,
+        and returns it as get_key would. Coroutines waiting when the
+        window is closed are cancelled."""
+        self.__check_interactive("key")
+        driver = self._async_driver("key")
+        return await driver.wait(driver.keys)
+
+    async def frame(self) -> float:
+        """Waits for the next frame, letting other coroutines run
+        meanwhile, and returns the seconds since the one before. Frames
+        come 60 times a second, and drawing done by the coroutines woken
+        by a frame is shown in one update. Coroutines waiting when the
+        window is closed are cancelled."""
+        driver = self._async_driver("frame")
+        return await driver.wait(driver.frames)
+
+    async def sleep(self, seconds: float) -> None:
+        """Waits for seconds while the window keeps handling events and
+        other coroutines run. Coroutines waiting when the window is closed
+        are cancelled."""
+        if not isinstance(seconds, (int, float)):
+            raise GraphixError("Sleep time must be a number")
+        driver = self._async_driver("sleep")
+        future = driver.wait(driver.sleeps)
+        timer = driver.loop.call_later(max(0, seconds), driver.wake_one,
+                                       future, None)
+        try:
+            await future
+        finally:
+            timer.cancel()
+
+    @_window_threadsafe
     def close(self) -> None:
         """Closes the window."""
         if self._closed:
             return
         self._closed = True
-        self.master.destroy()
-        self.__autoflush()
+        if self._async is not None:
+            self._async.cancel()
+        self._commands.clear()
+        self._room.set()
+        if self._backend is self:
+            self._wake()
+            self.master.destroy()
+        self._autoflush_update()
 
     def is_closed(self) -> bool:
         """Returns True if window closed; False otherwise."""
@@ -260,21 +803,268 @@ class Window(tk.Canvas):
         """Returns True if window open; False otherwise."""
         return not self._closed
 
+    @_window_threadsafe
     def flush(self) -> None:
-        """Updates drawing to the window."""
+        """Updates drawing to the window, first making any changes queued
+        by other threads."""
         self.__check_open()
-        self.update_idletasks()
-
+        if self._commands:
+            self._drain()
+        self._apply_moves()
+        start = time.perf_counter() if _recorders else 0.0
+        self._backend.update_idletasks()
+        if start:
+            _record(self, "flush", start)
+
+    @_window_threadsafe
     def redraw(self) -> None:
         """Redraws all objects on the window."""
-        for item in self._items[:]:
-            item.undraw()
-            item.draw(self)
-        self.update()
-
-    def __autoflush(self):
+        self.__check_open()
+        # Nested groups are tagged before the groups holding them
+        groups = sorted(self._groups,
+                        key=lambda group: -len(list(group._lineage())))
+        items = self.__remove_all()
+        with self.batch():
+            for item in items:
+                item.draw(self)
+            for group in groups:
+                group._tag(self)
+        self._flush_now()
+
+    @_window_threadsafe
+    def clear(self) -> None:
+        """Undraws all objects on the window."""
+        self.__check_open()
+        self.__remove_all()
+        self._autoflush_update()
+
+    def get_items(self) -> list[GraphixObject]:
+        """Returns a list of the objects drawn on the window, from the
+        bottom of the drawing order to the top."""
+        return list(self._items)
+
+    def find_by_id(self, item_id: int) -> GraphixObject | None:
+        """Returns the drawn object with the given Tk item id, or None if
+        there isn't one."""
+        return self._items.get(item_id)
+
+    def find_at(self, point: Point) -> list[GraphixObject]:
+        """Returns a list of the drawn objects that contain point, topmost
+        first."""
+        if not isinstance(point, Point):
+            raise GraphixError("find_at point must be a Point object")
+        self._apply_moves()
+        x, y = point.x, point.y
+        found = [item for item in self._items.grid().at(x, y)
+                 if item._contains(x, y)]
+        found.sort(key=self._items.order, reverse=True)
+        return found
+
+    def find_in(self, rectangle: Rectangle) -> list[GraphixObject]:
+        """Returns a list of the drawn objects lying entirely inside
+        rectangle, topmost first."""
+        if not isinstance(rectangle, Rectangle):
+            raise GraphixError("find_in area must be a Rectangle object")
+        self._apply_moves()
+        x1, x2 = sorted((rectangle._x1, rectangle._x2))
+        y1, y2 = sorted((rectangle._y1, rectangle._y2))
+        found = []
+        for item in self._items.grid().within(x1, y1, x2, y2):
+            bounds = item._bounds()
+            if (bounds is not None and x1 <= bounds[0] and y1 <= bounds[1]
+                    and bounds[2] <= x2 and bounds[3] <= y2):
+                found.append(item)
+        found.sort(key=self._items.order, reverse=True)
+        return found
+
+    def __remove_all(self):
+        # Deletes every item from the canvas in one call and marks the
+        #    objects as undrawn; returns them bottom first
+        self._pending_moves.clear()
+        items = self._items.clear()
+        start = time.perf_counter() if _recorders else 0.0
+        self._backend.delete("all")
+        if start:
+            _record(self, "undraw", start)
+        for item in items:
+            item._canvas = None
+            item._id = None
+        for group in self._groups:
+            group._canvas = None
+            group._id = None
+        self._groups.clear()
+        self._members.clear()
+        return items
+
+    @contextmanager
+    def batch(self) -> Iterator[Window]:
+        """Suspends automatic flushing while the with block (or decorated
+        function) runs, then applies all pending drawing in one update.
+        Batches may be nested; only the outermost batch flushes. In other
+        threads, whose changes are queued and made in batches anyway, it
+        does nothing."""
+        if self._thread != threading.get_ident():
+            yield self
+            return
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._apply_moves()
+                if self._flush_pending:
+                    self._flush_pending = False
+                    if not self._closed:
+                        self._flush_now()
+
+    def _defer_move(self, item: GraphixObject, dx: int, dy: int) -> None:
+        # Records a move of a drawn item made inside a batch
+        pending = self._pending_moves.get(item)
+        if pending is None or pending[0] != item._id:
+            self._pending_moves[item] = [item._id, dx, dy]
+        else:
+            pending[1] += dx
+            pending[2] += dy
+
+    def _apply_moves(self) -> None:
+        # Sends the moves collected during a batch, one per object, leaving
+        #    the flush to the end of the batch. Moves of items undrawn since
+        #    are dropped.
+        if not self._pending_moves or self._closed:
+            self._pending_moves.clear()
+            return
+        moves = self._pending_moves
+        self._pending_moves = {}
+        backend = self._backend
+        items = self._items
+        start = time.perf_counter() if _recorders else 0.0
+        sent = 0
+        for item, (item_id, dx, dy) in moves.items():
+            if item._canvas is self and item._id == item_id and (dx or dy):
+                backend.move(item_id, dx, dy)
+                items.changed(item)
+                sent += 1
+        if start:
+            _record(self, "move", start, sent)
         if self._autoflush:
-            _root.update()
+            self._flush_pending = True
+
+    def _autoflush_update(self) -> None:
+        # Called after every change to the window's contents. Inside a
+        #    batch the update is only recorded as pending.
+        if not self._autoflush:
+            return
+        if self._batch_depth:
+            if not self._flush_pending:
+                self._flush_pending = True
+        else:
+            self._flush_now()
+
+    def _flush_now(self) -> None:
+        # Updates the window straight away
+        start = time.perf_counter() if _recorders else 0.0
+        self._backend.update()
+        if start:
+            _record(self, "flush", start)
+
+    def set_command_limit(self, limit: int,
+                          timeout: float | None = None) -> None:
+        """Sets how many changes made from other threads may wait to be
+        made (10000 to begin with). A thread making a change while that
+        many are waiting is held until the window's thread catches up. If
+        timeout (in seconds) is given and passes first, GraphixError is
+        raised in the waiting thread instead, at once if timeout is 0."""
+        if not isinstance(limit, int) or limit < 1:
+            raise GraphixError("Command limit must be a positive integer")
+        if timeout is not None and not isinstance(timeout, (int, float)):
+            raise GraphixError("Timeout must be a number")
+        self._command_limit = limit
+        self._command_timeout = timeout
+
+    def _post(self, func, obj, args, kwargs) -> None:
+        # Queues func(obj, *args, **kwargs), called from another thread, for
+        #    the window's thread to make. Deque appends and pops are atomic,
+        #    so the threads share no lock.
+        commands = self._commands
+        if len(commands) >= self._command_limit:
+            self._wait_for_room()
+        commands.append((func, obj, args, kwargs))
+        if not self._drain_queued and self._backend is not self:
+            # A headless window has no event loop to tick, so the queue is
+            #    drained the next time its own thread updates it
+            self._drain_queued = True
+            self._backend.after_idle(self._drain)
+
+    def _wait_for_room(self):
+        # Holds the calling thread while the queue is full
+        timeout = self._command_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        room = self._room
+        while len(self._commands) >= self._command_limit:
+            if self._closed:
+                raise GraphixError("window is closed")
+            room.clear()
+            # Checked again in case the queue was drained before the clear
+            if len(self._commands) < self._command_limit:
+                break
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise GraphixError("Window command queue is full")
+            room.wait(remaining)
+
+    def _drain(self):
+        # Makes up to _DRAIN_BATCH of the queued calls, in order, in one
+        #    batch. An error in one is reported as Tk reports errors in
+        #    callbacks, and the rest are still made.
+        commands = self._commands
+        try:
+            if commands and not self._closed:
+                with self.batch():
+                    for _ in range(min(len(commands), _DRAIN_BATCH)):
+                        if self._closed:
+                            break
+                        func, obj, args, kwargs = commands.popleft()
+                        try:
+                            func(obj, *args, **kwargs)
+                        except Exception:
+                            sys.excepthook(*sys.exc_info())
+        finally:
+            self._room.set()
+            self._drain_queued = False
+        if commands and not self._closed and self._backend is not self:
+            # Calls queued after the last pop may have seen _drain_queued
+            #    still set and left the draining to this
+            self._drain_queued = True
+            self._backend.after_idle(self._drain)
+
+    def _drain_tick(self):
+        # Drains the queue of a Tk window while it is open, every _DRAIN_MS
+        #    while calls keep arriving and backing off while they don't.
+        #    Other threads can't safely call Tk to start the ticks when they
+        #    queue a call, so the ticks never stop.
+        if self._closed:
+            return
+        if self._commands:
+            self._drain()
+            self._drain_delay = _DRAIN_MS
+        else:
+            self._drain_delay = min(2 * self._drain_delay, _DRAIN_IDLE_MS)
+        self._backend.after(self._drain_delay, self._drain_tick)
+
+    def _async_driver(self, operation) -> _AsyncDriver:
+        # Returns the driver for the running event loop, starting one if
+        #    needed
+        if self._closed:
+            raise GraphixError(f"{operation} in closed window")
+        import asyncio
+        loop = asyncio.get_running_loop()
+        driver = self._async
+        if driver is None or driver.loop is not loop or driver.pump.done():
+            driver = self._async = _AsyncDriver(self, loop)
+        return driver
 
     def _set_mouse_handler(self, func):
         self._mouse_callback = func
@@ -282,21 +1072,170 @@ class Window(tk.Canvas):
     def _on_click(self, e):
         self._mouse_x = e.x
         self._mouse_y = e.y
+        self._queue_event(Event("mouse", e.x, e.y, "", time.monotonic()))
+        if self._async is not None:
+            self._async.wake(self._async.mouse, Point(e.x, e.y))
+        self._wake()
         if self._mouse_callback:
             self._mouse_callback(Point(e.x, e.y))
 
     def _add_item(self, item: GraphixObject) -> None:
-        self._items.append(item)
+        self._items.add(item)
 
     def _del_item(self, item: GraphixObject) -> None:
         self._items.remove(item)
 
+    def save_image(self, filename: str) -> None:
+        """Saves the contents of a headless window as a PPM or PNG image,
+        chosen by the extension of filename."""
+        backend = self.__raster_backend()
+        if filename.lower().endswith(".png"):
+            data = backend.to_png()
+        elif filename.lower().endswith(".ppm"):
+            data = backend.to_ppm()
+        else:
+            raise GraphixError("Image filename must end in .png or .ppm")
+        with open(filename, "wb") as output_file:
+            output_file.write(data)
+
+    def get_pixels(self) -> bytes:
+        """Returns the contents of a headless window as raw RGB bytes, one
+        row after another from the top left."""
+        return self.__raster_backend().render()
+
+    def export_svg(self, file) -> None:
+        """Writes the objects drawn on the window to file, a filename or
+        an open text file, as an SVG image. The objects are written one at
+        a time, so memory use doesn't grow with their number."""
+        self.__check_open()
+        self._apply_moves()
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w", encoding="utf-8") as svg_file:
+                self.__write_svg(svg_file)
+        else:
+            self.__write_svg(file)
+
+    def export_svg_string(self) -> str:
+        """Returns the objects drawn on the window as an SVG image."""
+        buffer = io.StringIO()
+        self.export_svg(buffer)
+        return buffer.getvalue()
+
+    def save_scene(self, file) -> None:
+        """Saves the objects drawn on the window to file, a filename or an
+        open binary file, in a compact binary form that load_scene can
+        read back."""
+        self.__check_open()
+        self._apply_moves()
+        writer = _SceneWriter()
+        for item in self._items:
+            writer.add(item)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "wb") as scene_file:
+                writer.write(scene_file, self)
+        else:
+            writer.write(file, self)
+
+    @staticmethod
+    def load_scene(file, backend: str | None = None) -> Window:
+        """Opens a window like the one saved in file, a filename or an open
+        binary file, draws the saved objects in it and returns it."""
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as scene_file:
+                data = scene_file.read()
+        else:
+            data = file.read()
+        # Nothing made here can be garbage, so the collector is kept from
+        #    scanning the growing scene over and over
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            try:
+                title, background, width, height, objects = \
+                    _read_scene(data)
+            except (struct.error, ValueError, IndexError, KeyError):
+                raise GraphixError(_BAD_SCENE) from None
+            window = Window(title, width, height, backend=backend)
+            window.background_colour = background
+            with window.batch():
+                for obj in objects:
+                    obj.draw(window)
+        finally:
+            if enabled:
+                gc.enable()
+        return window
+
+    def __write_svg(self, svg_file):
+        writer = _SvgWriter(svg_file, self._backend)
+        writer.start(self.width, self.height, self.background_colour)
+        for item in self._items:
+            item._svg(writer)
+        writer.end()
+
+    def __raster_backend(self) -> _RasterCanvas:
+        if not isinstance(self._backend, _RasterCanvas):
+            raise GraphixError(UNSUPPORTED_METHOD)
+        self._apply_moves()
+        # Pixel images send their changes when the window is next idle
+        self._backend.update_idletasks()
+        return self._backend
+
     def __check_open(self):
         if self._closed:
             raise GraphixError("window is closed")
 
+    def __check_interactive(self, operation):
+        if self._backend is not self:
+            raise GraphixError(f"{operation} needs an interactive window")
+
+    def _wait_for(self, ready, timeout, operation):
+        # Runs the event loop until ready() is true, sleeping in Tk's own
+        #    event wait (or until the next timer of a headless window) in
+        #    between. Returns False if timeout seconds pass first.
+        if timeout is not None and not isinstance(timeout, (int, float)):
+            raise GraphixError("Timeout must be a number")
+        backend = self._backend
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            if self._closed:
+                raise GraphixError(f"{operation} in closed window")
+            after_id = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                after_id = backend.after(max(1, round(remaining * 1000)),
+                                         self._wake)
+            start = time.perf_counter() if _recorders else 0.0
+            if backend is self:
+                self.wait_variable(self._wake_var)
+            else:
+                backend.wait()
+            if start:
+                _record(self, "event_wait", start)
+            if after_id is not None:
+                backend.after_cancel(after_id)
+        return True
+
+    def _wake(self):
+        # Ends the current wait in _wait_for so its condition is checked
+        if self._wake_var is not None:
+            self._wake_var.set(0)
+
     def _on_key(self, event):
         self._last_key = event.keysym
+        self._queue_event(Event("key", None, None, event.keysym,
+                                time.monotonic()))
+        if self._async is not None:
+            self._async.wake(self._async.keys, event.keysym)
+        self._wake()
+
+    def _queue_event(self, event):
+        # Adds an event to the queue; a full deque drops its oldest itself
+        events = self._events
+        if len(events) == events.maxlen:
+            self._dropped_events += 1
+        events.append(event)
 
 
 # Default values for various item configuration options. Only a subset of
@@ -314,7 +1253,7 @@ DEFAULT_CONFIG = {
 class GraphixObject(ABC):
     """Generic base class for all of the drawable objects"""
 
-    __slots__ = ["_canvas", "_id", "_config"]
+    __slots__ = ["_canvas", "_id", "_config", "_pending"]
 
     def __init__(self, options) -> None:
         # options is a list of strings indicating which options are
@@ -332,6 +1271,10 @@ class GraphixObject(ABC):
             config[option] = DEFAULT_CONFIG[option]
         self._config = config
 
+        # While configure() is running, changes are only recorded in config
+        #    and pending is True; they are sent to Tk together at the end.
+        self._pending = False
+
     def __str__(self) -> str:
         # all subclasses must implement __repr__
         return self.__repr__()
@@ -383,22 +1326,47 @@ class GraphixObject(ABC):
             raise GraphixError(OBJ_ALREADY_DRAWN)
         if window.is_closed():
             raise GraphixError("Can't draw to closed window")
+        if window._thread != threading.get_ident():
+            self._post_draw(window)
+            return
         self._canvas = window  # type: ignore
-        self._id = self._draw(window, self._config)
+        start = time.perf_counter() if _recorders else 0.0
+        try:
+            self._id = self._draw(window._backend, self._config)
+        except BaseException:
+            # Left undrawn, so it can still be drawn somewhere else
+            self._canvas = None
+            raise
+        if start:
+            _record(window, "draw", start)
         window._add_item(self)
-        if window._autoflush:
-            _root.update()
+        if window._members:
+            group = window._members.get(self)
+            if group is not None and group._canvas is window:
+                group._rejoin(self)
+        window._autoflush_update()
 
     def undraw(self) -> None:
         """Undraws the object (i.e. hides it). Returns silently if the
         object is not currently drawn."""
         if not self._canvas:
             return
+        # The checks of _threadsafe, written out in the busiest methods
+        if self._canvas._thread != threading.get_ident():
+            if not self._canvas._closed:
+                self._canvas._post(GraphixObject.undraw, self, (), {})
+                return
+        elif self._id is None:
+            self._settle()
+            if not self._canvas:
+                return
         if not self._canvas.is_closed():
-            self._canvas.delete(cast(str | int, self._id))
+            start = time.perf_counter() if _recorders else 0.0
+            self._canvas._backend.delete(cast(str | int, self._id))
+            if start:
+                _record(self._canvas, "undraw", start)
             self._canvas._del_item(self)
-            if self._canvas._autoflush:
-                _root.update()
+            self._canvas._autoflush_update()
         self._canvas = None
         self._id = None
 
@@ -411,14 +1379,89 @@ class GraphixObject(ABC):
         direction."""
         if not isinstance(dx, int) or not isinstance(dy, int):
             raise GraphixError("Move distances must be integers")
-        self._move(dx,dy)
         canvas = self._canvas
+        if (canvas is not None and canvas._thread != threading.get_ident()
+                and not canvas._closed):
+            canvas._post(GraphixObject.move, self, (dx, dy), {})
+            return
+        if canvas is not None and self._id is None:
+            self._settle()
+            canvas = self._canvas
+        self._move(dx,dy)
         if canvas and not canvas.is_closed():
-            x = dx
-            y = dy
-            self._canvas.move(self._id, x, y)
-            if canvas._autoflush:
-                _root.update()
+            if canvas._batch_depth:
+                # Collected and sent as one move when the batch ends
+                canvas._defer_move(self, dx, dy)
+            else:
+                start = time.perf_counter() if _recorders else 0.0
+                canvas._backend.move(self._id, dx, dy)
+                if start:
+                    _record(canvas, "move", start)
+                canvas._items.changed(self)
+                canvas._autoflush_update()
+
+    def clone_at(self, dx: int, dy: int) -> GraphixObject:
+        """Returns a clone of the object moved dx units in x direction and
+        dy units in y direction."""
+        if not isinstance(dx, int) or not isinstance(dy, int):
+            raise GraphixError("Move distances must be integers")
+        other = self.clone()
+        other._move(dx, dy)
+        return other
+
+    def stamp(self, window: Window, dx: int = 0, dy: int = 0) -> GraphixObject:
+        """Draws a clone of the object, moved dx units in x direction and
+        dy units in y direction, in window and returns the clone. The
+        clone is drawn in its new place rather than drawn and moved."""
+        other = self.clone_at(dx, dy)
+        other.draw(window)
+        return other
+
+    @_threadsafe
+    def configure(self, **attributes) -> None:
+        """Sets several attributes at once, for example
+        obj.configure(fill_colour="red", outline_width=2). All the values
+        are checked before any is changed, and a drawn object is updated
+        with a single change containing only the options that differ."""
+        saved = self._collect(attributes)
+        changes = {option: setting for option, setting in self._config.items()
+                   if saved.get(option) != setting}
+        if changes:
+            self._send_config(changes)
+
+    def _collect(self, attributes):
+        # Runs the property setters for attributes with sending turned off,
+        #    and returns a copy of the config from before. If any value is
+        #    rejected the config is put back as it was.
+        for name in attributes:
+            if not _settable(self, name):
+                raise GraphixError(f"'{type(self).__name__}' object has no "
+                                   f"settable attribute '{name}'")
+        self._check(attributes)
+        saved = self._config.copy()
+        self._pending = True
+        try:
+            for name, value in attributes.items():
+                setattr(self, name, value)
+        except BaseException:
+            self._config = saved
+            raise
+        finally:
+            self._pending = False
+        return saved
+
+    def _check(self, attributes):
+        # Checks the values of attributes before _collect sets them. Only
+        #    subclasses whose setters change more than the config, which
+        #    _collect can't put back, need to.
+        pass
+
+    def _check_on_copy(self, attributes):
+        # A _check for those subclasses: runs the setters on an undrawn
+        #    copy, so a rejected value raises before anything is changed
+        scratch = self._copy(type(self))
+        for name, value in attributes.items():
+            setattr(scratch, name, value)
 
     def _reconfig(self, option, setting):
         # Internal method for changing configuration of the object
@@ -426,12 +1469,106 @@ class GraphixObject(ABC):
         #    dictionary for this object
         if option not in self._config:
             raise GraphixError(UNSUPPORTED_METHOD)
-        options = self._config
-        options[option] = setting
-        if self._canvas and not self._canvas.is_closed():
-            self._canvas.itemconfig(self._id, options)
-            if self._canvas._autoflush:
-                _root.update()
+        canvas = self._canvas
+        if (canvas is not None and canvas._thread != threading.get_ident()
+                and not canvas._closed):
+            canvas._post(GraphixObject._reconfig, self, (option, setting), {})
+            return
+        if canvas is not None and self._id is None:
+            self._settle()
+        self._config[option] = setting
+        if not self._pending:
+            self._send_config({option: setting})
+
+    def _send_config(self, changes):
+        # Sends changed options to the drawn item, if there is one
+        canvas = self._canvas
+        if canvas and not canvas.is_closed():
+            start = time.perf_counter() if _recorders else 0.0
+            backend = canvas._backend
+            backend.itemconfig(self._id, _tk_options(backend, changes))
+            if start:
+                _record(canvas, "reconfig", start)
+            canvas._items.changed(self)
+            canvas._autoflush_update()
+
+    def _bounds(self):
+        # Returns the bounding box (x1, y1, x2, y2) of the drawn object,
+        #    including its outline, or None if it covers nothing
+        bbox = self._canvas._backend.bbox(self._id)
+        return tuple(bbox) if bbox else None
+
+    def _contains(self, x, y):
+        # Returns True if the drawn object covers the point (x, y)
+        bounds = self._bounds()
+        return (bounds is not None and bounds[0] <= x <= bounds[2]
+                and bounds[1] <= y <= bounds[3])
+
+    def _pad(self):
+        # Half the outline width, rounded up, for bounding boxes
+        return (int(self._config.get("width", 1)) + 1) // 2
+
+    def _svg(self, writer):
+        # Writes the object to an _SvgWriter. Objects with no SVG form,
+        #    such as entry boxes, write nothing.
+        pass
+
+    def __reduce__(self):
+        # Objects are pickled undrawn, as a tuple of their slot values with
+        #    the window and any Tk state left out, so shapes built in one
+        #    process can be drawn in another
+        undrawn = self._undrawn_state()
+        return (copyreg.__newobj__, (type(self),),
+                tuple(undrawn[name] if name in undrawn else getattr(self, name)
+                      for name in _slot_names(type(self))))
+
+    def __setstate__(self, values):
+        for name, value in zip(_slot_names(type(self)), values):
+            setattr(self, name, value)
+
+    def _undrawn_state(self):
+        # The slot values an undrawn copy has in place of this object's;
+        #    subclasses holding Tk state add to them
+        return {"_canvas": None, "_id": None, "_pending": False}
+
+    def _post_draw(self, window):
+        # Queues drawing in window for the window's thread, marking the
+        #    object as drawn now so later calls from this thread are queued
+        #    behind the drawing
+        self._canvas = window
+        window._post(GraphixObject._draw_posted, self, (window,), {})
+
+    def _settle(self):
+        # Called in the window's thread for an object whose drawing another
+        #    thread queued and which isn't drawn yet. Makes the queued calls
+        #    up to the drawing, so the object is drawn, and changed in the
+        #    order the calls were made, before this thread changes it.
+        window = self._canvas
+        while (self._canvas is window and self._id is None
+               and window._commands and not window._closed):
+            window._drain()
+
+    def _draw_posted(self, window):
+        # Draws an object whose drawing was queued, unless it was undrawn
+        #    since
+        if self._canvas is window and self._id is None:
+            self._canvas = None
+            self.draw(window)
+
+    def _copy(self, cls):
+        # Returns an undrawn cls object with the same state as this one,
+        #    made without going through cls.__init__ and its checks
+        other = cls.__new__(cls)
+        other._canvas = None
+        other._id = None
+        other._config = self._config.copy()
+        other._pending = False
+        self._copy_state(other)
+        return other
+
+    def _copy_state(self, other):
+        # Copies the attributes that subclasses add to other
+        pass
 
     @abstractmethod
     def _draw(self, canvas, options):
@@ -443,6 +1580,57 @@ class GraphixObject(ABC):
         """Updates internal state of object to move it dx,dy units"""
 
 
+@lru_cache(maxsize=None)
+def _slot_names(cls) -> tuple[str, ...]:
+    # The names of the slots of a GraphixObject class, base classes first
+    names: list[str] = []
+    for base in reversed(cls.__mro__):
+        names.extend(base.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
+def configure_many(objects, **attributes) -> None:
+    """Sets the same attributes on many objects at once, for example
+    configure_many(bars, fill_colour="red"). Every value is checked on every
+    object before anything is changed. Objects needing the same option
+    changes are then updated together, with one flush per window."""
+    objects = list(objects)
+    if not all(isinstance(obj, GraphixObject) for obj in objects):
+        raise GraphixError("configure_many needs GraphixObjects")
+    collected = []
+    try:
+        for obj in objects:
+            collected.append((obj, obj._collect(attributes)))
+    except BaseException:
+        for obj, saved in collected:
+            obj._config = saved
+        raise
+
+    # Group the objects drawn in each window by the changes they need
+    groups: dict[Window, dict[Any, list[GraphixObject]]] = {}
+    for obj, saved in collected:
+        changes = tuple((option, setting)
+                        for option, setting in obj._config.items()
+                        if saved.get(option) != setting)
+        canvas = obj._canvas
+        if changes and canvas and not canvas.is_closed():
+            groups.setdefault(canvas, {}).setdefault(changes, []).append(obj)
+    for window, by_changes in groups.items():
+        backend = window._backend
+        with window.batch():
+            start = time.perf_counter() if _recorders else 0.0
+            sent = 0
+            for changes, group in by_changes.items():
+                options = _tk_options(backend, dict(changes))
+                for obj in group:
+                    backend.itemconfig(obj._id, options)
+                    window._items.changed(obj)
+                sent += len(group)
+            if start:
+                _record(window, "reconfig", start, sent)
+            window._autoflush_update()
+
+
 class Point(GraphixObject):
     """A class representing a point with integer coordinates in 2D space."""
 
@@ -485,14 +1673,37 @@ class Point(GraphixObject):
 
     def clone(self) -> Point:
         """Returns a clone of the point."""
-        other = Point(self.x,self.y)
-        other._config = self._config.copy()
-        return other
+        return cast(Point, self._copy(Point))
+
+    @staticmethod
+    def _make(x, y):
+        # Returns a new point at (x, y), known to be integers, without the
+        #    checks of __init__, for shapes handing out many points at once
+        point = Point.__new__(Point)
+        point._canvas = None
+        point._id = None
+        point._config = {"outline": DEFAULT_CONFIG["outline"],
+                         "fill": DEFAULT_CONFIG["fill"]}
+        point._pending = False
+        point._x = x
+        point._y = y
+        return point
+
+    def _copy_state(self, other):
+        other._x = self._x
+        other._y = self._y
 
     def _draw(self, canvas, options):
         x,y = self.x,self.y
         return canvas.create_rectangle(x,y,x+1,y+1,options)
 
+    def _bounds(self):
+        return (self._x, self._y, self._x+1, self._y+1)
+
+    def _svg(self, writer):
+        writer.element("rect", x=self._x, y=self._y, width=1, height=1,
+                       fill=writer.colour(self._config["outline"]))
+
     def _move(self, dx, dy):
         self._x = self._x + dx
         self._y = self._y + dy
@@ -500,35 +1711,54 @@ class Point(GraphixObject):
 
 class _BBox(GraphixObject):
     # Internal base class for objects represented by bounding box
-    # (opposite corners) Line segment is a degenerate case.
+    # (opposite corners) Line segment is a degenerate case. The corners are
+    # kept as plain integers; Points are only made when asked for.
 
-    __slots__ = ["_p1", "_p2"]
+    __slots__ = ["_x1", "_y1", "_x2", "_y2"]
 
-    def __init__(self, p1: Point, p2: Point,
+    def __init__(self, x1: int, y1: int, x2: int, y2: int,
                  options=None) -> None:
         if options is None:
             options = ["outline", "width", "fill"]
         GraphixObject.__init__(self, options)
-        self._p1 = p1.clone()
-        self._p2 = p2.clone()
+        self._x1 = x1
+        self._y1 = y1
+        self._x2 = x2
+        self._y2 = y2
 
     def _move(self, dx, dy):
-        self._p1.move(dx, dy)
-        self._p2.move(dx, dy)
+        self._x1 += dx
+        self._y1 += dy
+        self._x2 += dx
+        self._y2 += dy
+
+    def _copy_state(self, other):
+        other._x1 = self._x1
+        other._y1 = self._y1
+        other._x2 = self._x2
+        other._y2 = self._y2
 
     def get_p1(self) -> Point:
         """Returns a clone of the p1 point."""
-        return self._p1.clone()
+        return Point(self._x1, self._y1)
 
     def get_p2(self) -> Point:
         """Returns a clone of the p2 point"""
-        return self._p2.clone()
+        return Point(self._x2, self._y2)
 
     def get_centre(self) -> Point:
         """Returns a clone of the centre point."""
-        p1 = self._p1
-        p2 = self._p2
-        return Point((p1.x+p2.x) // 2, (p1.y+p2.y) // 2)
+        return Point((self._x1+self._x2) // 2, (self._y1+self._y2) // 2)
+
+    def _corners(self):
+        # p1 and p2 formatted as they would be by Point.__repr__
+        return (f"Point({self._x1}, {self._y1}), "
+                f"Point({self._x2}, {self._y2})")
+
+    def _bounds(self):
+        pad = self._pad()
+        return (min(self._x1, self._x2) - pad, min(self._y1, self._y2) - pad,
+                max(self._x1, self._x2) + pad, max(self._y1, self._y2) + pad)
 
 
 class Rectangle(_BBox):
@@ -540,24 +1770,22 @@ class Rectangle(_BBox):
         """Initialises the rectangle with two opposite points."""
         if not isinstance(p1, Point) or not isinstance(p2, Point):
             raise GraphixError("Rectangle points must be Point objects")
-        _BBox.__init__(self, p1, p2)
+        _BBox.__init__(self, p1._x, p1._y, p2._x, p2._y)
 
     def __repr__(self) -> str:
         """Returns a string representaiton of the rectangle."""
-        return f"Rectangle({self._p1}, {self._p2})"
+        return f"Rectangle({self._corners()})"
 
     def _draw(self, canvas, options):
-        p1 = self._p1
-        p2 = self._p2
-        x1,y1 = p1.x,p1.y
-        x2,y2 = p2.x,p2.y
-        return canvas.create_rectangle(x1,y1,x2,y2,options)
+        return canvas.create_rectangle(self._x1,self._y1,self._x2,self._y2,
+                                       options)
+
+    def _svg(self, writer):
+        writer.rectangle(self._x1, self._y1, self._x2, self._y2, self._config)
 
     def clone(self) -> Rectangle:
         """Returns a clone of the rectangle."""
-        other = Rectangle(self._p1, self._p2)
-        other._config = self._config.copy()
-        return other
+        return cast(Rectangle, self._copy(Rectangle))
 
 
 class Oval(_BBox):
@@ -570,24 +1798,32 @@ class Oval(_BBox):
         """Initialises the oval with opposite points of bounding-box."""
         if not isinstance(p1, Point) or not isinstance(p2, Point):
             raise GraphixError("Oval points must be Point objects")
-        _BBox.__init__(self, p1, p2)
+        _BBox.__init__(self, p1._x, p1._y, p2._x, p2._y)
 
     def __repr__(self) -> str:
         """Returns a string representation of the oval."""
-        return f"Oval({self._p1}, {self._p2})"
+        return f"Oval({self._corners()})"
 
     def clone(self) -> Oval:
         """Returns a clone of the oval."""
-        other = Oval(self._p1, self._p2)
-        other._config = self._config.copy()
-        return other
+        return cast(Oval, self._copy(Oval))
 
     def _draw(self, canvas, options):
-        p1 = self._p1
-        p2 = self._p2
-        x1,y1 = p1.x,p1.y
-        x2,y2 = p2.x,p2.y
-        return canvas.create_oval(x1,y1,x2,y2,options)
+        return canvas.create_oval(self._x1,self._y1,self._x2,self._y2,
+                                  options)
+
+    def _svg(self, writer):
+        writer.oval(self._x1, self._y1, self._x2, self._y2, self._config)
+
+    def _contains(self, x, y):
+        half = int(self._config["width"]) / 2
+        rx = abs(self._x2 - self._x1) / 2 + half
+        ry = abs(self._y2 - self._y1) / 2 + half
+        if rx <= 0 or ry <= 0:
+            return False
+        dx = (x - (self._x1 + self._x2) / 2) / rx
+        dy = (y - (self._y1 + self._y2) / 2) / ry
+        return dx * dx + dy * dy <= 1
 
 
 class Circle(Oval):
@@ -601,9 +1837,8 @@ class Circle(Oval):
             raise GraphixError("Circle centre must be a Point object")
         if not isinstance(radius, int):
             raise GraphixError("Circle radius must be an integer")
-        p1 = Point(centre.x-radius, centre.y-radius)
-        p2 = Point(centre.x+radius, centre.y+radius)
-        Oval.__init__(self, p1, p2)
+        x, y = centre._x, centre._y
+        _BBox.__init__(self, x-radius, y-radius, x+radius, y+radius)
         self._radius = radius
 
     def __repr__(self) -> str:
@@ -612,9 +1847,11 @@ class Circle(Oval):
 
     def clone(self) -> Circle:
         """Returns a clone of the circle."""
-        other = Circle(self.get_centre(), self.radius)
-        other._config = self._config.copy()
-        return other
+        return cast(Circle, self._copy(Circle))
+
+    def _copy_state(self, other):
+        _BBox._copy_state(self, other)
+        other._radius = self._radius
 
     @property
     def radius(self):
@@ -631,14 +1868,15 @@ class Line(_BBox):
         """Initialises the line with two end points."""
         if not isinstance(p1, Point) or not isinstance(p2, Point):
             raise GraphixError("Line points must be Point objects")
-        _BBox.__init__(self, p1, p2, ["arrow","fill","width"])
+        _BBox.__init__(self, p1._x, p1._y, p2._x, p2._y,
+                       ["arrow","fill","width"])
         self.fill_colour = cast(str, DEFAULT_CONFIG['outline'])
 
     # setting outline_colour to be the same as fill_colour
 
     def __repr__(self) -> str:
         """Returns a string representation of the line."""
-        return f"Line({self._p1}, {self._p2})"
+        return f"Line({self._corners()})"
 
     @property
     def arrow(self) -> str:
@@ -664,60 +1902,469 @@ class Line(_BBox):
 
     def clone(self) -> Line:
         """Returns a clone of the line."""
-        other = Line(self._p1, self._p2)
-        other._config = self._config.copy()
-        return other
+        return cast(Line, self._copy(Line))
 
     def _draw(self, canvas, options):
-        p1 = self._p1
-        p2 = self._p2
-        x1,y1 = p1.x,p1.y
-        x2,y2 = p2.x,p2.y
-        return canvas.create_line(x1,y1,x2,y2,options)
+        return canvas.create_line(self._x1,self._y1,self._x2,self._y2,
+                                  options)
+
+    def _svg(self, writer):
+        writer.line(self._x1, self._y1, self._x2, self._y2, self._config)
+
+    def _contains(self, x, y):
+        return _near_segment(x, y, self._x1, self._y1, self._x2, self._y2,
+                             int(self._config["width"]) / 2 + 1)
+
+
+def _coord_array(values, what):
+    # Converts a flat sequence of integers [x0, y0, x1, y1, ...], or a NumPy
+    #   integer array (flat or n x 2), to a new array('i'), raising a
+    #   GraphixError if that isn't possible
+    if getattr(values, "dtype", None) is not None:
+        np = _numpy()
+        if values.size and not np.issubdtype(values.dtype, np.integer):
+            raise GraphixError(f"{what} coordinates must be integers")
+        coords = array("i")
+        coords.frombytes(np.ascontiguousarray(values, dtype=np.intc).tobytes())
+    else:
+        try:
+            coords = array("i", values)
+        except TypeError:
+            raise GraphixError(f"{what} coordinates must be integers") \
+                from None
+        except OverflowError:
+            raise GraphixError(f"{what} coordinates out of range") from None
+    if len(coords) % 2:
+        raise GraphixError(f"{what} coordinates must come in x, y pairs")
+    return coords
+
+
+class _Vertices(GraphixObject):
+    # Internal base class for shapes drawn through a list of vertices.
+
+    # The vertices are kept as one flat array('i') [x0, y0, x1, y1, ...],
+    #    which Tk takes as it is and which holds each coordinate in four
+    #    bytes. Moves only add to the offset (_dx, _dy), which is applied
+    #    to all the vertices at once the next time they are needed, and to
+    #    the cached extent (min x, min y, max x, max y) of the vertices, so
+    #    a move costs the same however many vertices there are.
+    __slots__ = ["_coords", "_dx", "_dy", "_extent"]
+
+    def __init__(self, coords, options) -> None:
+        self._coords = coords
+        self._dx = 0
+        self._dy = 0
+        self._extent = None
+        GraphixObject.__init__(self, options)
+
+    @classmethod
+    def _from_points(cls, points, what):
+        # Checks points and returns their coordinates as an array('i')
+        if not isinstance(points, list):
+            raise GraphixError(f"{what} points must be a list")
+        coords: list[int] = []
+        append = coords.append
+        for p in points:
+            if not isinstance(p, Point):
+                raise GraphixError(f"{what} points must all be Point objects")
+            append(p._x)
+            append(p._y)
+        try:
+            return array("i", coords)
+        except OverflowError:
+            raise GraphixError(f"{what} coordinates out of range") from None
 
+    def __repr__(self):
+        return f"{type(self).__name__}({self.get_points()})"
+
+    def _copy_state(self, other):
+        other._coords = self._coords[:]
+        other._dx = self._dx
+        other._dy = self._dy
+        other._extent = self._extent
+
+    def get_points(self) -> list[Point]:
+        """Returns a clone of the list of the points in the shape."""
+        values = iter(self._vertices())
+        make = Point._make
+        return [make(x, y) for x, y in zip(values, values)]
 
-class Polygon(GraphixObject):
+    def get_coords(self) -> array:
+        """Returns a copy of the coordinates of the points in the shape as
+        a flat array('i') [x0, y0, x1, y1, ...]."""
+        return self._vertices()[:]
+
+    def _move(self, dx, dy):
+        self._dx += dx
+        self._dy += dy
+
+    def _vertices(self):
+        # Returns the flat vertex array with any pending offset applied
+        coords = self._coords
+        if self._dx or self._dy:
+            dx, dy = self._dx, self._dy
+            coords[0::2] = array("i", [x + dx for x in coords[0::2]])
+            coords[1::2] = array("i", [y + dy for y in coords[1::2]])
+            if self._extent is not None:
+                x1, y1, x2, y2 = self._extent
+                self._extent = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+            self._dx = self._dy = 0
+        return coords
+
+    def _bounds(self):
+        coords = self._coords
+        if not coords:
+            return None
+        if self._extent is None:
+            self._extent = (min(coords[0::2]), min(coords[1::2]),
+                            max(coords[0::2]), max(coords[1::2]))
+        x1, y1, x2, y2 = self._extent
+        dx, dy = self._dx, self._dy
+        pad = self._pad()
+        return (x1 + dx - pad, y1 + dy - pad, x2 + dx + pad, y2 + dy + pad)
+
+    def _points(self):
+        # The vertices as a list of (x, y) tuples
+        coords = self._vertices()
+        return list(zip(coords[0::2], coords[1::2]))
+
+    def _near(self, x, y):
+        # True if (x, y) is inside the bounding box, checked before the
+        #    vertices are walked
+        bounds = self._bounds()
+        return (bounds is not None and bounds[0] <= x <= bounds[2]
+                and bounds[1] <= y <= bounds[3])
+
+
+class Polygon(_Vertices):
     """A class representing a polygon based on a list of points."""
 
-    __slots__ = ["_points"]
+    __slots__ = []
 
     def __init__(self, points: list[Point]) -> None:
         """Initialises the polygon with a list of points."""
-        if not isinstance(points, list):
-            raise GraphixError("Polygon points must be a list")
-        if not all(isinstance(p, Point) for p in points):
-            raise GraphixError("Polygon points must all be Point objects")
-        self._points = list(map(Point.clone, points))
-        GraphixObject.__init__(self, ["outline", "width", "fill"])
-
-    def __repr__(self):
-        """Returns a string representation of the polygon."""
-        return f"Polygon({self._points})"
+        _Vertices.__init__(self, self._from_points(points, "Polygon"),
+                           ["outline", "width", "fill"])
+
+    @classmethod
+    def from_coords(cls, coords) -> Polygon:
+        """Returns a polygon whose vertices are given by coords, a flat
+        sequence of integers [x0, y0, x1, y1, ...] such as a list, an
+        array('i') or a NumPy integer array (which may also be n x 2).
+        No Point objects are made, so this is the fast way to build large
+        polygons."""
+        polygon = cls.__new__(cls)
+        _Vertices.__init__(polygon, _coord_array(coords, "Polygon"),
+                           ["outline", "width", "fill"])
+        return polygon
 
     def clone(self) -> Polygon:
         """Returns a clone of the polygon."""
-        other = Polygon(self._points)
-        other._config = self._config.copy()
-        return other
+        return cast(Polygon, self._copy(Polygon))
+
+    def _contains(self, x, y):
+        # Even-odd rule for the interior, plus the outline itself
+        if not self._near(x, y):
+            return False
+        points = self._points()
+        half = int(self._config["width"]) / 2 + 1
+        inside = False
+        for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+            if _near_segment(x, y, x1, y1, x2, y2, half):
+                return True
+            if (y1 > y) != (y2 > y):
+                if x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+        return inside
 
-    def get_points(self) -> list[Point]:
-        """Returns a clone of the list of the points in the polygon."""
-        return list(map(Point.clone, self._points))
+    def _draw(self, canvas, options):
+        return canvas.create_polygon(*self._vertices(), options)
 
-    def _move(self, dx, dy):
-        if not isinstance(dx, int) or not isinstance(dy, int):
-            raise GraphixError("Move distances must both be integers")
-        for p in self._points:
-            p.move(dx,dy)
+    def _svg(self, writer):
+        writer.shape("polygon", self._config,
+                     points=writer.points(self._vertices()))
+
+
+class Polyline(_Vertices):
+    """A class representing an open line through a list of points."""
+
+    __slots__ = []
+
+    def __init__(self, points: list[Point]) -> None:
+        """Initialises the polyline with a list of at least two points."""
+        coords = self._from_points(points, "Polyline")
+        if len(coords) < 4:
+            raise GraphixError("Polyline needs at least 2 points")
+        _Vertices.__init__(self, coords, ["arrow", "fill", "width"])
+        self.fill_colour = cast(str, DEFAULT_CONFIG['outline'])
+
+    @classmethod
+    def from_coords(cls, coords) -> Polyline:
+        """Returns a polyline through the points given by coords, a flat
+        sequence of integers [x0, y0, x1, y1, ...] such as a list, an
+        array('i') or a NumPy integer array (which may also be n x 2).
+        No Point objects are made, so this is the fast way to build long
+        polylines."""
+        coords = _coord_array(coords, "Polyline")
+        if len(coords) < 4:
+            raise GraphixError("Polyline needs at least 2 points")
+        polyline = cls.__new__(cls)
+        _Vertices.__init__(polyline, coords, ["arrow", "fill", "width"])
+        polyline._config["fill"] = DEFAULT_CONFIG['outline']
+        return polyline
+
+    # setting outline_colour to be the same as fill_colour
+
+    @property
+    def arrow(self) -> str:
+        """The arrow setting for the polyline."""
+        return cast(str, self._config["arrow"])
+
+    @arrow.setter
+    def arrow(self, option: str) -> None:
+        if not option in ["first","last","both","none"]:
+            raise GraphixError(BAD_OPTION)
+        self._reconfig("arrow", option)
+
+    @property
+    def outline_colour(self) -> str:
+        """The outline colour of the polyline."""
+        return self.fill_colour
+
+    @outline_colour.setter
+    def outline_colour(self, colour: str) -> None:
+        if not isinstance(colour, str):
+            raise GraphixError("Outline colour must be a string")
+        self.fill_colour = colour
+
+    def clone(self) -> Polyline:
+        """Returns a clone of the polyline."""
+        return cast(Polyline, self._copy(Polyline))
+
+    def _contains(self, x, y):
+        if not self._near(x, y):
+            return False
+        points = self._points()
+        half = int(self._config["width"]) / 2 + 1
+        return any(_near_segment(x, y, x1, y1, x2, y2, half)
+                   for (x1, y1), (x2, y2) in zip(points, points[1:]))
+
+    def _draw(self, canvas, options):
+        return canvas.create_line(*self._vertices(), options)
+
+    def _svg(self, writer):
+        writer.polyline(self._vertices(), self._config)
+
+
+class Series(Polyline):
+    """A class representing a line through a stream of points, such as
+    the samples of a live chart, that grows as points are appended. Only
+    the latest max_points points are kept: older ones are dropped as new
+    ones arrive. The whole series is one line in the window, which is
+    redrawn at most fps times a second however fast points arrive, so
+    thousands of samples a second can be plotted. To scroll the chart,
+    move the series, which costs the same however long it is."""
+
+    # The points are kept in the array('i') of _Vertices, with the first
+    #    _start entries being dropped points still to be cut off. Cutting
+    #    them off waits until the next redraw or until there are as many
+    #    as the limit, so each appended point costs the same on average
+    #    however many points are kept.
+    __slots__ = ["_limit", "_start", "_interval", "_shown", "_stale",
+                 "_redraw_pending"]
+
+    def __init__(self, max_points: int = 1000, fps: int | float = 60) -> None:
+        """Initialises an empty series keeping up to max_points points,
+        redrawn at most fps times a second."""
+        if not isinstance(max_points, int) or max_points < 2:
+            raise GraphixError("Series max_points must be at least 2")
+        if not isinstance(fps, (int, float)) or fps <= 0:
+            raise GraphixError("Series fps must be a positive number")
+        _Vertices.__init__(self, array("i"), ["arrow", "fill", "width"])
+        self._config["fill"] = DEFAULT_CONFIG['outline']
+        self._limit = 2 * max_points
+        self._start = 0
+        self._interval = 1 / fps
+        # When the line was last redrawn, whether points have changed
+        #    since, and whether a later redraw has been arranged
+        self._shown = 0.0
+        self._stale = False
+        self._redraw_pending = False
+
+    @classmethod
+    def from_coords(cls, coords, max_points: int = 1000,
+                    fps: int | float = 60) -> Series:
+        """Returns a series holding the points given by coords, a flat
+        sequence of integers [x0, y0, x1, y1, ...] such as a list, an
+        array('i') or a NumPy integer array (which may also be n x 2).
+        Only the last max_points of them are kept."""
+        series = cls(max_points, fps)
+        series.extend(coords)
+        return series
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the series."""
+        return f"Series({len(self)} points, max_points={self._limit // 2})"
+
+    def __len__(self) -> int:
+        return (len(self._coords) - self._start) // 2
+
+    @property
+    def max_points(self) -> int:
+        """The most points the series keeps."""
+        return self._limit // 2
+
+    def append(self, x: int, y: int) -> None:
+        """Adds the point (x, y) to the end of the series, dropping the
+        oldest point if the series is full."""
+        if not isinstance(x, int) or not isinstance(y, int):
+            raise GraphixError("Series coordinates must be integers")
+        # The checks of _threadsafe, written out as this is called for
+        #    every sample
+        canvas = self._canvas
+        if (canvas is not None and canvas._thread != threading.get_ident()
+                and not canvas._closed):
+            canvas._post(Series.append, self, (x, y), {})
+            return
+        if canvas is not None and self._id is None:
+            self._settle()
+        coords = self._coords
+        coords.append(x - self._dx)
+        coords.append(y - self._dy)
+        if len(coords) - self._start > self._limit:
+            self._start += 2
+            if self._start >= self._limit:
+                self._trim()
+        self._extent = None
+        self._changed()
+
+    @_threadsafe
+    def extend(self, coords) -> None:
+        """Adds the points given by coords, a flat sequence of integers
+        [x0, y0, x1, y1, ...] such as a list, an array('i') or a NumPy
+        integer array (which may also be n x 2), to the end of the series,
+        dropping the oldest points if it becomes full."""
+        new = _coord_array(coords, "Series")
+        if not new:
+            return
+        limit = self._limit
+        if len(new) > limit:
+            new = new[-limit:]
+        if self._dx or self._dy:
+            dx, dy = self._dx, self._dy
+            new[0::2] = array("i", [x - dx for x in new[0::2]])
+            new[1::2] = array("i", [y - dy for y in new[1::2]])
+        self._coords.extend(new)
+        extra = len(self._coords) - self._start - limit
+        if extra > 0:
+            self._start += extra
+            if self._start >= limit:
+                self._trim()
+        self._extent = None
+        self._changed()
+
+    @_threadsafe
+    def clear(self) -> None:
+        """Removes all the points from the series."""
+        self._coords = array("i")
+        self._start = 0
+        self._extent = None
+        self._changed()
+
+    def clone(self) -> Series:
+        """Returns a clone of the series."""
+        return cast(Series, self._copy(Series))
+
+    def _copy_state(self, other):
+        self._trim()
+        _Vertices._copy_state(self, other)
+        other._limit = self._limit
+        other._start = 0
+        other._interval = self._interval
+        other._shown = 0.0
+        other._stale = False
+        other._redraw_pending = False
+
+    def _undrawn_state(self):
+        self._trim()
+        return dict(GraphixObject._undrawn_state(self), _shown=0.0,
+                    _stale=False, _redraw_pending=False)
+
+    def _trim(self):
+        # Cuts the dropped points off the front of the array
+        if self._start:
+            del self._coords[:self._start]
+            self._start = 0
+
+    def _vertices(self):
+        self._trim()
+        return _Vertices._vertices(self)
+
+    def _bounds(self):
+        self._trim()
+        return _Vertices._bounds(self)
+
+    def _line(self):
+        # The coordinates to give Tk, which needs at least two points:
+        #    a single point is given twice, and an empty series is drawn
+        #    as a point outside the window
+        coords = self._vertices()
+        if len(coords) >= 4:
+            return coords
+        if coords:
+            return coords * 2
+        return array("i", [-1000000] * 4)
+
+    def _changed(self):
+        # Redraws the line if it is drawn and a frame has passed since it
+        #    was last redrawn, and otherwise arranges for it to be redrawn
+        #    once one has
+        self._stale = True
+        canvas = self._canvas
+        if not canvas or canvas.is_closed():
+            return
+        if canvas._thread != threading.get_ident():
+            if not self._redraw_pending:
+                self._redraw_pending = True
+                canvas._post(Series._redraw_due, self, (), {})
+            return
+        # Found where it now lies even before the points are sent
+        canvas._items.changed(self)
+        wait = self._shown + self._interval - time.perf_counter()
+        if wait <= 0 and not canvas._pending_moves:
+            self._redraw()
+            canvas._autoflush_update()
+        elif not self._redraw_pending:
+            # Moves collected by a batch are sent when it ends, to the
+            #    points already drawn, so sending the moved points before
+            #    then would move them twice
+            self._redraw_pending = True
+            canvas._backend.after(max(1, round(wait * 1000)),
+                                  self._redraw_due)
+
+    def _redraw_due(self):
+        self._redraw_pending = False
+        if self._stale:
+            self._changed()
+
+    def _redraw(self):
+        # Sends all the points to the drawn line in one command
+        canvas = self._canvas
+        self._stale = False
+        self._shown = time.perf_counter()
+        start = self._shown if _recorders else 0.0
+        canvas._backend.coords(self._id, *self._line())
+        if start:
+            _record(canvas, "reconfig", start)
 
     def _draw(self, canvas, options):
-        args = [canvas]
-        for p in self._points:
-            x,y = p.x,p.y
-            args.append(x)
-            args.append(y)
-        args.append(options)
-        return Window.create_polygon(*args)
+        self._stale = False
+        self._shown = time.perf_counter()
+        return canvas.create_line(*self._line(), options)
+
+    def _svg(self, writer):
+        if len(self) >= 2:
+            writer.polyline(self._vertices(), self._config)
 
 
 class Text(GraphixObject):
@@ -821,26 +2468,50 @@ class Text(GraphixObject):
         """Returns a clone of the anchor point."""
         return self._anchor.clone()
 
+    def measure(self) -> tuple[int, int]:
+        """Returns the width and height in pixels that the text takes up
+        when drawn, without needing to draw it."""
+        canvas = self._canvas
+        if canvas is not None and canvas._backend is not canvas:
+            backend = "headless"
+        elif canvas is not None:
+            backend = "tk"
+        else:
+            backend = _default_backend
+        return _measure(backend, self._config["font"], self._config["text"])
+
+    def get_bbox(self) -> Rectangle:
+        """Returns a Rectangle around the text as it is (or would be)
+        drawn, centred on the anchor point."""
+        width, height = self.measure()
+        x = self._anchor._x - width // 2
+        y = self._anchor._y - height // 2
+        return Rectangle(Point(x, y), Point(x + width, y + height))
+
     def clone(self) -> Text:
         """Returns a clone of the text object."""
-        other = Text(self._anchor, self.text)
-        other._config = self._config.copy()
-        return other
+        return cast(Text, self._copy(Text))
+
+    def _copy_state(self, other):
+        other._anchor = self._anchor.clone()
 
     def _draw(self, canvas, options):
         p = self._anchor
         x,y = p.x,p.y
-        return canvas.create_text(x,y,options)
+        return canvas.create_text(x,y,_tk_options(canvas, options))
 
     def _move(self, dx, dy):
-        self._anchor.move(dx,dy)
+        self._anchor._move(dx,dy)
+
+    def _svg(self, writer):
+        writer.text(self._anchor._x, self._anchor._y, self._config)
 
 
 class Entry(GraphixObject):
     """A class representing an text entry box with anchor point and width."""
 
-    __slots__ = ["_anchor", "_width", "_text", "_fill_colour", "_text_colour",
-                 "_font", "_entry"]
+    __slots__ = ["_anchor", "_width", "_text", "_text_var", "_fill_colour",
+                 "_text_colour", "_font", "_entry"]
 
     def __init__(self, anchor: Point, width: int) -> None:
         """Initialises the entry object with an anchor point and width."""
@@ -851,8 +2522,10 @@ class Entry(GraphixObject):
         GraphixObject.__init__(self, [])
         self._anchor = anchor.clone()
         self._width = width
-        self._text = tk.StringVar(_root)
-        self._text.set("")
+        # The Tk variable holding the text is created when the entry is
+        #    first drawn; until then the text is kept in _text
+        self._text = ""
+        self._text_var = None
         self._fill_colour = "grey"
         self._text_colour = "black"
         self._font = DEFAULT_CONFIG['font']
@@ -878,13 +2551,18 @@ class Entry(GraphixObject):
     @property
     def text(self)  -> str:
         """The text of the entry object."""
-        return self._text.get()
+        if self._text_var is not None:
+            return self._text_var.get()
+        return self._text
 
     @text.setter
+    @_threadsafe
     def text(self, text: str) -> None:
         if not isinstance(text, str):
             raise GraphixError("Text must be a string")
-        self._text.set(text)
+        self._text = text
+        if self._text_var is not None:
+            self._text_var.set(text)
 
     @property
     def fill_colour(self) -> str:
@@ -892,6 +2570,7 @@ class Entry(GraphixObject):
         return self._fill_colour
 
     @fill_colour.setter
+    @_threadsafe
     def fill_colour(self, colour: str) -> None:
         if not isinstance(colour, str):
             raise GraphixError("Fill colour must be a string")
@@ -943,6 +2622,7 @@ class Entry(GraphixObject):
         return self._text_colour
 
     @text_colour.setter
+    @_threadsafe
     def text_colour(self, colour: str) -> None:
         if not isinstance(colour, str):
             raise GraphixError("Text colour must be a string")
@@ -963,34 +2643,2635 @@ class Entry(GraphixObject):
         other.text = self.text
         return other
 
+    def _copy_state(self, other):
+        other._anchor = self._anchor.clone()
+        other._width = self._width
+        other._text = self.text
+        other._text_var = None
+        other._fill_colour = self._fill_colour
+        other._text_colour = self._text_colour
+        other._font = self._font
+        other._entry = None
+
+    _check = GraphixObject._check_on_copy
+
+    def _undrawn_state(self):
+        return dict(GraphixObject._undrawn_state(self), _text=self.text,
+                    _text_var=None, _entry=None)
+
     def _draw(self, canvas, options):
+        if not isinstance(canvas, tk.Canvas):
+            raise GraphixError(UNSUPPORTED_METHOD)
         p = self._anchor
         x,y = p.x,p.y
+        if self._text_var is None:
+            self._text_var = tk.StringVar(_get_root(), self._text)
         frm = tk.Frame(canvas.master)
         self._entry = tk.Entry(frm,
                               width=self._width,
-                              textvariable=self._text,
+                              textvariable=self._text_var,
                               bg = self._fill_colour,
                               fg = self._text_colour,
-                              font=self._font)
+                              font=_named_font(self._font))
         self._entry.pack()
         self._entry.focus_set()
         return canvas.create_window(x,y,window=frm)
 
     def _move(self, dx, dy):
-        self._anchor.move(dx,dy)
+        self._anchor._move(dx,dy)
 
+    @_threadsafe
     def _set_font_component(self, which, value):
         font = list(self._font)
         font[which] = value
         self._font = tuple(font)
         if self._entry:
-            self._entry.config(font=self._font)
+            self._entry.config(font=_named_font(self._font))
 
     def _get_font_component(self, which):
         return self._font[which]
 
 
+class Group(GraphixObject):
+    """A class representing several objects drawn, moved, restyled and
+    undrawn together. Every canvas item of the group's objects carries the
+    group's Tk tag, so moving or undrawing a drawn group is a single canvas
+    command however many objects it holds. Groups may contain other
+    groups, but an object should only belong to one group."""
+
+    __slots__ = ["_children", "_parent"]
+
+    # The group attributes, and the option each is recorded under
+    _ATTRIBUTES = {"fill_colour": "fill", "outline_colour": "outline",
+                   "outline_width": "width"}
+
+    def __init__(self, objects=()) -> None:
+        """Initialises the group with a sequence of GraphixObjects."""
+        GraphixObject.__init__(self, ["fill", "outline", "width"])
+        self._children: list[GraphixObject] = []
+        self._parent: Group | None = None
+        for obj in objects:
+            self.add(obj)
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the group."""
+        return f"Group({len(self)} objects)"
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    @property
+    def fill_colour(self) -> str:
+        """The interior colour last given to every object in the group."""
+        return cast(str, self._config["fill"])
+
+    @fill_colour.setter
+    def fill_colour(self, colour: str) -> None:
+        self.configure(fill_colour=colour)
+
+    @property
+    def outline_colour(self) -> str:
+        """The outline colour last given to every object in the group."""
+        return cast(str, self._config["outline"])
+
+    @outline_colour.setter
+    def outline_colour(self, colour: str) -> None:
+        self.configure(outline_colour=colour)
+
+    @property
+    def outline_width(self) -> int:
+        """The outline width last given to every object in the group."""
+        return cast(int, self._config["width"])
+
+    @outline_width.setter
+    def outline_width(self, width: int) -> None:
+        self.configure(outline_width=width)
+
+    def get_objects(self) -> list[GraphixObject]:
+        """Returns a list of the objects in the group."""
+        return list(self._children)
+
+    @_threadsafe
+    def add(self, obj: GraphixObject) -> None:
+        """Adds obj to the group. If the group is drawn, obj is drawn in
+        the same window."""
+        if not isinstance(obj, GraphixObject) or isinstance(obj, Entry):
+            raise GraphixError("Group objects must be shapes or groups")
+        if isinstance(obj, Group):
+            if obj._parent is not None:
+                raise GraphixError("Group already belongs to a group")
+            if obj is self or self in obj._lineage():
+                raise GraphixError("A group can't contain itself")
+        window = self._canvas
+        if window is not None and not window.is_closed():
+            if obj._canvas is None or obj._canvas.is_closed():
+                obj.draw(window)
+            elif obj._canvas is not window:
+                raise GraphixError(OBJ_ALREADY_DRAWN)
+            self._rejoin(obj)
+            window._members[obj] = self
+        elif obj._canvas is not None and not obj._canvas.is_closed():
+            raise GraphixError(OBJ_ALREADY_DRAWN)
+        self._children.append(obj)
+        if isinstance(obj, Group):
+            obj._parent = self
+
+    @_threadsafe
+    def remove(self, obj: GraphixObject) -> None:
+        """Removes obj from the group, leaving it drawn if it was."""
+        if obj not in self._children:
+            raise GraphixError("Object is not in the group")
+        self._children.remove(obj)
+        if isinstance(obj, Group):
+            obj._parent = None
+        window = self._canvas
+        if window is not None and not window.is_closed():
+            window._members.pop(obj, None)
+            if obj._canvas:
+                backend = window._backend
+                for group in self._lineage():
+                    backend.dtag(obj._id, group._id)
+
+    def draw(self, window: Window) -> None:
+        """Draws every object in the group in window."""
+        if not isinstance(window, Window):
+            raise GraphixError("Object must be drawn in a Window")
+        if self._canvas and not self._canvas.is_closed():
+            raise GraphixError(OBJ_ALREADY_DRAWN)
+        if window.is_closed():
+            raise GraphixError("Can't draw to closed window")
+        for leaf in self._leaves():
+            if leaf._canvas and not leaf._canvas.is_closed():
+                raise GraphixError(OBJ_ALREADY_DRAWN)
+        if window._thread != threading.get_ident():
+            self._post_draw(window)
+            return
+        with window.batch():
+            for child in self._children:
+                child.draw(window)
+            self._tag(window)
+            parent = window._members.get(self)
+            if parent is not None and parent._canvas is window:
+                parent._rejoin(self)
+
+    @_threadsafe
+    def undraw(self) -> None:
+        """Undraws every object in the group with one canvas command."""
+        window = self._canvas
+        if not window:
+            return
+        if not window.is_closed():
+            start = time.perf_counter() if _recorders else 0.0
+            window._backend.delete(self._id)
+            if start:
+                _record(window, "undraw", start)
+            for leaf in self._leaves():
+                if leaf._canvas is window:
+                    window._del_item(leaf)
+                    leaf._canvas = None
+                    leaf._id = None
+            window._autoflush_update()
+        for group in self._groups():
+            window._groups.pop(group, None)
+            for child in group._children:
+                window._members.pop(child, None)
+            group._canvas = None
+            group._id = None
+
+    @_threadsafe
+    def configure(self, **attributes) -> None:
+        """Sets attributes on every object in the group that has them, for
+        example group.configure(fill_colour="red"). When every drawn object
+        needs the same change it is made with one canvas command."""
+        leaves = list(self._leaves())
+        # The group's own attributes are checked by the setters every
+        #    shape uses, even when no object in the group has them
+        own = self._config.copy()
+        self._pending = True
+        try:
+            for name in self._ATTRIBUTES:
+                if name in attributes:
+                    getattr(GraphixObject, name).fset(self, attributes[name])
+        except BaseException:
+            self._config = own
+            raise
+        finally:
+            self._pending = False
+        collected = []
+        matched = set()
+        try:
+            for leaf in leaves:
+                wanted = {name: value for name, value in attributes.items()
+                          if _settable(leaf, name)}
+                matched.update(wanted)
+                collected.append((leaf, leaf._collect(wanted)))
+            for name in attributes:
+                if name not in matched and name not in self._ATTRIBUTES:
+                    raise GraphixError(f"'Group' object has no settable "
+                                       f"attribute '{name}'")
+        except BaseException:
+            for leaf, saved in collected:
+                leaf._config = saved
+            self._config = own
+            raise
+
+        window = self._canvas
+        if window is None or window.is_closed():
+            return
+        changes = {}
+        for leaf, saved in collected:
+            if leaf._canvas is window:
+                changes[leaf] = tuple(
+                    (option, setting) for option, setting
+                    in leaf._config.items() if saved.get(option) != setting)
+        distinct = set(changes.values())
+        backend = window._backend
+        start = time.perf_counter() if _recorders else 0.0
+        sent = 0
+        if len(distinct) == 1 and len(changes) == len(leaves):
+            # Every item carrying the group's tag needs the same change
+            options = dict(distinct.pop())
+            if options:
+                backend.itemconfig(self._id, _tk_options(backend, options))
+                sent = 1
+        else:
+            for leaf, leaf_changes in changes.items():
+                if leaf_changes:
+                    backend.itemconfig(leaf._id,
+                                       _tk_options(backend, dict(leaf_changes)))
+                    sent += 1
+        if start:
+            _record(window, "reconfig", start, sent)
+        for leaf in changes:
+            window._items.changed(leaf)
+        window._autoflush_update()
+
+    def clone(self) -> Group:
+        """Returns a clone of the group, holding clones of its objects."""
+        other = Group([child.clone() for child in self._children])
+        other._config = self._config.copy()
+        return other
+
+    def _draw(self, canvas, options):
+        # Groups are drawn by drawing their objects
+        raise GraphixError(UNSUPPORTED_METHOD)
+
+    def _move(self, dx, dy):
+        for child in self._children:
+            child._move(dx, dy)
+
+    def _tag(self, window):
+        # Gives the group a new tag and adds it to the items of its drawn
+        #    objects. Nested groups are tagged first, so each of them only
+        #    needs one command.
+        tag = _new_tag()
+        backend = window._backend
+        for child in self._children:
+            if child._canvas is window:
+                backend.addtag_withtag(tag, child._id)
+            window._members[child] = self
+        self._canvas = window  # type: ignore
+        self._id = tag
+        window._groups[self] = None
+
+    def _rejoin(self, obj):
+        # Adds the tags of the group and the groups holding it to the items
+        #    of obj, which is drawn in the group's window: when it is added,
+        #    or when it is drawn again after being undrawn on its own
+        backend = self._canvas._backend
+        for group in self._lineage():
+            backend.addtag_withtag(group._id, obj._id)
+
+    def _leaves(self) -> Iterator[GraphixObject]:
+        # The objects in the group and its nested groups that aren't groups
+        for child in self._children:
+            if isinstance(child, Group):
+                yield from child._leaves()
+            else:
+                yield child
+
+    def _groups(self) -> Iterator[Group]:
+        # The group and all the groups nested inside it
+        yield self
+        for child in self._children:
+            if isinstance(child, Group):
+                yield from child._groups()
+
+    def _lineage(self) -> Iterator[Group]:
+        # The group and the groups it belongs to, innermost first
+        group: Group | None = self
+        while group is not None:
+            yield group
+            group = group._parent
+
+
+def _settable(obj, name):
+    # Returns True if name is a property of obj that can be set
+    prop = getattr(type(obj), name, None)
+    return isinstance(prop, property) and prop.fset is not None
+
+
+class PixelImage(GraphixObject):
+    """A class representing an image whose pixels can be set one at a time
+    or a row or region at a time. The pixels are kept in a buffer of RGB
+    bytes, and changes are sent to the window in one piece the next time
+    it is updated, however many pixels were set."""
+
+    __slots__ = ["_anchor", "_width", "_height", "_pixels", "_photo",
+                 "_dirty", "_push_pending", "_lock"]
+
+    def __init__(self, width: int, height: int,
+                 anchor: Point | None = None) -> None:
+        """Initialises a white image of width by height pixels whose top
+        left corner is at anchor, which defaults to Point(0, 0)."""
+        if not isinstance(width, int) or not isinstance(height, int):
+            raise GraphixError("Image dimensions must be integers")
+        if width < 1 or height < 1:
+            raise GraphixError("Image dimensions must be positive")
+        if anchor is None:
+            anchor = Point(0, 0)
+        if not isinstance(anchor, Point):
+            raise GraphixError("Image anchor must be a Point object")
+        GraphixObject.__init__(self, [])
+        self._anchor = anchor.clone()
+        self._width = width
+        self._height = height
+        self._pixels = bytearray(b"\xff" * (width * height * 3))
+        # The Tk PhotoImage showing the pixels, made when first drawn
+        self._photo = None
+        # The region changed since the pixels were last sent to the
+        #    window, as [x1, y1, x2, y2], or None
+        self._dirty: list[int] | None = None
+        self._push_pending = False
+        # Guards _dirty and _push_pending, as other threads may mark
+        #    changes while the window's thread is sending them
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the image."""
+        return f"PixelImage({self._width}, {self._height}, {self._anchor})"
+
+    @property
+    def width(self) -> int:
+        """The width of the image in pixels."""
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """The height of the image in pixels."""
+        return self._height
+
+    def get_anchor(self) -> Point:
+        """Returns a clone of the top left corner point."""
+        return self._anchor.clone()
+
+    def get_pixel(self, x: int, y: int) -> tuple[int, int, int]:
+        """Returns the colour of the pixel at (x, y) as (red, green, blue)."""
+        start = self._offset(x, y)
+        return tuple(self._pixels[start:start + 3])  # type: ignore
+
+    def set_pixel(self, x: int, y: int, colour) -> None:
+        """Sets the pixel at (x, y) to colour, which may be a colour name
+        or a (red, green, blue) tuple."""
+        start = self._offset(x, y)
+        self._pixels[start:start + 3] = _pixel_colour(colour)
+        self._mark(x, y, x + 1, y + 1)
+
+    def fill(self, colour) -> None:
+        """Sets every pixel to colour."""
+        self._pixels[:] = _pixel_colour(colour) * (self._width *
+                                                   self._height)
+        self._mark(0, 0, self._width, self._height)
+
+    def set_row(self, y: int, data, x: int = 0) -> None:
+        """Copies data, a bytes-like object of RGB triples, into row y
+        starting at column x."""
+        self.set_region(x, y, len(_byte_view(data)) // 3, 1, data)
+
+    def set_region(self, x: int, y: int, width: int, height: int,
+                   data) -> None:
+        """Copies data, a bytes-like object of width*height RGB triples
+        given row by row, into the region with top left corner (x, y)."""
+        view = _byte_view(data)
+        if width < 0 or height < 0 or len(view) != width * height * 3:
+            raise GraphixError("Pixel data must hold width*height*3 bytes")
+        if width == 0 or height == 0:
+            return
+        self._offset(x, y)
+        self._offset(x + width - 1, y + height - 1)
+        stride = self._width * 3
+        row_bytes = width * 3
+        start = self._offset(x, y)
+        if width == self._width:
+            self._pixels[start:start + len(view)] = view
+        else:
+            for row in range(height):
+                self._pixels[start:start + row_bytes] = \
+                    view[row*row_bytes:(row + 1)*row_bytes]
+                start += stride
+        self._mark(x, y, x + width, y + height)
+
+    def get_buffer(self) -> memoryview:
+        """Returns a view of the pixel buffer, three bytes (red, green,
+        blue) per pixel, row by row. Call mark_dirty after writing to it."""
+        return memoryview(self._pixels)
+
+    def get_array(self) -> Any:
+        """Returns a NumPy array of shape (height, width, 3) sharing the
+        pixel buffer. Call mark_dirty after writing to it."""
+        return _numpy().frombuffer(self._pixels, dtype=_numpy().uint8) \
+            .reshape(self._height, self._width, 3)
+
+    def mark_dirty(self, x: int = 0, y: int = 0, width: int | None = None,
+                   height: int | None = None) -> None:
+        """Records that the given region (by default the rest of the image
+        from (x, y)) was changed through get_buffer or get_array, so it is
+        redrawn. The region must lie inside the image."""
+        if not isinstance(x, int) or not isinstance(y, int):
+            raise GraphixError("Pixel coordinates must be integers")
+        if width is None:
+            width = self._width - x
+        if height is None:
+            height = self._height - y
+        if not isinstance(width, int) or not isinstance(height, int):
+            raise GraphixError("Pixel region size must be integers")
+        if width < 0 or height < 0:
+            raise GraphixError("Pixel region size must not be negative")
+        if (x < 0 or y < 0 or x + width > self._width
+                or y + height > self._height):
+            raise GraphixError("Pixel region outside the image")
+        if width and height:
+            self._mark(x, y, x + width, y + height)
+
+    def clone(self) -> PixelImage:
+        """Returns a clone of the image."""
+        return cast(PixelImage, self._copy(PixelImage))
+
+    def _copy_state(self, other):
+        other._anchor = self._anchor.clone()
+        other._width = self._width
+        other._height = self._height
+        other._pixels = bytearray(self._pixels)
+        other._photo = None
+        other._dirty = None
+        other._push_pending = False
+        other._lock = threading.Lock()
+
+    def _undrawn_state(self):
+        return dict(GraphixObject._undrawn_state(self), _photo=None,
+                    _dirty=None, _push_pending=False, _lock=None)
+
+    def __setstate__(self, values):
+        GraphixObject.__setstate__(self, values)
+        self._lock = threading.Lock()
+
+    def _offset(self, x, y):
+        # Index in the buffer of the pixel at (x, y)
+        if not isinstance(x, int) or not isinstance(y, int):
+            raise GraphixError("Pixel coordinates must be integers")
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            raise GraphixError("Pixel coordinates outside the image")
+        return (y * self._width + x) * 3
+
+    def _mark(self, x1, y1, x2, y2):
+        # Adds a changed region and, if the image is drawn, arranges for
+        #    the changes to be sent once the window is idle
+        canvas = self._canvas
+        with self._lock:
+            dirty = self._dirty
+            if dirty is None:
+                self._dirty = [x1, y1, x2, y2]
+            else:
+                if x1 < dirty[0]:
+                    dirty[0] = x1
+                if y1 < dirty[1]:
+                    dirty[1] = y1
+                if x2 > dirty[2]:
+                    dirty[2] = x2
+                if y2 > dirty[3]:
+                    dirty[3] = y2
+            send = (canvas and not self._push_pending
+                    and not canvas.is_closed())
+            if send:
+                self._push_pending = True
+        if send:
+            if canvas._thread == threading.get_ident():
+                canvas._backend.after_idle(self._push)
+            else:
+                # Pixels written by another thread go straight into the
+                #    buffer; only sending them is left to the window's thread
+                canvas._post(PixelImage._push, self, (), {})
+
+    def _push(self):
+        # Sends the changed region to the drawn image in one command
+        if self._canvas is not None and self._id is None:
+            self._settle()
+        canvas = self._canvas
+        with self._lock:
+            self._push_pending = False
+            dirty = self._dirty
+            if dirty is None or not canvas or canvas.is_closed():
+                return
+            self._dirty = None
+        start = time.perf_counter() if _recorders else 0.0
+        backend = canvas._backend
+        if backend is canvas:
+            x1, y1, x2, y2 = dirty
+            photo = cast(tk.PhotoImage, self._photo)
+            photo.tk.call(photo.name, "put", self._ppm(x1, y1, x2, y2),
+                          "-format", "ppm", "-to", x1, y1)
+        else:
+            backend.itemconfig(self._id, {"image": self._raster_image()})
+        if start:
+            _record(canvas, "reconfig", start)
+
+    def _ppm(self, x1, y1, x2, y2):
+        # The region as a binary PPM image
+        header = f"P6\n{x2 - x1} {y2 - y1}\n255\n".encode("ascii")
+        pixels = self._pixels
+        stride = self._width * 3
+        if x1 == 0 and x2 == self._width:
+            body = pixels[y1*stride:y2*stride]
+        else:
+            body = b"".join(pixels[y*stride + x1*3:y*stride + x2*3]
+                            for y in range(y1, y2))
+        return header + body
+
+    def _raster_image(self):
+        return (self._width, self._height, self._pixels)
+
+    def _draw(self, canvas, options):
+        x, y = self._anchor._x, self._anchor._y
+        with self._lock:
+            self._dirty = None
+        if not isinstance(canvas, tk.Canvas):
+            return canvas.create_image(x, y, {"image": self._raster_image(),
+                                              "anchor": "nw"})
+        if self._photo is None:
+            self._photo = tk.PhotoImage(master=_get_root(),
+                                        width=self._width,
+                                        height=self._height)
+        self._photo.tk.call(self._photo.name, "put",
+                            self._ppm(0, 0, self._width, self._height),
+                            "-format", "ppm")
+        return canvas.create_image(x, y, image=self._photo, anchor="nw")
+
+    def _move(self, dx, dy):
+        self._anchor._move(dx, dy)
+
+    def _bounds(self):
+        x, y = self._anchor._x, self._anchor._y
+        return (x, y, x + self._width, y + self._height)
+
+    def _svg(self, writer):
+        data = _png(self._width, self._height, self._pixels)
+        writer.element("image", x=self._anchor._x, y=self._anchor._y,
+                       width=self._width, height=self._height,
+                       href="data:image/png;base64," +
+                       binascii.b2a_base64(data, newline=False).decode())
+
+
+def _byte_view(data):
+    # A flat view of the bytes of data, which must be bytes-like
+    try:
+        return memoryview(data).cast("B")
+    except TypeError:
+        raise GraphixError("Pixel data must be a bytes-like object") \
+            from None
+
+
+def _pixel_colour(colour):
+    # Converts a colour name or (red, green, blue) tuple into three bytes
+    if isinstance(colour, str):
+        return _parse_colour(colour)
+    try:
+        rgb = bytes(colour)
+    except (TypeError, ValueError):
+        rgb = b""
+    if len(rgb) != 3:
+        raise GraphixError("Pixel colour must be a name or (r, g, b) tuple")
+    return rgb
+
+
+############################################################################
+# Instrumentation
+#
+# When a Stats object is enabled, every canvas operation graphix performs
+#   is counted and timed, for the window it was made in and overall. With
+#   none enabled the cost is one test of _recorders at each operation.
+
+# The operations that are counted, in the order they are reported
+_OPERATIONS = ("draw", "undraw", "move", "reconfig", "flush", "event_wait")
+
+# The Stats objects currently recording
+_recorders: tuple[Stats, ...] = ()
+
+# The Tk tag of the items drawn by Stats.show_overlay
+_OVERLAY_TAG = "graphix_stats"
+
+# Every window that has been opened and not yet garbage collected
+_windows: weakref.WeakSet[Window] = weakref.WeakSet()
+
+
+def _record(window, operation, start, calls=1):
+    # Adds calls to operation, which began at perf_counter() time start, to
+    #   every active Stats
+    elapsed = time.perf_counter() - start
+    for recorder in _recorders:
+        recorder._add(window, operation, calls, elapsed)
+
+
+class Stats:
+    """Counts and times the canvas operations graphix performs: drawing,
+    undrawing, moving and reconfiguring objects, flushing windows and
+    waiting for events. Nothing is recorded until enable() is called.
+    The module's own Stats object is graphix.stats; profile() gives a
+    separate one for a with block."""
+
+    __slots__ = ["_totals", "_by_window", "_elapsed", "_since", "_overlays"]
+
+    def __init__(self) -> None:
+        """Initialises a disabled Stats object with every count at zero."""
+        self._since: float | None = None
+        # For each window showing these stats, [Tk id, after id]
+        self._overlays: dict[Window, list] = {}
+        self.reset()
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the stats."""
+        state = "enabled" if self.is_enabled() else "disabled"
+        return f"<Stats {state}, {self._elapsed_seconds():.3f}s>"
+
+    def enable(self) -> None:
+        """Starts recording."""
+        global _recorders
+        if self not in _recorders:
+            _recorders = _recorders + (self,)
+            self._since = time.perf_counter()
+
+    def disable(self) -> None:
+        """Stops recording; the counts so far are kept."""
+        global _recorders
+        if self in _recorders:
+            _recorders = tuple(r for r in _recorders if r is not self)
+            self._elapsed += time.perf_counter() - cast(float, self._since)
+            self._since = None
+
+    def is_enabled(self) -> bool:
+        """Returns True if the stats are being recorded."""
+        return self in _recorders
+
+    def reset(self) -> None:
+        """Sets every count and time back to zero."""
+        self._totals = {operation: [0, 0.0] for operation in _OPERATIONS}
+        self._by_window: weakref.WeakKeyDictionary[Window, dict] = \
+            weakref.WeakKeyDictionary()
+        self._elapsed = 0.0
+        if self._since is not None:
+            self._since = time.perf_counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the stats as a dictionary. "operations" maps each
+        operation to its count and total seconds; "graphix_seconds" is the
+        time spent in drawing operations and flushes, "wait_seconds" the
+        time spent waiting for events and "other_seconds" the rest of the
+        time recorded, mostly spent in the program itself. "windows" lists
+        each open window with its counts of objects and canvas items."""
+        elapsed = self._elapsed_seconds()
+        wait = self._totals["event_wait"][1]
+        graphix = sum(seconds for _, seconds in self._totals.values()) - wait
+        windows = []
+        for window in list(_windows):
+            if window.is_closed():
+                continue
+            backend = window._backend
+            items = (len(backend.find_all())
+                     - len(backend.find_withtag(_OVERLAY_TAG)))
+            counters = self._by_window.get(window)
+            windows.append({
+                "title": window._title,
+                "objects": len(window._items),
+                "items": items,
+                "operations": self._operations(counters),
+            })
+        return {
+            "elapsed_seconds": elapsed,
+            "graphix_seconds": graphix,
+            "wait_seconds": wait,
+            "other_seconds": max(0.0, elapsed - graphix - wait),
+            "operations": self._operations(self._totals),
+            "windows": windows,
+        }
+
+    def report(self) -> str:
+        """Returns the overall counts and times as a printable table."""
+        lines = [f"{'operation':<12}{'count':>10}{'ms':>12}{'us/call':>10}"]
+        for operation, (calls, seconds) in self._totals.items():
+            per_call = seconds / calls * 1e6 if calls else 0.0
+            lines.append(f"{operation:<12}{calls:>10}{seconds * 1000:>12.2f}"
+                         f"{per_call:>10.1f}")
+        summary = self.as_dict()
+        lines.append(f"elapsed {summary['elapsed_seconds']:.3f}s: graphix "
+                     f"{summary['graphix_seconds']:.3f}s, waiting "
+                     f"{summary['wait_seconds']:.3f}s, other "
+                     f"{summary['other_seconds']:.3f}s")
+        return "\n".join(lines)
+
+    def show_overlay(self, window: Window, interval: int = 500) -> None:
+        """Shows the counts for window in its top left corner, refreshed
+        every interval milliseconds while the window's events are being
+        processed."""
+        if not isinstance(window, Window):
+            raise GraphixError("Overlay window must be a Window")
+        if not isinstance(interval, int) or interval < 1:
+            raise GraphixError("Overlay interval must be a positive integer")
+        self.hide_overlay(window)
+        self._overlays[window] = [None, None]
+        self._refresh_overlay(window, interval)
+
+    def hide_overlay(self, window: Window) -> None:
+        """Removes the overlay shown by show_overlay, if there is one."""
+        overlay = self._overlays.pop(window, None)
+        if overlay is not None and not window.is_closed():
+            backend = window._backend
+            backend.after_cancel(overlay[1])
+            if overlay[0] is not None:
+                backend.delete(overlay[0])
+            window._autoflush_update()
+
+    def _refresh_overlay(self, window, interval):
+        overlay = self._overlays.get(window)
+        if overlay is None:
+            return
+        if window.is_closed():
+            del self._overlays[window]
+            return
+        backend = window._backend
+        lines = [f"{len(window._items)} objects"]
+        counters = self._by_window.get(window, {})
+        for operation, (calls, seconds) in counters.items():
+            if calls:
+                lines.append(f"{operation} {calls} {seconds * 1000:.1f}ms")
+        text = "\n".join(lines)
+        # The overlay is drawn straight onto the canvas so it is neither
+        #   part of the scene nor counted itself
+        if overlay[0] is None or not backend.find_withtag(overlay[0]):
+            overlay[0] = backend.create_text(
+                4, 4, {"anchor": "nw", "justify": "left", "fill": "blue",
+                       "font": ("courier", 9, "normal"), "text": text,
+                       "tags": _OVERLAY_TAG})
+        else:
+            backend.itemconfig(overlay[0], {"text": text})
+        overlay[1] = backend.after(interval, self._refresh_overlay,
+                                   window, interval)
+
+    @staticmethod
+    def _operations(counters):
+        if counters is None:
+            return {operation: {"count": 0, "seconds": 0.0}
+                    for operation in _OPERATIONS}
+        return {operation: {"count": calls, "seconds": seconds}
+                for operation, (calls, seconds) in counters.items()}
+
+    def _elapsed_seconds(self):
+        if self._since is None:
+            return self._elapsed
+        return self._elapsed + time.perf_counter() - self._since
+
+    def _add(self, window, operation, calls, elapsed):
+        entry = self._totals[operation]
+        entry[0] += calls
+        entry[1] += elapsed
+        counters = self._by_window.get(window)
+        if counters is None:
+            counters = {op: [0, 0.0] for op in _OPERATIONS}
+            self._by_window[window] = counters
+        entry = counters[operation]
+        entry[0] += calls
+        entry[1] += elapsed
+
+
+# The library's own stats, for example graphix.stats.enable()
+stats = Stats()
+
+
+@contextmanager
+def profile() -> Iterator[Stats]:
+    """Records the canvas operations made inside a with block into a new
+    Stats object, for example
+        with graphix.profile() as p:
+            ...
+        print(p.report())"""
+    recorder = Stats()
+    recorder.enable()
+    try:
+        yield recorder
+    finally:
+        recorder.disable()
+
+
+############################################################################
+# Animation
+
+
+class Animator:
+    """Calls a function at a steady rate to animate the contents of a
+    window, using the window's event loop so that mouse clicks and key
+    presses are still handled while it runs.
+
+    on_frame(dt) is called once per fixed time step of dt = 1/fps seconds.
+    If the program falls behind, up to max_catch_up steps are run at once
+    to catch up and any beyond that are dropped. If on_render is given it
+    is called after the steps with how far (0 to 1) the clock is into the
+    next step, so drawing can be interpolated between steps."""
+
+    __slots__ = ["_window", "_dt", "_on_frame", "_on_render", "_max_steps",
+                 "_running", "_paused", "_after_id", "_last", "_accumulator",
+                 "_frames", "_dropped", "_ticks", "_run_time",
+                 "_frame_total", "_frame_max"]
+
+    def __init__(self, window: Window, fps: int | float, on_frame,
+                 on_render=None, max_catch_up: int = 5) -> None:
+        """Initialises the animator for window at fps steps per second."""
+        if not isinstance(window, Window):
+            raise GraphixError("Animator window must be a Window")
+        if not isinstance(fps, (int, float)) or fps <= 0:
+            raise GraphixError("Animator fps must be a positive number")
+        if not isinstance(max_catch_up, int) or max_catch_up < 1:
+            raise GraphixError("Animator max_catch_up must be at least 1")
+        self._window = window
+        self._dt = 1 / fps
+        self._on_frame = on_frame
+        self._on_render = on_render
+        self._max_steps = max_catch_up
+        self._running = False
+        self._paused = False
+        self._after_id = None
+        self._last = 0.0
+        self._accumulator = 0.0
+        self._frames = 0
+        self._dropped = 0
+        self._ticks = 0
+        self._run_time = 0.0
+        self._frame_total = 0.0
+        self._frame_max = 0.0
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the animator."""
+        return f"Animator({self._window}, {1 / self._dt:g})"
+
+    def start(self) -> None:
+        """Starts the animation without waiting for it to finish. It runs
+        whenever the window's events are being processed."""
+        if self._running:
+            return
+        self._running = True
+        self._paused = False
+        self._restart_clock()
+
+    def run(self) -> None:
+        """Starts the animation and waits until it is stopped or the
+        window is closed."""
+        self.start()
+        self._window._wait_for(
+            lambda: not self._running or self._window.is_closed(),
+            None, "Animator.run")
+
+    def stop(self) -> None:
+        """Stops the animation."""
+        self._running = False
+        self._cancel()
+        self._window._wake()
+
+    def pause(self) -> None:
+        """Pauses the animation; no steps are run until it is resumed."""
+        if self._running and not self._paused:
+            self._paused = True
+            self._cancel()
+
+    def resume(self) -> None:
+        """Resumes a paused animation from where it left off."""
+        if self._running and self._paused:
+            self._paused = False
+            self._restart_clock()
+
+    def is_running(self) -> bool:
+        """Returns True if the animation is running (even if paused)."""
+        return self._running
+
+    def is_paused(self) -> bool:
+        """Returns True if the animation is paused."""
+        return self._paused
+
+    def stats(self) -> dict[str, float]:
+        """Returns a dictionary of frame statistics: the number of steps
+        run and dropped, the achieved steps per second and the mean and
+        longest time spent in on_frame, in milliseconds."""
+        frames = self._frames
+        return {
+            "frames": frames,
+            "dropped": self._dropped,
+            "ticks": self._ticks,
+            "fps": frames / self._run_time if self._run_time else 0.0,
+            "mean_frame_ms": self._frame_total / frames * 1000 if frames
+                             else 0.0,
+            "max_frame_ms": self._frame_max * 1000,
+        }
+
+    def _restart_clock(self):
+        self._last = time.perf_counter()
+        self._accumulator = 0.0
+        self._schedule(0)
+
+    def _schedule(self, delay):
+        # Replaces any tick already waiting, as resume() called from
+        #   on_frame would otherwise start a second chain of ticks
+        self._cancel()
+        self._after_id = self._window._backend.after(
+            max(1, round(delay * 1000)), self._tick)
+
+    def _cancel(self):
+        if self._after_id is not None:
+            if not self._window.is_closed():
+                self._window._backend.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        window = self._window
+        if window.is_closed():
+            self._running = False
+            return
+        if self._paused or not self._running:
+            return
+        now = time.perf_counter()
+        self._run_time += now - self._last
+        self._accumulator += now - self._last
+        self._last = now
+        dt = self._dt
+        steps = 0
+        with window.batch():
+            while (self._accumulator >= dt and self._running
+                   and not self._paused):
+                if steps == self._max_steps:
+                    behind = int(self._accumulator // dt)
+                    self._dropped += behind
+                    self._accumulator -= behind * dt
+                    break
+                start = time.perf_counter()
+                self._on_frame(dt)
+                elapsed = time.perf_counter() - start
+                self._frame_total += elapsed
+                if elapsed > self._frame_max:
+                    self._frame_max = elapsed
+                self._frames += 1
+                self._accumulator -= dt
+                steps += 1
+            if (self._on_render is not None and self._running
+                    and not self._paused):
+                self._on_render(self._accumulator / dt)
+        self._ticks += 1
+        if self._running and not self._paused and not window.is_closed():
+            self._schedule(dt - self._accumulator)
+
+
+def run_loop(window: Window, fps: int | float, on_frame,
+             on_render=None) -> dict[str, float]:
+    """Calls on_frame(dt) fps times a second until the window is closed or
+    on_frame raises StopIteration, then returns the frame statistics. See
+    Animator for details."""
+    def frame(dt):
+        try:
+            on_frame(dt)
+        except StopIteration:
+            animator.stop()
+
+    animator = Animator(window, fps, frame, on_render)
+    animator.run()
+    return animator.stats()
+
+
+############################################################################
+# Asyncio
+#
+# asyncio is only imported once a program awaits a window, as most programs
+#   never do and it is slow to import.
+
+# Frames per second given by Window.frame, which is also how often the
+#   window's events are handled
+_ASYNC_FPS = 60
+
+
+class _AsyncDriver:
+    # Handles a window's events from an asyncio task, _ASYNC_FPS times a
+    #   second, and wakes the coroutines waiting on the window. Waiting
+    #   futures are kept in dicts used as ordered sets, so coroutines are
+    #   woken in the order they started waiting and draw in that order.
+
+    __slots__ = ["loop", "pump", "mouse", "keys", "frames", "sleeps",
+                 "_window"]
+
+    def __init__(self, window: Window, loop) -> None:
+        self._window = window
+        self.loop = loop
+        self.mouse: dict[Any, None] = {}
+        self.keys: dict[Any, None] = {}
+        self.frames: dict[Any, None] = {}
+        self.sleeps: dict[Any, None] = {}
+        self.pump = loop.create_task(self._run())
+
+    def wait(self, waiters):
+        # Returns a future for the next wake of waiters; it leaves waiters
+        #    once done, even if it was cancelled by something else
+        future = self.loop.create_future()
+        waiters[future] = None
+        future.add_done_callback(lambda done: waiters.pop(done, None))
+        return future
+
+    def wake(self, waiters, value) -> None:
+        futures = list(waiters)
+        waiters.clear()
+        for future in futures:
+            self.wake_one(future, value)
+
+    @staticmethod
+    def wake_one(future, value) -> None:
+        if not future.done():
+            future.set_result(value)
+
+    def cancel(self) -> None:
+        # Cancels every waiting coroutine; the pump stops by itself
+        for waiters in (self.mouse, self.keys, self.frames, self.sleeps):
+            futures = list(waiters)
+            waiters.clear()
+            if not self.loop.is_closed():
+                for future in futures:
+                    future.cancel()
+
+    async def _run(self):
+        import asyncio
+        window = self._window
+        loop = self.loop
+        interval = 1 / _ASYNC_FPS
+        last = loop.time()
+        while not window.is_closed():
+            await asyncio.sleep(max(0.0, last + interval - loop.time()))
+            if window.is_closed():
+                break
+            # Clicks and key presses wake their waiters in here
+            window._flush_now()
+            now = loop.time()
+            elapsed, last = now - last, now
+            if self.frames and not window.is_closed():
+                with window.batch():
+                    self.wake(self.frames, elapsed)
+                    # Lets the woken coroutines draw before the batch ends
+                    await asyncio.sleep(0)
+        self.cancel()
+
+
+def run_async(main) -> Any:
+    """Runs the coroutine main with asyncio and returns its result, or None
+    if it is cancelled, as coroutines waiting on a window are when the
+    window closes."""
+    import asyncio
+    try:
+        return asyncio.run(main)
+    except asyncio.CancelledError:
+        return None
+
+
+############################################################################
+# Parallel building
+
+
+def _build_chunk(fn, chunk):
+    # Runs in a worker process: builds one chunk's objects to be pickled
+    #    back to the main process
+    objects = list(fn(chunk))
+    if not all(isinstance(obj, GraphixObject) for obj in objects):
+        raise GraphixError("build_parallel function must return "
+                           "GraphixObjects")
+    return objects
+
+
+def build_parallel(fn, chunks, window: Window | None = None,
+                   workers: int | None = None) -> list[GraphixObject]:
+    """Calls fn(chunk) for each of chunks in a pool of worker processes,
+    workers of them (by default one per CPU), and returns a list of all
+    the undrawn objects the calls return. fn must be a function defined at
+    the top level of a module, and the program's main code should be
+    under "if __name__ == '__main__':" so the workers can import it.
+
+    The objects come back chunk by chunk, in the order of chunks. If
+    window is given, each chunk's objects are drawn in it in one batch as
+    soon as they arrive, while the workers go on with later chunks."""
+    if window is not None and not isinstance(window, Window):
+        raise GraphixError("Objects must be drawn in a Window")
+    if workers is not None and (not isinstance(workers, int) or workers < 1):
+        raise GraphixError("build_parallel workers must be a positive "
+                           "integer")
+    from concurrent.futures import ProcessPoolExecutor
+    objects: list[GraphixObject] = []
+    with ProcessPoolExecutor(workers) as pool:
+        for built in pool.map(_build_chunk, repeat(fn), chunks):
+            objects.extend(built)
+            if window is not None:
+                with window.batch():
+                    for obj in built:
+                        obj.draw(window)
+    return objects
+
+
+############################################################################
+# Shape arrays
+#
+# A shape array is a single GraphixObject standing for many shapes of the
+#   same kind. Coordinates and per-shape fill colours are held in NumPy
+#   arrays, and every canvas item is tagged with one Tk tag so that moving,
+#   restyling or undrawing the whole array is a single Tk command.
+
+
+def _numpy():
+    # NumPy is only needed by the shape arrays, so it is imported on first
+    #   use rather than with the module
+    try:
+        import numpy
+    except ImportError:
+        raise GraphixError("Shape arrays need NumPy to be installed") from None
+    return numpy
+
+
+def _int_array(values, columns, what):
+    # Converts values to an n x columns array of integers, raising a
+    #   GraphixError if that isn't possible
+    np = _numpy()
+    array = np.asarray(values)
+    if array.size == 0:
+        return np.zeros((0, columns), dtype=np.int64)
+    if not np.issubdtype(array.dtype, np.integer):
+        raise GraphixError(f"{what} must be integers")
+    if array.ndim != 2 or array.shape[1] != columns:
+        raise GraphixError(f"{what} must be an n x {columns} array")
+    return array.astype(np.int64)
+
+
+class _ShapeArray(GraphixObject):
+    # Internal base class for arrays of shapes drawn as one object. The Tk
+    # id of a drawn array is the tag shared by all of its canvas items.
+
+    __slots__ = ["_coords", "_fills", "_item_ids"]
+
+    # Name of the canvas method used to create each item
+    _create = ""
+
+    def __init__(self, coords, options) -> None:
+        GraphixObject.__init__(self, options)
+        self._coords = coords
+        self._fills = _numpy().full(len(coords), self._config["fill"],
+                                    dtype=object)
+        self._item_ids = None
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} shapes)"
+
+    @property
+    def fill_colour(self) -> str:
+        """The interior colour of every shape in the array."""
+        return cast(str, self._config["fill"])
+
+    @fill_colour.setter
+    def fill_colour(self, colour: str) -> None:
+        if not isinstance(colour, str):
+            raise GraphixError("Fill colour must be a string")
+        self._reconfig("fill", colour)
+        self._fills[:] = colour
+
+    @property
+    def fill_colours(self) -> Any:
+        """A copy of the array of per-shape interior colours. May be set to
+        a single colour or to a sequence with one colour per shape."""
+        return self._fills.copy()
+
+    @fill_colours.setter
+    @_threadsafe
+    def fill_colours(self, colours) -> None:
+        np = _numpy()
+        if isinstance(colours, str):
+            self.fill_colour = colours
+            return
+        new = np.empty(len(self), dtype=object)
+        try:
+            new[:] = colours
+        except ValueError:
+            raise GraphixError("Fill colours must give one colour per shape")
+        if not all(isinstance(c, str) for c in new):
+            raise GraphixError("Fill colours must be strings")
+        changed = np.nonzero(new != self._fills)[0]
+        self._fills = new
+        canvas = self._canvas
+        if len(changed) and canvas and not canvas.is_closed():
+            backend = canvas._backend
+            start = time.perf_counter() if _recorders else 0.0
+            for item_id, colour in zip(self._item_ids[changed].tolist(),
+                                       new[changed].tolist()):
+                backend.itemconfig(item_id, fill=colour)
+            if start:
+                _record(canvas, "reconfig", start, len(changed))
+            canvas._autoflush_update()
+
+    def get_coords(self) -> Any:
+        """Returns a copy of the array of shape coordinates."""
+        return self._coords.copy()
+
+    def clone(self) -> _ShapeArray:
+        """Returns a clone of the shape array."""
+        return cast(_ShapeArray, self._copy(type(self)))
+
+    def _copy_state(self, other):
+        other._coords = self._coords.copy()
+        other._fills = self._fills.copy()
+        other._item_ids = None
+
+    # The fill colour setters change the per-shape colours as well
+    _check = GraphixObject._check_on_copy
+
+    def _undrawn_state(self):
+        return dict(GraphixObject._undrawn_state(self), _item_ids=None)
+
+    def _draw(self, canvas, options):
+        tag = _new_tag()
+        options = dict(options, tags=tag)
+        uniform = options["fill"]
+        create = getattr(canvas, self._create)
+        ids = []
+        for row, fill in zip(self._coords.tolist(), self._fills.tolist()):
+            if fill == uniform:
+                ids.append(create(*row, options))
+            else:
+                ids.append(create(*row, dict(options, fill=fill)))
+        self._item_ids = _numpy().array(ids, dtype=_numpy().int64)
+        return tag
+
+    def _move(self, dx, dy):
+        self._coords += (dx, dy) * (self._coords.shape[1] // 2)
+
+    def _bounds(self):
+        if not len(self):
+            return None
+        coords = self._coords
+        xs, ys = coords[:, 0::2], coords[:, 1::2]
+        pad = self._pad()
+        return (int(xs.min()) - pad, int(ys.min()) - pad,
+                int(xs.max()) + pad, int(ys.max()) + pad)
+
+    def _svg(self, writer):
+        write = {"create_rectangle": writer.rectangle,
+                 "create_oval": writer.oval,
+                 "create_line": writer.line}[self._create]
+        config = self._config
+        uniform = config["fill"]
+        for row, fill in zip(self._coords.tolist(), self._fills.tolist()):
+            write(*row, config if fill == uniform else dict(config, fill=fill))
+
+
+class RectangleArray(_ShapeArray):
+    """A class representing many rectangles drawn as one object, given as
+    an n x 4 array of (x1, y1, x2, y2) opposite corners."""
+
+    __slots__ = []
+
+    _create = "create_rectangle"
+
+    def __init__(self, coords) -> None:
+        """Initialises the rectangles from an n x 4 array of corners."""
+        _ShapeArray.__init__(self, _int_array(coords, 4,
+                                              "Rectangle coordinates"),
+                             ["outline", "width", "fill"])
+
+    def _contains(self, x, y):
+        coords = self._coords
+        pad = self._pad()
+        x1 = coords[:, [0, 2]].min(axis=1) - pad
+        x2 = coords[:, [0, 2]].max(axis=1) + pad
+        y1 = coords[:, [1, 3]].min(axis=1) - pad
+        y2 = coords[:, [1, 3]].max(axis=1) + pad
+        return bool(((x1 <= x) & (x <= x2) & (y1 <= y) & (y <= y2)).any())
+
+
+class CircleArray(_ShapeArray):
+    """A class representing many circles drawn as one object, given as an
+    n x 2 array of centres and one radius or an array of n radii."""
+
+    __slots__ = []
+
+    _create = "create_oval"
+
+    def __init__(self, centres, radii) -> None:
+        """Initialises the circles from their centres and radii."""
+        np = _numpy()
+        centres = _int_array(centres, 2, "Circle centres")
+        radii = np.asarray(radii)
+        if not np.issubdtype(radii.dtype, np.integer):
+            raise GraphixError("Circle radii must be integers")
+        try:
+            radii = np.broadcast_to(radii, (len(centres),)).astype(np.int64)
+        except ValueError:
+            raise GraphixError("Circle radii must give one radius per circle")
+        radii = radii[:, None]
+        coords = np.hstack([centres - radii, centres + radii])
+        _ShapeArray.__init__(self, coords, ["outline", "width", "fill"])
+
+    def get_centres(self) -> Any:
+        """Returns an n x 2 array of the circle centres."""
+        return (self._coords[:, 0:2] + self._coords[:, 2:4]) // 2
+
+    def get_radii(self) -> Any:
+        """Returns an array of the circle radii."""
+        return (self._coords[:, 2] - self._coords[:, 0]) // 2
+
+    def _contains(self, x, y):
+        centres = self.get_centres()
+        reach = self.get_radii() + int(self._config["width"]) / 2
+        dx = centres[:, 0] - x
+        dy = centres[:, 1] - y
+        return bool((dx * dx + dy * dy <= reach * reach).any())
+
+
+class LineArray(_ShapeArray):
+    """A class representing many straight lines drawn as one object, given
+    as an n x 4 array of (x1, y1, x2, y2) end points. As with Line, the fill
+    colours are the colours of the lines."""
+
+    __slots__ = []
+
+    _create = "create_line"
+
+    def __init__(self, coords) -> None:
+        """Initialises the lines from an n x 4 array of end points."""
+        _ShapeArray.__init__(self, _int_array(coords, 4, "Line coordinates"),
+                             ["arrow", "fill", "width"])
+        self.fill_colour = cast(str, DEFAULT_CONFIG['outline'])
+
+    @property
+    def outline_colour(self) -> str:
+        """The colour of every line in the array."""
+        return self.fill_colour
+
+    @outline_colour.setter
+    def outline_colour(self, colour: str) -> None:
+        if not isinstance(colour, str):
+            raise GraphixError("Outline colour must be a string")
+        self.fill_colour = colour
+
+    def _contains(self, x, y):
+        np = _numpy()
+        coords = self._coords.astype(float)
+        x1, y1, x2, y2 = coords.T
+        dx, dy = x2 - x1, y2 - y1
+        length2 = dx * dx + dy * dy
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(length2 > 0,
+                         ((x - x1) * dx + (y - y1) * dy) / length2, 0.0)
+        t = np.clip(t, 0.0, 1.0)
+        px, py = x1 + t * dx - x, y1 + t * dy - y
+        reach = int(self._config["width"]) / 2 + 1
+        return bool((px * px + py * py <= reach * reach).any())
+
+
+############################################################################
+# Scene files
+#
+# A scene file holds the objects drawn in a window in a compact binary
+#   form. All integers are little-endian. After the magic number and
+#   version come four tables: the distinct strings, the distinct fonts
+#   (typeface, size, style), the distinct option dictionaries and one
+#   array holding the vertices of every polygon. Then comes the window
+#   itself and one fixed-size record per object, giving its kind, its
+#   options and its geometry, with the raw data of pixel images and shape
+#   arrays following their records.
+
+_SCENE_MAGIC = b"GRXS"
+_SCENE_VERSION = 1
+_BAD_SCENE = "Scene file is truncated or damaged"
+
+# Option values are stored as a tag and an integer: a string number, an
+#   integer or a font number
+_VALUE_STRING, _VALUE_INT, _VALUE_FONT = range(3)
+
+
+def _scene_kinds():
+    # The classes that can be saved, with their kind numbers and the
+    #    layout of their records after the kind and option numbers
+    return {Point: (1, "ii"), Rectangle: (2, "iiii"), Oval: (3, "iiii"),
+            Circle: (4, "iiiii"), Line: (5, "iiii"), Polygon: (6, "II"),
+            Text: (7, "ii"), Entry: (8, "iiiIIII"), PixelImage: (9, "iiII"),
+            RectangleArray: (10, "I"), CircleArray: (11, "I"),
+            LineArray: (12, "I"), Polyline: (13, "II"),
+            Series: (14, "IIId")}
+
+
+class _SceneWriter:
+    # Collects the tables and records of a scene file while the objects
+    #   are visited, then writes them out
+
+    __slots__ = ["_strings", "_fonts", "_configs", "_vertices", "_records",
+                 "_count", "_formats"]
+
+    def __init__(self):
+        self._strings: dict[str, int] = {}
+        self._fonts: dict[tuple, int] = {}
+        self._configs: dict[tuple, int] = {}
+        self._vertices = array("i")
+        self._records = bytearray()
+        self._count = 0
+        self._formats = {cls: (kind, struct.Struct("<BI" + layout))
+                         for cls, (kind, layout) in _scene_kinds().items()}
+
+    def string(self, text):
+        number = self._strings.get(text)
+        if number is None:
+            number = self._strings[text] = len(self._strings)
+        return number
+
+    def font(self, spec):
+        number = self._fonts.get(spec)
+        if number is None:
+            number = self._fonts[spec] = len(self._fonts)
+        return number
+
+    def config(self, config):
+        key = tuple(config.items())
+        number = self._configs.get(key)
+        if number is None:
+            number = self._configs[key] = len(self._configs)
+        return number
+
+    def add(self, item):
+        for cls in type(item).__mro__:
+            if cls in self._formats:
+                break
+        else:
+            raise GraphixError(f"Can't save a {type(item).__name__}")
+        kind, record = self._formats[cls]
+        config = self.config(item._config)
+        records = self._records
+        if cls is Point:
+            records += record.pack(kind, config, item._x, item._y)
+        elif cls is Circle:
+            records += record.pack(kind, config, item._x1, item._y1,
+                                   item._x2, item._y2, item._radius)
+        elif issubclass(cls, _BBox):
+            records += record.pack(kind, config, item._x1, item._y1,
+                                   item._x2, item._y2)
+        elif issubclass(cls, _Vertices):
+            coords = item._vertices()
+            # A series also keeps its max_points and fps
+            extra = ((item._limit // 2, 1 / item._interval)
+                     if cls is Series else ())
+            records += record.pack(kind, config, len(self._vertices),
+                                   len(coords), *extra)
+            self._vertices.extend(coords)
+        elif cls is Text:
+            records += record.pack(kind, config, item._anchor._x,
+                                   item._anchor._y)
+        elif cls is Entry:
+            records += record.pack(kind, config, item._anchor._x,
+                                   item._anchor._y, item._width,
+                                   self.string(item.text),
+                                   self.string(item._fill_colour),
+                                   self.string(item._text_colour),
+                                   self.font(tuple(item._font)))
+        elif cls is PixelImage:
+            records += record.pack(kind, config, item._anchor._x,
+                                   item._anchor._y, item._width,
+                                   item._height)
+            records += item._pixels
+        else:
+            records += record.pack(kind, config, len(item))
+            records += item._coords.astype("<i4").tobytes()
+            fills = array("I", map(self.string, item._fills.tolist()))
+            records += _little_endian(fills)
+        self._count += 1
+
+    def write(self, scene_file, window):
+        title = self.string(window._title)
+        background = self.string(window.background_colour)
+        configs = []
+        for config in self._configs:
+            entries = []
+            for option, value in config:
+                if isinstance(value, str):
+                    tag, number = _VALUE_STRING, self.string(value)
+                elif isinstance(value, tuple):
+                    tag, number = _VALUE_FONT, self.font(value)
+                else:
+                    tag, number = _VALUE_INT, int(value)
+                entries.append(struct.pack("<IBi", self.string(option),
+                                           tag, number))
+            configs.append(struct.pack("<B", len(entries)) +
+                           b"".join(entries))
+        fonts = [struct.pack("<IiI", self.string(face), size,
+                             self.string(style))
+                 for face, size, style in self._fonts]
+
+        scene_file.write(_SCENE_MAGIC + struct.pack("<H", _SCENE_VERSION))
+        scene_file.write(struct.pack("<I", len(self._strings)))
+        for text in self._strings:
+            data = text.encode("utf-8")
+            scene_file.write(struct.pack("<I", len(data)) + data)
+        scene_file.write(struct.pack("<I", len(fonts)) + b"".join(fonts))
+        scene_file.write(struct.pack("<I", len(configs)) + b"".join(configs))
+        scene_file.write(struct.pack("<I", len(self._vertices)))
+        scene_file.write(_little_endian(self._vertices))
+        scene_file.write(struct.pack("<IIIII", title, background,
+                                     window.width, window.height,
+                                     self._count))
+        scene_file.write(self._records)
+
+
+def _little_endian(values):
+    # The bytes of an array in little-endian order
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_scene(data):
+    # Returns the title, background, width, height and list of undrawn
+    #    objects stored in the bytes of a scene file
+    if data[:4] != _SCENE_MAGIC:
+        raise GraphixError("Not a graphix scene file")
+    version, = struct.unpack_from("<H", data, 4)
+    if version != _SCENE_VERSION:
+        raise GraphixError(f"Unsupported scene file version {version}")
+    offset = 6
+
+    def unpack(fmt):
+        nonlocal offset
+        values = struct.unpack_from(fmt, data, offset)
+        offset += struct.calcsize(fmt)
+        return values
+
+    strings = []
+    for _ in range(unpack("<I")[0]):
+        length, = unpack("<I")
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    fonts = [(strings[face], size, strings[style])
+             for face, size, style in
+             (unpack("<IiI") for _ in range(unpack("<I")[0]))]
+    configs = []
+    for _ in range(unpack("<I")[0]):
+        config = {}
+        for _ in range(unpack("<B")[0]):
+            option, tag, number = unpack("<IBi")
+            if tag == _VALUE_STRING:
+                config[strings[option]] = strings[number]
+            elif tag == _VALUE_FONT:
+                config[strings[option]] = fonts[number]
+            else:
+                config[strings[option]] = number
+        configs.append(config)
+    vertex_count, = unpack("<I")
+    vertices = array("i")
+    vertices.frombytes(data[offset:offset + vertex_count * 4])
+    if sys.byteorder == "big":
+        vertices.byteswap()
+    offset += vertex_count * 4
+    title, background, width, height, count = unpack("<IIIII")
+
+    formats = {kind: (cls, struct.Struct("<BI" + layout))
+               for cls, (kind, layout) in _scene_kinds().items()}
+    objects = []
+    for _ in range(count):
+        cls, record = formats[data[offset]]
+        fields = record.unpack_from(data, offset)
+        offset += record.size
+        obj = cls.__new__(cls)
+        obj._canvas = None
+        obj._id = None
+        obj._config = configs[fields[1]].copy()
+        obj._pending = False
+        if cls is Point:
+            obj._x, obj._y = fields[2:]
+        elif issubclass(cls, _BBox):
+            obj._x1, obj._y1, obj._x2, obj._y2 = fields[2:6]
+            if cls is Circle:
+                obj._radius = fields[6]
+        elif issubclass(cls, _Vertices):
+            start, length = fields[2:4]
+            obj._coords = vertices[start:start + length]
+            obj._dx = obj._dy = 0
+            obj._extent = None
+            if cls is Series:
+                obj._limit = 2 * fields[4]
+                obj._start = 0
+                obj._interval = 1 / fields[5]
+                obj._shown = 0.0
+                obj._stale = False
+                obj._redraw_pending = False
+        elif cls is Text:
+            obj._anchor = Point(*fields[2:])
+        elif cls is Entry:
+            x, y, obj._width, text, fill, colour, font = fields[2:]
+            obj._anchor = Point(x, y)
+            obj._text = strings[text]
+            obj._text_var = None
+            obj._fill_colour = strings[fill]
+            obj._text_colour = strings[colour]
+            obj._font = fonts[font]
+            obj._entry = None
+        elif cls is PixelImage:
+            x, y, obj._width, obj._height = fields[2:]
+            obj._anchor = Point(x, y)
+            size = obj._width * obj._height * 3
+            obj._pixels = bytearray(data[offset:offset + size])
+            offset += size
+            obj._photo = None
+            obj._dirty = None
+            obj._push_pending = False
+            obj._lock = threading.Lock()
+        else:
+            np = _numpy()
+            length = fields[2]
+            obj._coords = np.frombuffer(data, "<i4", length * 4, offset) \
+                .reshape(length, 4).astype(np.int64)
+            offset += length * 16
+            fills = np.frombuffer(data, "<u4", length, offset)
+            offset += length * 4
+            obj._fills = np.array([strings[i] for i in fills.tolist()],
+                                  dtype=object)
+            obj._item_ids = None
+        objects.append(obj)
+    if offset != len(data):
+        raise GraphixError(_BAD_SCENE)
+    return strings[title], strings[background], width, height, objects
+
+
+############################################################################
+# SVG export
+
+
+# SVG font families standing in for the Tk typefaces
+_SVG_FONTS = {
+    "helvetica": "Helvetica, Arial, sans-serif",
+    "arial": "Arial, Helvetica, sans-serif",
+    "courier": "Courier, monospace",
+    "times roman": "Times, serif",
+}
+
+
+class _SvgWriter:
+    # Writes the objects of a scene to a text file as SVG elements, one
+    #   element at a time, so nothing but the colours and arrowhead markers
+    #   used so far is kept in memory.
+
+    __slots__ = ["_out", "_backend", "_colours", "_markers"]
+
+    def __init__(self, out, backend=None):
+        self._out = out
+        self._backend = backend
+        self._colours = {"": "none"}
+        self._markers = set()
+
+    def start(self, width, height, background):
+        self._out.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" viewBox="0 0 {width} {height}">\n')
+        self.element("rect", width=width, height=height,
+                     fill=self.colour(background))
+
+    def end(self):
+        self._out.write("</svg>\n")
+
+    def colour(self, colour):
+        # The SVG form of a Tk colour; Tk names with spaces or numbers,
+        #   like "light blue" or "grey50", aren't known to SVG. A Tk window
+        #   is asked for the colour, since it knows every name it accepted
+        try:
+            return self._colours[colour]
+        except KeyError:
+            pass
+        if isinstance(self._backend, tk.Misc):
+            red, green, blue = self._backend.winfo_rgb(colour)
+            rgb = bytes((red >> 8, green >> 8, blue >> 8))
+        else:
+            rgb = _parse_colour(colour)
+        self._colours[colour] = "#" + rgb.hex()
+        return self._colours[colour]
+
+    def element(self, tag, content=None, **attributes):
+        # Writes one element; underscores in attribute names become
+        #   hyphens and content must already be escaped
+        attrs = "".join(f' {name.replace("_", "-")}="'
+                        f'{html.escape(str(value))}"'
+                        for name, value in attributes.items())
+        if content is None:
+            self._out.write(f"<{tag}{attrs}/>\n")
+        else:
+            self._out.write(f"<{tag}{attrs}>{content}</{tag}>\n")
+
+    def shape(self, tag, options, **attributes):
+        # Writes a closed shape with the fill and outline from options
+        attributes["fill"] = self.colour(options.get("fill", ""))
+        outline = options.get("outline", "")
+        attributes["stroke"] = self.colour(outline)
+        if outline:
+            attributes["stroke_width"] = options.get("width", 1)
+        self.element(tag, **attributes)
+
+    def rectangle(self, x1, y1, x2, y2, options):
+        self.shape("rect", options, x=min(x1, x2), y=min(y1, y2),
+                   width=abs(x2 - x1), height=abs(y2 - y1))
+
+    def oval(self, x1, y1, x2, y2, options):
+        self.shape("ellipse", options, cx=(x1 + x2) / 2, cy=(y1 + y2) / 2,
+                   rx=abs(x2 - x1) / 2, ry=abs(y2 - y1) / 2)
+
+    def line(self, x1, y1, x2, y2, options):
+        self.element("line", x1=x1, y1=y1, x2=x2, y2=y2,
+                     **self.stroke(options))
+
+    def polyline(self, coords, options):
+        self.element("polyline", points=self.points(coords), fill="none",
+                     **self.stroke(options))
+
+    def stroke(self, options):
+        # The attributes drawing a line, which Tk colours with its fill,
+        #   with any arrowheads
+        colour = self.colour(options.get("fill", "black"))
+        attributes = {"stroke": colour,
+                      "stroke_width": options.get("width", 1)}
+        arrow = options.get("arrow", "none")
+        if arrow in ("first", "both"):
+            attributes["marker_start"] = self.marker(colour)
+        if arrow in ("last", "both"):
+            attributes["marker_end"] = self.marker(colour)
+        return attributes
+
+    @staticmethod
+    def points(coords):
+        # A flat vertex list in the form of an SVG points attribute
+        return " ".join(f"{coords[i]},{coords[i+1]}"
+                        for i in range(0, len(coords), 2))
+
+    def marker(self, colour):
+        # Returns a reference to an arrowhead marker in colour, writing
+        #   its definition the first time it is used
+        name = "arrow-" + colour.lstrip("#")
+        if name not in self._markers:
+            self._markers.add(name)
+            self._out.write(
+                f'<defs><marker id="{name}" viewBox="0 0 10 8" refX="10" '
+                'refY="4" markerWidth="5" markerHeight="4" '
+                'orient="auto-start-reverse"><path d="M0,0 L10,4 L0,8 z" '
+                f'fill="{colour}"/></marker></defs>\n')
+        return f"url(#{name})"
+
+    def text(self, x, y, options):
+        text = options.get("text", "")
+        if not text:
+            return
+        face, size, style = options.get("font", DEFAULT_CONFIG["font"])
+        attributes = {"x": x, "y": y,
+                      "fill": self.colour(options.get("fill", "black")),
+                      "font_family": _SVG_FONTS.get(face, face),
+                      "font_size": f"{size}pt",
+                      "text_anchor": "middle",
+                      "dominant_baseline": "central"}
+        if "bold" in style:
+            attributes["font_weight"] = "bold"
+        if "italic" in style:
+            attributes["font_style"] = "italic"
+        lines = text.split("\n")
+        if len(lines) == 1:
+            self.element("text", html.escape(text), **attributes)
+            return
+        # Lines are 1.2em apart, centred on the anchor like Tk's
+        first = f"{-(len(lines) - 1) * 0.6:g}em"
+        content = "".join(
+            f'<tspan x="{x}" dy="{first if i == 0 else "1.2em"}">'
+            f"{html.escape(line)}</tspan>" for i, line in enumerate(lines))
+        self.element("text", content, **attributes)
+
+
+############################################################################
+# Headless rendering backend
+#
+# _RasterCanvas implements the small part of the tk.Canvas interface that
+#   the graphical classes use, but keeps its items in a display list and
+#   paints them into an RGB buffer on demand. Everything is done with
+#   integer or IEEE float arithmetic in a fixed order, so a scene always
+#   renders to exactly the same bytes on every platform.
+
+# Colour names understood by the headless backend, with the values Tk 8.6
+#   gives them. Names are matched ignoring case and spaces, as in Tk.
+_COLOUR_NAMES = {
+    "black": (0, 0, 0), "white": (255, 255, 255),
+    "red": (255, 0, 0), "green": (0, 128, 0), "lime": (0, 255, 0),
+    "blue": (0, 0, 255), "yellow": (255, 255, 0), "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255), "grey": (128, 128, 128),
+    "gray": (128, 128, 128), "brown": (165, 42, 42),
+    "orange": (255, 165, 0), "pink": (255, 192, 203),
+    "purple": (128, 0, 128), "violet": (238, 130, 238),
+    "maroon": (128, 0, 0), "navy": (0, 0, 128), "olive": (128, 128, 0),
+    "teal": (0, 128, 128), "silver": (192, 192, 192),
+    "gold": (255, 215, 0), "beige": (245, 245, 220),
+    "tan": (210, 180, 140), "khaki": (240, 230, 140),
+    "salmon": (250, 128, 114), "coral": (255, 127, 80),
+    "turquoise": (64, 224, 208), "indigo": (75, 0, 130),
+    "skyblue": (135, 206, 235), "lightblue": (173, 216, 230),
+    "lightgreen": (144, 238, 144), "lightgrey": (211, 211, 211),
+    "lightgray": (211, 211, 211), "lightyellow": (255, 255, 224),
+    "lightpink": (255, 182, 193), "darkgrey": (169, 169, 169),
+    "darkgray": (169, 169, 169), "darkgreen": (0, 100, 0),
+    "darkblue": (0, 0, 139), "darkred": (139, 0, 0),
+    "darkorange": (255, 140, 0), "darkviolet": (148, 0, 211),
+    "forestgreen": (34, 139, 34), "skyblue1": (135, 206, 255),
+    "royalblue": (65, 105, 225), "steelblue": (70, 130, 180),
+    "chocolate": (210, 105, 30), "saddlebrown": (139, 69, 19),
+    "sienna": (160, 82, 45), "crimson": (220, 20, 60),
+    "firebrick": (178, 34, 34), "hotpink": (255, 105, 180),
+    "orchid": (218, 112, 214), "plum": (221, 160, 221),
+    "lavender": (230, 230, 250), "ivory": (255, 255, 240),
+    "wheat": (245, 222, 179), "aquamarine": (127, 255, 212),
+}
+
+# The rest of the colour names Tk knows, from the X11 colour database:
+#   each entry is a name in lower case without spaces and its red, green
+#   and blue in hex. The names above take precedence, as Tk's own web
+#   colours do over X11's. Read into a dict the first time it's needed.
+_X11_COLOURS = (
+    "snow:fffafa ghostwhite:f8f8ff whitesmoke:f5f5f5 gainsboro:dcdcdc "
+    "floralwhite:fffaf0 oldlace:fdf5e6 linen:faf0e6 antiquewhite:faebd7 "
+    "papayawhip:ffefd5 blanchedalmond:ffebcd bisque:ffe4c4 "
+    "peachpuff:ffdab9 navajowhite:ffdead moccasin:ffe4b5 cornsilk:fff8dc "
+    "lemonchiffon:fffacd seashell:fff5ee honeydew:f0fff0 mintcream:f5fffa "
+    "azure:f0ffff aliceblue:f0f8ff lavenderblush:fff0f5 mistyrose:ffe4e1 "
+    "darkslategray:2f4f4f darkslategrey:2f4f4f dimgray:696969 "
+    "dimgrey:696969 slategray:708090 slategrey:708090 "
+    "lightslategray:778899 lightslategrey:778899 midnightblue:191970 "
+    "navyblue:000080 cornflowerblue:6495ed darkslateblue:483d8b "
+    "slateblue:6a5acd mediumslateblue:7b68ee lightslateblue:8470ff "
+    "mediumblue:0000cd dodgerblue:1e90ff deepskyblue:00bfff "
+    "lightskyblue:87cefa lightsteelblue:b0c4de powderblue:b0e0e6 "
+    "paleturquoise:afeeee darkturquoise:00ced1 mediumturquoise:48d1cc "
+    "lightcyan:e0ffff cadetblue:5f9ea0 mediumaquamarine:66cdaa "
+    "darkolivegreen:556b2f darkseagreen:8fbc8f seagreen:2e8b57 "
+    "mediumseagreen:3cb371 lightseagreen:20b2aa palegreen:98fb98 "
+    "springgreen:00ff7f lawngreen:7cfc00 chartreuse:7fff00 "
+    "mediumspringgreen:00fa9a greenyellow:adff2f limegreen:32cd32 "
+    "yellowgreen:9acd32 olivedrab:6b8e23 darkkhaki:bdb76b "
+    "palegoldenrod:eee8aa lightgoldenrodyellow:fafad2 "
+    "lightgoldenrod:eedd82 goldenrod:daa520 darkgoldenrod:b8860b "
+    "rosybrown:bc8f8f indianred:cd5c5c peru:cd853f burlywood:deb887 "
+    "sandybrown:f4a460 darksalmon:e9967a lightsalmon:ffa07a "
+    "lightcoral:f08080 tomato:ff6347 orangered:ff4500 deeppink:ff1493 "
+    "palevioletred:db7093 mediumvioletred:c71585 violetred:d02090 "
+    "mediumorchid:ba55d3 darkorchid:9932cc blueviolet:8a2be2 "
+    "mediumpurple:9370db thistle:d8bfd8 snow1:fffafa snow2:eee9e9 "
+    "snow3:cdc9c9 snow4:8b8989 seashell1:fff5ee seashell2:eee5de "
+    "seashell3:cdc5bf seashell4:8b8682 antiquewhite1:ffefdb "
+    "antiquewhite2:eedfcc antiquewhite3:cdc0b0 antiquewhite4:8b8378 "
+    "bisque1:ffe4c4 bisque2:eed5b7 bisque3:cdb79e bisque4:8b7d6b "
+    "peachpuff1:ffdab9 peachpuff2:eecbad peachpuff3:cdaf95 "
+    "peachpuff4:8b7765 navajowhite1:ffdead navajowhite2:eecfa1 "
+    "navajowhite3:cdb38b navajowhite4:8b795e lemonchiffon1:fffacd "
+    "lemonchiffon2:eee9bf lemonchiffon3:cdc9a5 lemonchiffon4:8b8970 "
+    "cornsilk1:fff8dc cornsilk2:eee8cd cornsilk3:cdc8b1 cornsilk4:8b8878 "
+    "ivory1:fffff0 ivory2:eeeee0 ivory3:cdcdc1 ivory4:8b8b83 "
+    "honeydew1:f0fff0 honeydew2:e0eee0 honeydew3:c1cdc1 honeydew4:838b83 "
+    "lavenderblush1:fff0f5 lavenderblush2:eee0e5 lavenderblush3:cdc1c5 "
+    "lavenderblush4:8b8386 mistyrose1:ffe4e1 mistyrose2:eed5d2 "
+    "mistyrose3:cdb7b5 mistyrose4:8b7d7b azure1:f0ffff azure2:e0eeee "
+    "azure3:c1cdcd azure4:838b8b slateblue1:836fff slateblue2:7a67ee "
+    "slateblue3:6959cd slateblue4:473c8b royalblue1:4876ff "
+    "royalblue2:436eee royalblue3:3a5fcd royalblue4:27408b blue1:0000ff "
+    "blue2:0000ee blue3:0000cd blue4:00008b dodgerblue1:1e90ff "
+    "dodgerblue2:1c86ee dodgerblue3:1874cd dodgerblue4:104e8b "
+    "steelblue1:63b8ff steelblue2:5cacee steelblue3:4f94cd "
+    "steelblue4:36648b deepskyblue1:00bfff deepskyblue2:00b2ee "
+    "deepskyblue3:009acd deepskyblue4:00688b skyblue2:7ec0ee "
+    "skyblue3:6ca6cd skyblue4:4a708b lightskyblue1:b0e2ff "
+    "lightskyblue2:a4d3ee lightskyblue3:8db6cd lightskyblue4:607b8b "
+    "slategray1:c6e2ff slategray2:b9d3ee slategray3:9fb6cd "
+    "slategray4:6c7b8b lightsteelblue1:cae1ff lightsteelblue2:bcd2ee "
+    "lightsteelblue3:a2b5cd lightsteelblue4:6e7b8b lightblue1:bfefff "
+    "lightblue2:b2dfee lightblue3:9ac0cd lightblue4:68838b "
+    "lightcyan1:e0ffff lightcyan2:d1eeee lightcyan3:b4cdcd "
+    "lightcyan4:7a8b8b paleturquoise1:bbffff paleturquoise2:aeeeee "
+    "paleturquoise3:96cdcd paleturquoise4:668b8b cadetblue1:98f5ff "
+    "cadetblue2:8ee5ee cadetblue3:7ac5cd cadetblue4:53868b "
+    "turquoise1:00f5ff turquoise2:00e5ee turquoise3:00c5cd "
+    "turquoise4:00868b cyan1:00ffff cyan2:00eeee cyan3:00cdcd "
+    "cyan4:008b8b darkslategray1:97ffff darkslategray2:8deeee "
+    "darkslategray3:79cdcd darkslategray4:528b8b aquamarine1:7fffd4 "
+    "aquamarine2:76eec6 aquamarine3:66cdaa aquamarine4:458b74 "
+    "darkseagreen1:c1ffc1 darkseagreen2:b4eeb4 darkseagreen3:9bcd9b "
+    "darkseagreen4:698b69 seagreen1:54ff9f seagreen2:4eee94 "
+    "seagreen3:43cd80 seagreen4:2e8b57 palegreen1:9aff9a "
+    "palegreen2:90ee90 palegreen3:7ccd7c palegreen4:548b54 "
+    "springgreen1:00ff7f springgreen2:00ee76 springgreen3:00cd66 "
+    "springgreen4:008b45 green1:00ff00 green2:00ee00 green3:00cd00 "
+    "green4:008b00 chartreuse1:7fff00 chartreuse2:76ee00 "
+    "chartreuse3:66cd00 chartreuse4:458b00 olivedrab1:c0ff3e "
+    "olivedrab2:b3ee3a olivedrab3:9acd32 olivedrab4:698b22 "
+    "darkolivegreen1:caff70 darkolivegreen2:bcee68 darkolivegreen3:a2cd5a "
+    "darkolivegreen4:6e8b3d khaki1:fff68f khaki2:eee685 khaki3:cdc673 "
+    "khaki4:8b864e lightgoldenrod1:ffec8b lightgoldenrod2:eedc82 "
+    "lightgoldenrod3:cdbe70 lightgoldenrod4:8b814c lightyellow1:ffffe0 "
+    "lightyellow2:eeeed1 lightyellow3:cdcdb4 lightyellow4:8b8b7a "
+    "yellow1:ffff00 yellow2:eeee00 yellow3:cdcd00 yellow4:8b8b00 "
+    "gold1:ffd700 gold2:eec900 gold3:cdad00 gold4:8b7500 "
+    "goldenrod1:ffc125 goldenrod2:eeb422 goldenrod3:cd9b1d "
+    "goldenrod4:8b6914 darkgoldenrod1:ffb90f darkgoldenrod2:eead0e "
+    "darkgoldenrod3:cd950c darkgoldenrod4:8b6508 rosybrown1:ffc1c1 "
+    "rosybrown2:eeb4b4 rosybrown3:cd9b9b rosybrown4:8b6969 "
+    "indianred1:ff6a6a indianred2:ee6363 indianred3:cd5555 "
+    "indianred4:8b3a3a sienna1:ff8247 sienna2:ee7942 sienna3:cd6839 "
+    "sienna4:8b4726 burlywood1:ffd39b burlywood2:eec591 burlywood3:cdaa7d "
+    "burlywood4:8b7355 wheat1:ffe7ba wheat2:eed8ae wheat3:cdba96 "
+    "wheat4:8b7e66 tan1:ffa54f tan2:ee9a49 tan3:cd853f tan4:8b5a2b "
+    "chocolate1:ff7f24 chocolate2:ee7621 chocolate3:cd661d "
+    "chocolate4:8b4513 firebrick1:ff3030 firebrick2:ee2c2c "
+    "firebrick3:cd2626 firebrick4:8b1a1a brown1:ff4040 brown2:ee3b3b "
+    "brown3:cd3333 brown4:8b2323 salmon1:ff8c69 salmon2:ee8262 "
+    "salmon3:cd7054 salmon4:8b4c39 lightsalmon1:ffa07a "
+    "lightsalmon2:ee9572 lightsalmon3:cd8162 lightsalmon4:8b5742 "
+    "orange1:ffa500 orange2:ee9a00 orange3:cd8500 orange4:8b5a00 "
+    "darkorange1:ff7f00 darkorange2:ee7600 darkorange3:cd6600 "
+    "darkorange4:8b4500 coral1:ff7256 coral2:ee6a50 coral3:cd5b45 "
+    "coral4:8b3e2f tomato1:ff6347 tomato2:ee5c42 tomato3:cd4f39 "
+    "tomato4:8b3626 orangered1:ff4500 orangered2:ee4000 orangered3:cd3700 "
+    "orangered4:8b2500 red1:ff0000 red2:ee0000 red3:cd0000 red4:8b0000 "
+    "debianred:d70751 deeppink1:ff1493 deeppink2:ee1289 deeppink3:cd1076 "
+    "deeppink4:8b0a50 hotpink1:ff6eb4 hotpink2:ee6aa7 hotpink3:cd6090 "
+    "hotpink4:8b3a62 pink1:ffb5c5 pink2:eea9b8 pink3:cd919e pink4:8b636c "
+    "lightpink1:ffaeb9 lightpink2:eea2ad lightpink3:cd8c95 "
+    "lightpink4:8b5f65 palevioletred1:ff82ab palevioletred2:ee799f "
+    "palevioletred3:cd6889 palevioletred4:8b475d maroon1:ff34b3 "
+    "maroon2:ee30a7 maroon3:cd2990 maroon4:8b1c62 violetred1:ff3e96 "
+    "violetred2:ee3a8c violetred3:cd3278 violetred4:8b2252 "
+    "magenta1:ff00ff magenta2:ee00ee magenta3:cd00cd magenta4:8b008b "
+    "orchid1:ff83fa orchid2:ee7ae9 orchid3:cd69c9 orchid4:8b4789 "
+    "plum1:ffbbff plum2:eeaeee plum3:cd96cd plum4:8b668b "
+    "mediumorchid1:e066ff mediumorchid2:d15fee mediumorchid3:b452cd "
+    "mediumorchid4:7a378b darkorchid1:bf3eff darkorchid2:b23aee "
+    "darkorchid3:9a32cd darkorchid4:68228b purple1:9b30ff purple2:912cee "
+    "purple3:7d26cd purple4:551a8b mediumpurple1:ab82ff "
+    "mediumpurple2:9f79ee mediumpurple3:8968cd mediumpurple4:5d478b "
+    "thistle1:ffe1ff thistle2:eed2ee thistle3:cdb5cd thistle4:8b7b8b "
+    "darkcyan:008b8b darkmagenta:8b008b aqua:00ffff fuchsia:ff00ff "
+    "x11gray:bebebe x11grey:bebebe x11green:00ff00 x11maroon:b03060 "
+    "x11purple:a020f0 webgray:808080 webgrey:808080 webgreen:008000 "
+    "webmaroon:800000 webpurple:800080")
+
+# A 5x7 bitmap font for the printable ASCII characters. Each character is
+#   five column bytes, least significant bit at the top.
+_FONT_5X7 = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14" "242a7f2a12"
+    "2313086462" "3649552250" "0005030000" "001c224100" "0041221c00"
+    "082a1c2a08" "08083e0808" "0050300000" "0808080808" "0060600000"
+    "2010080402" "3e5149453e" "00427f4000" "4261514946" "2141454b31"
+    "1814127f10" "2745454539" "3c4a494930" "0171090503" "3649494936"
+    "064949291e" "0036360000" "0056360000" "0008142241" "1414141414"
+    "4122140800" "0201510906" "324979413e" "7e1111117e" "7f49494936"
+    "3e41414122" "7f4141221c" "7f49494941" "7f09090101" "3e41415132"
+    "7f0808087f" "00417f4100" "2040413f01" "7f08142241" "7f40404040"
+    "7f0204027f" "7f0408107f" "3e4141413e" "7f09090906" "3e4151215e"
+    "7f09192946" "4649494931" "01017f0101" "3f4040403f" "1f2040201f"
+    "7f2018207f" "6314081463" "0304780403" "6151494543" "00007f4141"
+    "0204081020" "41417f0000" "0402010204" "4040404040" "0001020400"
+    "2054545478" "7f48444438" "3844444420" "384444487f" "3854545418"
+    "087e090102" "081454543c" "7f08040478" "00447d4000" "2040443d00"
+    "007f102844" "00417f4000" "7c04180478" "7c08040478" "3844444438"
+    "7c14141408" "081414187c" "7c08040408" "4854545420"
+    "043f444020" "3c4040207c" "1c2040201c" "3c4030403c" "4428102844"
+    "0c5050503c" "4464544c44" "0008364100" "00007f0000" "0041360800"
+    "1008081008")
+
+
+@lru_cache(maxsize=None)
+def _x11_colours():
+    # The X11 colour names, as a dict of (red, green, blue) tuples
+    return {name: tuple(bytes.fromhex(rgb)) for name, rgb in
+            (entry.split(":") for entry in _X11_COLOURS.split())}
+
+
+def _parse_colour(colour):
+    # Converts a Tk colour name or #rgb specification into three bytes
+    name = colour.replace(" ", "").lower()
+    rgb = None
+    if name in _COLOUR_NAMES:
+        rgb = _COLOUR_NAMES[name]
+    elif name in _x11_colours():
+        rgb = _x11_colours()[name]
+    elif name.startswith("#") and len(name) in (4, 7, 10, 13):
+        digits = (len(name) - 1) // 3
+        try:
+            parts = [int(name[1+i*digits:1+(i+1)*digits], 16)
+                     for i in range(3)]
+        except ValueError:
+            parts = None
+        if parts is not None:
+            top = 16 ** digits - 1
+            rgb = tuple(p * 255 // top for p in parts)
+    elif name[:4] in ("grey", "gray") and name[4:].isdigit():
+        level = int(name[4:])
+        if level <= 100:
+            rgb = (round(level * 255 / 100),) * 3
+    if rgb is None:
+        raise GraphixError(f"Unknown colour name '{colour}'")
+    return bytes(rgb)
+
+
+def _png(width, height, pixels):
+    # Encodes width*height*3 bytes of RGB data as a PNG file
+    stride = width * 3
+    raw = bytearray()
+    for row in range(height):
+        raw.append(0)
+        raw += pixels[row*stride:(row+1)*stride]
+
+    def chunk(kind, data):
+        body = kind + data
+        return (struct.pack(">I", len(data)) + body +
+                struct.pack(">I", zlib.crc32(body) & 0xffffffff))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(bytes(raw), 9)) +
+            chunk(b"IEND", b""))
+
+
+def _font_scale(size):
+    # Glyph magnification used for a font size in points
+    return max(1, size // 7)
+
+
+def _text_extent(text, size):
+    # Width and height in pixels of text drawn with the bitmap font
+    scale = _font_scale(size)
+    lines = text.split("\n")
+    width = max(len(line) for line in lines) * 6 * scale - scale
+    height = len(lines) * 9 * scale - 2 * scale
+    return max(width, 0), height
+
+
+def _anchor_origin(x, y, width, height, anchor):
+    # Top left corner of a block of text or an image placed at (x, y) with
+    #   a Tk anchor
+    if anchor == "center":
+        anchor = ""
+    if "w" in anchor:
+        left = x
+    elif "e" in anchor:
+        left = x - width
+    else:
+        left = x - width // 2
+    if "n" in anchor:
+        top = y
+    elif "s" in anchor:
+        top = y - height
+    else:
+        top = y - height // 2
+    return left, top
+
+
+class _RasterItem:
+    # One entry in the display list of a _RasterCanvas
+
+    __slots__ = ["kind", "coords", "options", "tags"]
+
+    def __init__(self, kind, coords, options, tags):
+        self.kind = kind
+        self.coords = coords
+        self.options = options
+        self.tags = tags
+
+
+class _RasterCanvas:
+    # Backend that draws into an in-memory RGB image.
+
+    __slots__ = ["_width", "_height", "_bg", "_items", "_tagged", "_next_id",
+                 "_image", "_colour_cache", "_timers", "_timer_queue",
+                 "_timer_count", "_idle"]
+
+    def __init__(self, width, height):
+        self._width = width
+        self._height = height
+        self._bg = "white"
+        self._items = {}
+        # Maps each tag to the ids of the items carrying it, in order
+        self._tagged = {}
+        self._next_id = 1
+        self._image = None
+        self._colour_cache = {"": None}
+        # Callbacks scheduled with after, by id, and a heap of
+        #   (due time, sequence number, id) giving the order they run in
+        self._timers = {}
+        self._timer_queue = []
+        self._timer_count = 0
+        # Callbacks scheduled with after_idle, in order
+        self._idle = []
+
+    # -- the parts of the tk.Canvas interface used by the library --
+
+    def cget(self, option):
+        if option == "bg":
+            return self._bg
+        if option == "width":
+            return str(self._width)
+        if option == "height":
+            return str(self._height)
+        raise GraphixError(BAD_OPTION)
+
+    def config(self, bg=None):
+        if bg is not None:
+            self._rgb(bg)
+            self._bg = bg
+            self._image = None
+
+    configure = config
+
+    def update(self):
+        # Runs any idle callbacks and then any timer callbacks that are due
+        self.update_idletasks()
+        now = time.monotonic()
+        queue = self._timer_queue
+        while queue and queue[0][0] <= now:
+            _, _, timer_id = heapq.heappop(queue)
+            callback = self._timers.pop(timer_id, None)
+            if callback is not None:
+                callback[0](*callback[1])
+
+    def update_idletasks(self):
+        while self._idle:
+            func, args = self._idle.pop(0)
+            func(*args)
+
+    def after_idle(self, func, *args):
+        self._idle.append((func, args))
+
+    def after(self, ms, func, *args):
+        self._timer_count += 1
+        timer_id = f"after#{self._timer_count}"
+        self._timers[timer_id] = (func, args)
+        heapq.heappush(self._timer_queue, (time.monotonic() + ms / 1000,
+                                           self._timer_count, timer_id))
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self._timers.pop(timer_id, None)
+
+    def wait(self):
+        # Sleeps until the next timer is due and runs it. There are no
+        #   input events, so waiting with no timers would never end.
+        queue = self._timer_queue
+        while queue and queue[0][2] not in self._timers:
+            heapq.heappop(queue)
+        if not queue:
+            raise GraphixError("Nothing to wait for in a headless window")
+        delay = queue[0][0] - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.update()
+
+    def create_rectangle(self, *args):
+        return self._create("rectangle", args)
+
+    def create_oval(self, *args):
+        return self._create("oval", args)
+
+    def create_line(self, *args):
+        return self._create("line", args)
+
+    def create_polygon(self, *args):
+        return self._create("polygon", args)
+
+    def create_text(self, *args):
+        return self._create("text", args)
+
+    def create_image(self, *args):
+        # The image option is (width, height, RGB data) rather than a
+        #   Tk image
+        return self._create("image", args)
+
+    def delete(self, item_id):
+        if item_id == "all":
+            self._items.clear()
+            self._tagged.clear()
+        else:
+            for found in self._find(item_id):
+                self._untag(found, self._items.pop(found).tags)
+        self._image = None
+
+    def move(self, item_id, dx, dy):
+        for found in self._find(item_id):
+            coords = self._items[found].coords
+            if len(coords) <= 100:
+                for i in range(0, len(coords), 2):
+                    coords[i] += dx
+                    coords[i+1] += dy
+            else:
+                # Long lines and polygons move faster a slice at a time
+                coords[0::2] = [x + dx for x in coords[0::2]]
+                coords[1::2] = [y + dy for y in coords[1::2]]
+            self._image = None
+
+    def coords(self, item_id, *args):
+        item = self._items[self._find(item_id)[0]]
+        if len(args) == 1:
+            args = args[0]
+        if args:
+            item.coords = list(args)
+            self._image = None
+        return list(item.coords)
+
+    def itemconfig(self, item_id, options=None, **kw):
+        if options:
+            kw.update(options)
+        self._check_options(kw)
+        tags = kw.pop("tags", None)
+        for found in self._find(item_id):
+            item = self._items[found]
+            item.options.update(kw)
+            if tags is not None:
+                self._retag(found, item, self._tag_tuple(tags))
+            self._image = None
+
+    itemconfigure = itemconfig
+
+    def bbox(self, item_id):
+        boxes = [box for box in map(self._item_bbox, self._find(item_id))
+                 if box is not None]
+        if not boxes:
+            return None
+        return (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+    def find_withtag(self, tag_or_id):
+        return tuple(self._find(tag_or_id))
+
+    def find_all(self):
+        return tuple(self._items)
+
+    def addtag_withtag(self, new_tag, tag_or_id):
+        for found in self._find(tag_or_id):
+            item = self._items[found]
+            if new_tag not in item.tags:
+                self._retag(found, item, item.tags + (new_tag,))
+
+    def dtag(self, tag_or_id, tag=None):
+        if tag is None:
+            tag = tag_or_id
+        for found in self._find(tag_or_id):
+            item = self._items[found]
+            if tag in item.tags:
+                self._retag(found, item,
+                            tuple(t for t in item.tags if t != tag))
+
+    # -- image output --
+
+    def render(self):
+        """Returns the image as width*height*3 bytes of RGB data."""
+        if self._image is None:
+            width, height = self._width, self._height
+            buf = bytearray(self._rgb(self._bg) * (width * height))
+            painters = {"rectangle": self._paint_rectangle,
+                        "oval": self._paint_oval,
+                        "line": self._paint_line,
+                        "polygon": self._paint_polygon,
+                        "text": self._paint_text,
+                        "image": self._paint_image}
+            for item in self._items.values():
+                painters[item.kind](buf, item.coords, item.options)
+            self._image = bytes(buf)
+        return self._image
+
+    def to_ppm(self):
+        """Returns the image encoded as a binary PPM file."""
+        header = f"P6\n{self._width} {self._height}\n255\n".encode("ascii")
+        return header + self.render()
+
+    def to_png(self):
+        """Returns the image encoded as a PNG file."""
+        return _png(self._width, self._height, self.render())
+
+    # -- helpers --
+
+    def _create(self, kind, args):
+        if args and isinstance(args[-1], dict):
+            options = dict(args[-1])
+            args = args[:-1]
+        else:
+            options = {}
+        self._check_options(options)
+        tags = self._tag_tuple(options.pop("tags", ()))
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = _RasterItem(kind, list(args), options, ())
+        if tags:
+            self._retag(item_id, self._items[item_id], tags)
+        self._image = None
+        return item_id
+
+    def _find(self, tag_or_id):
+        # The ids of the items matching a Tk item id or tag, bottom first
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self._items else []
+        if tag_or_id == "all":
+            return list(self._items)
+        return list(self._tagged.get(tag_or_id, ()))
+
+    @staticmethod
+    def _tag_tuple(tags):
+        return tuple(tags.split()) if isinstance(tags, str) else tuple(tags)
+
+    def _untag(self, item_id, tags):
+        for tag in tags:
+            members = self._tagged[tag]
+            del members[item_id]
+            if not members:
+                del self._tagged[tag]
+
+    def _retag(self, item_id, item, tags):
+        self._untag(item_id, item.tags)
+        for tag in tags:
+            self._tagged.setdefault(tag, {})[item_id] = None
+        item.tags = tags
+
+    def _item_bbox(self, item_id):
+        item = self._items[item_id]
+        if item.kind == "text":
+            options = item.options
+            if not options.get("text"):
+                return None
+            size = options.get("font", DEFAULT_CONFIG["font"])[1]
+            width, height = _text_extent(options["text"], size)
+            x, y = item.coords
+            left, top = _anchor_origin(x, y, width, height,
+                                     options.get("anchor", "center"))
+            return (left, top, left + width, top + height)
+        if item.kind == "image":
+            width, height, _ = item.options["image"]
+            x, y = item.coords
+            left, top = _anchor_origin(x, y, width, height,
+                                       item.options.get("anchor", "center"))
+            return (left, top, left + width, top + height)
+        pad = (self._width_of(item.options) + 1) // 2
+        xs, ys = item.coords[0::2], item.coords[1::2]
+        return (math.floor(min(xs)) - pad, math.floor(min(ys)) - pad,
+                math.ceil(max(xs)) + pad, math.ceil(max(ys)) + pad)
+
+    def _check_options(self, options):
+        for option in ("fill", "outline"):
+            if option in options:
+                self._rgb(options[option])
+
+    def _rgb(self, colour):
+        # Converts a Tk colour specification into three bytes, or None for
+        #   the empty (transparent) colour
+        try:
+            return self._colour_cache[colour]
+        except KeyError:
+            pass
+        self._colour_cache[colour] = _parse_colour(colour)
+        return self._colour_cache[colour]
+
+    def _span(self, buf, y, x0, x1, rgb):
+        # Paints pixels x0 <= x < x1 of row y, clipped to the image
+        if y < 0 or y >= self._height:
+            return
+        if x0 < 0:
+            x0 = 0
+        if x1 > self._width:
+            x1 = self._width
+        if x0 < x1:
+            start = (y * self._width + x0) * 3
+            buf[start:start + (x1-x0) * 3] = rgb * (x1 - x0)
+
+    def _box(self, buf, x0, y0, x1, y1, rgb):
+        for y in range(max(y0, 0), min(y1, self._height)):
+            self._span(buf, y, x0, x1, rgb)
+
+    def _fill_polygon(self, buf, points, rgb):
+        # Even-odd scanline fill sampled at pixel centres
+        ys = [p[1] for p in points]
+        top = max(math.floor(min(ys)), 0)
+        bottom = min(math.ceil(max(ys)), self._height)
+        edges = list(zip(points, points[1:] + points[:1]))
+        for y in range(top, bottom):
+            centre = y + 0.5
+            crossings = []
+            for (xa, ya), (xb, yb) in edges:
+                if (ya <= centre < yb) or (yb <= centre < ya):
+                    crossings.append(xa + (centre-ya) * (xb-xa) / (yb-ya))
+            crossings.sort()
+            for i in range(0, len(crossings) - 1, 2):
+                self._span(buf, y, math.ceil(crossings[i] - 0.5),
+                           math.ceil(crossings[i+1] - 0.5), rgb)
+
+    def _stroke(self, buf, x0, y0, x1, y1, width, rgb):
+        # Draws a line segment of the given width with butt ends
+        if width <= 1:
+            dx, dy = abs(x1 - x0), -abs(y1 - y0)
+            sx = 1 if x0 < x1 else -1
+            sy = 1 if y0 < y1 else -1
+            err = dx + dy
+            x, y = round(x0), round(y0)
+            x1, y1 = round(x1), round(y1)
+            while True:
+                self._span(buf, y, x, x + 1, rgb)
+                if x == x1 and y == y1:
+                    break
+                e2 = 2 * err
+                if e2 >= dy:
+                    err += dy
+                    x += sx
+                if e2 <= dx:
+                    err += dx
+                    y += sy
+            return
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length == 0:
+            return
+        nx = -(y1 - y0) / length * width / 2
+        ny = (x1 - x0) / length * width / 2
+        self._fill_polygon(buf, [(x0+nx, y0+ny), (x1+nx, y1+ny),
+                                 (x1-nx, y1-ny), (x0-nx, y0-ny)], rgb)
+
+    def _arrowhead(self, buf, tip, tail, width, rgb):
+        # Tk's default arrow shape is (8, 10, 3)
+        length = math.hypot(tip[0] - tail[0], tip[1] - tail[1])
+        if length == 0:
+            return
+        ux = (tip[0] - tail[0]) / length
+        uy = (tip[1] - tail[1]) / length
+        spread = width / 2 + 3
+        x, y = tip
+        self._fill_polygon(buf, [(x, y),
+                                 (x - ux*10 - uy*spread, y - uy*10 + ux*spread),
+                                 (x - ux*8, y - uy*8),
+                                 (x - ux*10 + uy*spread, y - uy*10 - ux*spread)],
+                           rgb)
+
+    def _ellipse_span(self, cx, cy, rx, ry, y):
+        # Pixels of row y whose centres lie inside the ellipse
+        if rx <= 0 or ry <= 0:
+            return None
+        dy = (y + 0.5 - cy) / ry
+        if dy * dy > 1:
+            return None
+        half = rx * math.sqrt(1 - dy * dy)
+        x0 = math.ceil(cx - half - 0.5)
+        x1 = math.floor(cx + half - 0.5) + 1
+        return (x0, x1) if x0 < x1 else None
+
+    @staticmethod
+    def _width_of(options):
+        return int(float(options.get("width", 1)))
+
+    def _paint_rectangle(self, buf, coords, options):
+        x0, y0, x1, y1 = coords
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        fill = self._rgb(options.get("fill", ""))
+        if fill is not None:
+            self._box(buf, x0, y0, x1, y1, fill)
+        outline = self._rgb(options.get("outline", "black"))
+        width = self._width_of(options)
+        if outline is not None and width > 0:
+            low = width // 2
+            ox0, oy0 = x0 - low, y0 - low
+            ox1, oy1 = x1 + width - low, y1 + width - low
+            ix0, iy0, ix1, iy1 = ox0 + width, oy0 + width, ox1 - width, oy1 - width
+            for y in range(max(oy0, 0), min(oy1, self._height)):
+                if iy0 <= y < iy1 and ix0 < ix1:
+                    self._span(buf, y, ox0, ix0, outline)
+                    self._span(buf, y, ix1, ox1, outline)
+                else:
+                    self._span(buf, y, ox0, ox1, outline)
+
+    def _paint_oval(self, buf, coords, options):
+        x0, y0, x1, y1 = coords
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = abs(x1 - x0) / 2, abs(y1 - y0) / 2
+        fill = self._rgb(options.get("fill", ""))
+        if fill is not None:
+            for y in range(max(math.floor(cy - ry), 0),
+                           min(math.ceil(cy + ry), self._height)):
+                span = self._ellipse_span(cx, cy, rx, ry, y)
+                if span:
+                    self._span(buf, y, span[0], span[1], fill)
+        outline = self._rgb(options.get("outline", "black"))
+        width = self._width_of(options)
+        if outline is not None and width > 0:
+            half = width / 2
+            for y in range(max(math.floor(cy - ry - half), 0),
+                           min(math.ceil(cy + ry + half), self._height)):
+                outer = self._ellipse_span(cx, cy, rx + half, ry + half, y)
+                if not outer:
+                    continue
+                inner = self._ellipse_span(cx, cy, rx - half, ry - half, y)
+                if inner:
+                    self._span(buf, y, outer[0], inner[0], outline)
+                    self._span(buf, y, inner[1], outer[1], outline)
+                else:
+                    self._span(buf, y, outer[0], outer[1], outline)
+
+    def _paint_line(self, buf, coords, options):
+        fill = self._rgb(options.get("fill", "black"))
+        if fill is None:
+            return
+        width = self._width_of(options)
+        points = list(zip(coords[0::2], coords[1::2]))
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            self._stroke(buf, x0, y0, x1, y1, width, fill)
+        arrow = options.get("arrow", "none")
+        if len(points) >= 2:
+            if arrow in ("first", "both"):
+                self._arrowhead(buf, points[0], points[1], width, fill)
+            if arrow in ("last", "both"):
+                self._arrowhead(buf, points[-1], points[-2], width, fill)
+
+    def _paint_polygon(self, buf, coords, options):
+        points = list(zip(coords[0::2], coords[1::2]))
+        if len(points) < 2:
+            return
+        fill = self._rgb(options.get("fill", "black"))
+        if fill is not None:
+            self._fill_polygon(buf, points, fill)
+        outline = self._rgb(options.get("outline", ""))
+        width = self._width_of(options)
+        if outline is not None and width > 0:
+            for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+                self._stroke(buf, x0, y0, x1, y1, width, outline)
+
+    def _paint_text(self, buf, coords, options):
+        # All typefaces are drawn with the built-in bitmap font
+        fill = self._rgb(options.get("fill", "black"))
+        text = options.get("text", "")
+        if fill is None or not text:
+            return
+        _, size, style = options.get("font", DEFAULT_CONFIG["font"])
+        scale = _font_scale(size)
+        width, height = _text_extent(text, size)
+        x, y = coords
+        left, top = _anchor_origin(x, y, width, height,
+                                 options.get("anchor", "center"))
+        justify = options.get("justify", "center")
+        for row, line in enumerate(text.split("\n")):
+            line_width = max(len(line) * 6 * scale - scale, 0)
+            if justify == "center":
+                line_left = left + (width - line_width) // 2
+            elif justify == "right":
+                line_left = left + width - line_width
+            else:
+                line_left = left
+            line_top = top + row * 9 * scale
+            for i, char in enumerate(line):
+                code = ord(char)
+                if not 32 <= code <= 126:
+                    code = ord("?")
+                glyph = _FONT_5X7[(code-32)*5:(code-31)*5]
+                char_left = line_left + i * 6 * scale
+                for bit in range(7):
+                    shear = (6 - bit) // 3 * scale if "italic" in style else 0
+                    py = line_top + bit * scale
+                    for column, bits in enumerate(glyph):
+                        if bits >> bit & 1:
+                            px = char_left + column * scale + shear
+                            extra = 1 if "bold" in style else 0
+                            self._box(buf, px, py, px + scale + extra,
+                                      py + scale, fill)
+
+    def _paint_image(self, buf, coords, options):
+        # Copies the visible part of each image row straight into the buffer
+        width, height, data = options["image"]
+        x, y = coords
+        left, top = _anchor_origin(x, y, width, height,
+                                   options.get("anchor", "center"))
+        x0, x1 = max(left, 0), min(left + width, self._width)
+        if x0 >= x1:
+            return
+        stride = self._width * 3
+        for row in range(max(top, 0), min(top + height, self._height)):
+            start = ((row - top) * width + x0 - left) * 3
+            buf[row*stride + x0*3:row*stride + x1*3] = \
+                data[start:start + (x1 - x0) * 3]
+
+
+# Backends that can be selected by name; None stands for the Tk canvas
+_BACKENDS = {"tk": None, "headless": _RasterCanvas}
+
+
 def test() -> None:
     """A test function for the graphical classes."""
     win = Window()
@@ -1056,8 +5337,5 @@ def test() -> None:
 #MacOS fix 2
 #tk.Toplevel(_root).destroy()
 
-# MacOS fix 1
-update()
-
 if __name__ == "__main__":
     test()
@@ -0,0 +1,19 @@
+"""Fixtures shared by the tests."""
+
+import tkinter as tk
+
+import pytest
+
+from graphix import Window
+
+
+@pytest.fixture
+def tk_window():
+    # A Tk window that is only updated when asked, skipping the test where
+    #    there is no display
+    try:
+        win = Window("Test", 100, 100, autoflush=False, backend="tk")
+    except tk.TclError:
+        pytest.skip("needs a display")
+    yield win
+    win.close()
@@ -0,0 +1,40 @@
+"""Tests for Animator, which runs a function at a steady rate."""
+
+import time
+
+from graphix import Animator, Window
+
+
+def test_resume_in_on_frame_keeps_one_chain_of_ticks():
+    win = Window("Animator", 100, 100, backend="headless")
+    end = time.perf_counter() + 0.5
+
+    def on_frame(dt):
+        animator.pause()
+        animator.resume()
+        if time.perf_counter() >= end:
+            animator.stop()
+
+    animator = Animator(win, 50, on_frame)
+    animator.run()
+    # One chain runs about 25 ticks in half a second; two would run
+    #   over 60
+    assert animator.stats()["ticks"] <= 35
+
+
+def test_pause_in_on_frame_stops_the_steps():
+    win = Window("Animator", 100, 100, backend="headless")
+    frames = []
+
+    def on_frame(dt):
+        frames.append(dt)
+        animator.pause()
+
+    animator = Animator(win, 50, on_frame)
+    animator.start()
+    time.sleep(0.1)
+    win._backend.update()
+    time.sleep(0.1)
+    win._backend.update()
+    assert len(frames) == 1
+    assert animator.is_paused()
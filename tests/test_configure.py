@@ -0,0 +1,57 @@
+"""Tests for configure and configure_many."""
+
+import numpy as np
+import pytest
+
+import graphix
+from graphix import (Entry, GraphixError, Group, Point, Rectangle,
+                     RectangleArray, Text, Window, configure_many)
+
+
+def test_rejected_value_changes_nothing():
+    shape = Rectangle(Point(0, 0), Point(5, 5))
+    with pytest.raises(GraphixError):
+        shape.configure(fill_colour="red", outline_width="x")
+    assert shape.fill_colour == ""
+
+
+def test_shape_array_rejected_value_changes_nothing():
+    shapes = RectangleArray(np.array([[0, 0, 5, 5], [10, 10, 15, 15]]))
+    with pytest.raises(GraphixError):
+        shapes.configure(fill_colour="red", outline_width="x")
+    assert shapes.fill_colour == ""
+    assert list(shapes.fill_colours) == ["", ""]
+
+
+def test_entry_rejected_value_changes_nothing():
+    entry = Entry(Point(50, 50), 10)
+    with pytest.raises(GraphixError):
+        entry.configure(fill_colour="red", size="big")
+    assert entry.fill_colour == "grey"
+    entry.configure(fill_colour="red", size=12)
+    assert (entry.fill_colour, entry.size) == ("red", 12)
+
+
+def test_configure_many_rejected_value_changes_nothing():
+    win = Window("Configure", 100, 100, backend="headless")
+    shapes = [RectangleArray(np.array([[0, 0, 5, 5]])),
+              Rectangle(Point(0, 0), Point(5, 5))]
+    for shape in shapes:
+        shape.draw(win)
+    with pytest.raises(GraphixError):
+        configure_many(shapes, fill_colour="red", outline_width="x")
+    assert [shape.fill_colour for shape in shapes] == ["", ""]
+    assert list(shapes[0].fill_colours) == [""]
+
+
+def test_fonts_set_together_use_shared_named_fonts(tk_window):
+    labels = [Text(Point(20, 20 * i), "label") for i in range(1, 4)]
+    for label in labels[:2]:
+        label.draw(tk_window)
+    group = Group(labels[2:])
+    group.draw(tk_window)
+    configure_many(labels[:2], size=20)
+    group.configure(style="bold")
+    for label in labels:
+        name = graphix._named_font(label._config["font"])
+        assert tk_window.itemcget(label._id, "font") == name
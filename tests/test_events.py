@@ -0,0 +1,108 @@
+"""Tests for the event queue read by poll_events and next_event."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from graphix import GraphixError, Window
+
+
+def click(win, x, y):
+    win._on_click(SimpleNamespace(x=x, y=y))
+
+
+def press(win, key):
+    win._on_key(SimpleNamespace(keysym=key))
+
+
+def test_events_come_oldest_first():
+    win = Window("Events", 100, 100, backend="headless")
+    click(win, 1, 2)
+    press(win, "a")
+    events = win.poll_events()
+    assert [(e.kind, e.x, e.y, e.key) for e in events] == \
+        [("mouse", 1, 2, ""), ("key", None, None, "a")]
+    assert events[0].get_point().x == 1
+    assert win.poll_events() == []
+
+
+def test_limit_leaves_the_rest_queued():
+    win = Window("Events", 100, 100, backend="headless")
+    for key in "abcde":
+        press(win, key)
+    assert [e.key for e in win.poll_events(limit=2)] == ["a", "b"]
+    assert [e.key for e in win.poll_events(limit=0)] == []
+    assert [e.key for e in win.poll_events()] == ["c", "d", "e"]
+
+
+def test_bad_limit():
+    win = Window("Events", 100, 100, backend="headless")
+    for limit in (-1, 1.5):
+        with pytest.raises(GraphixError):
+            win.poll_events(limit=limit)
+
+
+def test_coalesce_merges_runs():
+    win = Window("Events", 100, 100, backend="headless")
+    for _ in range(3):
+        press(win, "Left")
+    click(win, 5, 5)
+    click(win, 5, 5)
+    click(win, 6, 5)
+    press(win, "Left")
+    events = win.poll_events(coalesce=True)
+    assert [(e.kind, e.key, e.x, e.count) for e in events] == [
+        ("key", "Left", None, 3), ("mouse", "", 5, 2), ("mouse", "", 6, 1),
+        ("key", "Left", None, 1)]
+
+
+def test_coalesce_with_limit():
+    win = Window("Events", 100, 100, backend="headless")
+    for key in "aaabbc":
+        press(win, key)
+    events = win.poll_events(limit=2, coalesce=True)
+    assert [(e.key, e.count) for e in events] == [("a", 3), ("b", 2)]
+    assert [e.key for e in win.poll_events()] == ["c"]
+
+
+def test_full_queue_drops_oldest():
+    win = Window("Events", 100, 100, backend="headless", max_events=3)
+    for key in "abcde":
+        press(win, key)
+    assert win.dropped_events() == 2
+    assert [e.key for e in win.poll_events()] == ["c", "d", "e"]
+    press(win, "f")
+    assert win.dropped_events() == 2
+
+
+def test_queue_is_apart_from_check_key():
+    win = Window("Events", 100, 100, backend="headless")
+    press(win, "a")
+    assert win.check_key() == "a"
+    assert [e.key for e in win.poll_events()] == ["a"]
+
+
+def test_next_event_returns_queued_event():
+    win = Window("Events", 100, 100, backend="headless")
+    click(win, 3, 4)
+    event = win.next_event(timeout=0)
+    assert (event.x, event.y) == (3, 4)
+
+
+def test_next_event_waits_for_event():
+    win = Window("Events", 100, 100, backend="headless")
+    win._backend.after(50, press, win, "q")
+    start = time.monotonic()
+    event = win.next_event(timeout=5)
+    assert event.key == "q"
+    assert time.monotonic() - start < 1
+
+
+def test_next_event_times_out():
+    win = Window("Events", 100, 100, backend="headless")
+    start = time.monotonic()
+    assert win.next_event(timeout=0.1) is None
+    assert 0.09 <= time.monotonic() - start < 1
+    with pytest.raises(GraphixError):
+        win.next_event(timeout="soon")
@@ -0,0 +1,117 @@
+"""Tests for find_at and find_in and the spatial grid behind them."""
+
+import pytest
+
+from graphix import (Circle, Line, Point, Rectangle, Series, Window)
+
+
+def box(x1, y1, x2, y2):
+    return Rectangle(Point(x1, y1), Point(x2, y2))
+
+
+@pytest.fixture(params=["before", "after"])
+def win(request):
+    # A headless window whose grid is built either before the objects are
+    #    drawn, so they are added to it one by one, or after, by the first
+    #    query
+    window = Window("Find", 200, 200, backend="headless")
+    if request.param == "before":
+        window.find_at(Point(0, 0))
+    return window
+
+
+def test_find_at_and_find_in(win):
+    a = box(10, 10, 20, 20)
+    b = box(100, 100, 120, 120)
+    for shape in (a, b):
+        shape.draw(win)
+    assert win.find_at(Point(15, 15)) == [a]
+    assert win.find_at(Point(50, 50)) == []
+    assert win.find_in(box(0, 0, 50, 50)) == [a]
+    assert win.find_in(box(0, 0, 199, 199)) == [b, a]
+
+
+def test_after_move(win):
+    shape = box(10, 10, 20, 20)
+    shape.draw(win)
+    win.find_at(Point(15, 15))
+    shape.move(100, 50)
+    assert win.find_at(Point(15, 15)) == []
+    assert win.find_at(Point(115, 65)) == [shape]
+    assert win.find_in(box(100, 50, 130, 80)) == [shape]
+
+
+def test_after_move_in_batch(win):
+    shape = box(10, 10, 20, 20)
+    shape.draw(win)
+    with win.batch():
+        shape.move(40, 0)
+        shape.move(0, 40)
+        assert win.find_at(Point(55, 55)) == [shape]
+    assert win.find_at(Point(15, 15)) == []
+
+
+def test_after_undraw_and_redraw(win):
+    shape = box(10, 10, 20, 20)
+    shape.draw(win)
+    win.find_at(Point(15, 15))
+    shape.undraw()
+    assert win.find_at(Point(15, 15)) == []
+    assert win.find_in(box(0, 0, 50, 50)) == []
+    shape.move(30, 0)
+    shape.draw(win)
+    assert win.find_at(Point(15, 15)) == []
+    assert win.find_at(Point(45, 15)) == [shape]
+
+
+def test_items_spanning_many_cells(win):
+    wide = box(5, 40, 150, 45)
+    tall = Line(Point(70, 0), Point(70, 190))
+    for shape in (wide, tall):
+        shape.draw(win)
+    # Points in cells far from the corners of the bounding boxes
+    assert win.find_at(Point(130, 42)) == [wide]
+    assert win.find_at(Point(70, 170)) == [tall]
+    assert win.find_at(Point(70, 42)) == [tall, wide]
+    assert win.find_in(box(0, 30, 160, 50)) == [wide]
+
+
+def test_item_larger_than_the_grid_limit(win):
+    huge = box(-100000, -100000, 100000, 100000)
+    huge.draw(win)
+    assert win.find_at(Point(150, 150)) == [huge]
+    huge.move(200001, 0)
+    assert win.find_at(Point(150, 150)) == []
+
+
+def test_stacking_order(win):
+    bottom = box(0, 0, 50, 50)
+    middle = Circle(Point(25, 25), 20)
+    top = box(20, 20, 30, 30)
+    for shape in (bottom, middle, top):
+        shape.draw(win)
+    assert win.find_at(Point(25, 25)) == [top, middle, bottom]
+    assert win.find_at(Point(2, 2)) == [bottom]
+    assert win.find_in(box(-5, -5, 60, 60)) == [top, middle, bottom]
+    # Drawn again, an object goes on top
+    bottom.undraw()
+    bottom.draw(win)
+    assert win.find_at(Point(25, 25)) == [bottom, top, middle]
+
+
+def test_after_rate_limited_series_redraw(win):
+    series = Series(max_points=4, fps=1)
+    series.draw(win)
+    series.append(10, 10)
+    series.append(20, 10)
+    assert win.find_at(Point(15, 10)) == [series]
+    # Appended within a frame of the last redraw, so not yet sent to the
+    #    canvas, but found where it now reaches
+    series.append(20, 150)
+    assert series._redraw_pending
+    assert win.find_at(Point(20, 100)) == [series]
+    for y in (160, 170, 180):
+        series.append(30, y)
+    # The first points have been dropped
+    assert win.find_at(Point(15, 10)) == []
+    assert win.find_at(Point(25, 155)) == [series]
@@ -0,0 +1,72 @@
+"""Tests for Group."""
+
+import pytest
+
+from graphix import GraphixError, Group, Point, Rectangle, Window
+
+
+def canvas(win, shape):
+    item = win._backend._items[shape._id]
+    return item.coords, item.options.get("fill")
+
+
+def test_child_drawn_again_stays_in_group():
+    win = Window("Group", 100, 100, backend="headless")
+    a = Rectangle(Point(0, 0), Point(5, 5))
+    b = Rectangle(Point(10, 10), Point(15, 15))
+    group = Group([a, b])
+    group.draw(win)
+    # Bringing a child to the front
+    a.undraw()
+    a.draw(win)
+    group.move(10, 0)
+    assert canvas(win, a)[0] == [10, 0, 15, 5]
+    group.fill_colour = "red"
+    assert canvas(win, a)[1] == "red"
+    group.undraw()
+    assert win.get_items() == []
+    assert win._backend.find_all() == ()
+
+
+def test_nested_group_drawn_again_stays_in_group():
+    win = Window("Group", 100, 100, backend="headless")
+    a = Rectangle(Point(0, 0), Point(5, 5))
+    inner = Group([a])
+    outer = Group([inner, Rectangle(Point(20, 20), Point(25, 25))])
+    outer.draw(win)
+    inner.undraw()
+    inner.draw(win)
+    outer.move(0, 10)
+    assert canvas(win, a)[0] == [0, 10, 5, 15]
+
+
+def test_removed_child_drawn_again_leaves_group():
+    win = Window("Group", 100, 100, backend="headless")
+    a = Rectangle(Point(0, 0), Point(5, 5))
+    group = Group([a, Rectangle(Point(10, 10), Point(15, 15))])
+    group.draw(win)
+    group.remove(a)
+    a.undraw()
+    a.draw(win)
+    group.move(10, 0)
+    assert canvas(win, a)[0] == [0, 0, 5, 5]
+
+
+def test_attributes_are_checked_when_no_object_has_them():
+    group = Group()
+    width = group.outline_width
+    with pytest.raises(GraphixError):
+        group.fill_colour = 5
+    with pytest.raises(GraphixError):
+        group.outline_width = "wide"
+    assert group.fill_colour == "" and group.outline_width == width
+    group.fill_colour = "red"
+    assert group.fill_colour == "red"
+
+
+def test_rejected_configure_changes_nothing():
+    a = Rectangle(Point(0, 0), Point(5, 5))
+    group = Group([a])
+    with pytest.raises(GraphixError):
+        group.configure(fill_colour="red", outline_width="wide")
+    assert group.fill_colour == "" and a.fill_colour == ""
@@ -0,0 +1,90 @@
+"""Tests for the headless backend, which draws windows into memory."""
+
+import os
+import struct
+import zlib
+
+import pytest
+
+import graphix
+from graphix import (Circle, Entry, GraphixError, Line, Point, Polygon,
+                     Rectangle, Text, Window)
+
+
+def pixel(win, x, y):
+    data = win.get_pixels()
+    start = (y * win.width + x) * 3
+    return tuple(data[start:start + 3])
+
+
+def test_x11_colour_names():
+    win = Window("Headless", 40, 20, backend="headless")
+    for x, colour in ((0, "DarkSlateGray"), (20, "light sea green")):
+        box = Rectangle(Point(x, 0), Point(x + 19, 19))
+        box.fill_colour = colour
+        box.outline_colour = colour
+        box.draw(win)
+    assert pixel(win, 10, 10) == (47, 79, 79)
+    assert pixel(win, 30, 10) == (32, 178, 170)
+
+
+GOLDEN = os.path.join(os.path.dirname(__file__), "golden", "scene.png")
+
+
+def draw_scene(win):
+    # One of each kind of object, with outlines, arrows and text
+    win.background_colour = "ivory"
+    box = Rectangle(Point(10, 10), Point(60, 40))
+    box.fill_colour = "blue"
+    box.outline_width = 3
+    box.draw(win)
+    circle = Circle(Point(100, 60), 30)
+    circle.fill_colour = "red"
+    circle.outline_colour = "DarkSlateGray"
+    circle.draw(win)
+    line = Line(Point(5, 140), Point(190, 100))
+    line.arrow = "both"
+    line.outline_width = 2
+    line.draw(win)
+    triangle = Polygon([Point(150, 10), Point(190, 40), Point(140, 60)])
+    triangle.fill_colour = "green"
+    triangle.draw(win)
+    Text(Point(100, 120), "Hello, World! 123").draw(win)
+    Point(5, 5).draw(win)
+    box.move(5, 5)
+
+
+def read_png(data):
+    # Decodes the RGB data of a PNG written by the headless backend: one
+    #   IDAT chunk and no filtering
+    width, height = struct.unpack(">II", data[16:24])
+    start = data.index(b"IDAT") + 4
+    length = struct.unpack(">I", data[start - 8:start - 4])[0]
+    raw = zlib.decompress(data[start:start + length])
+    stride = width * 3 + 1
+    return b"".join(raw[row * stride + 1:(row + 1) * stride]
+                    for row in range(height))
+
+
+def test_scene_matches_golden_image():
+    # Set GRAPHIX_UPDATE_GOLDEN=1 to write a new golden image after a
+    #   deliberate change to how things are drawn
+    win = Window("Golden", 200, 150, backend="headless")
+    draw_scene(win)
+    if os.environ.get("GRAPHIX_UPDATE_GOLDEN"):
+        win.save_image(GOLDEN)
+    with open(GOLDEN, "rb") as golden_file:
+        expected = read_png(golden_file.read())
+    assert win.get_pixels() == expected
+
+
+def test_entry_left_undrawn_when_headless_rejects_it():
+    win = Window("Headless", 100, 100, backend="headless")
+    entry = Entry(Point(50, 50), 10)
+    with pytest.raises(GraphixError):
+        entry.draw(win)
+    assert not entry.is_drawn()
+    other = Window("Headless", 100, 100, backend="headless")
+    with pytest.raises(GraphixError, match=graphix.UNSUPPORTED_METHOD):
+        entry.draw(other)
+    assert win.get_items() == []
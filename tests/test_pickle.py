@@ -0,0 +1,105 @@
+"""Tests for pickling objects and building them in worker processes."""
+
+import pickle
+
+import pytest
+
+from graphix import (Circle, CircleArray, Entry, Group, Line, LineArray,
+                     Oval, PixelImage, Point, Polygon, Polyline, Rectangle,
+                     RectangleArray, Series, Text, Window, build_parallel)
+
+
+def shapes():
+    # One styled object of every class that can be drawn headless
+    box = Rectangle(Point(5, 5), Point(30, 20))
+    box.fill_colour = "blue"
+    box.outline_width = 2
+    line = Line(Point(5, 30), Point(60, 40))
+    line.arrow = "last"
+    text = Text(Point(60, 80), "pickled")
+    text.size = 14
+    image = PixelImage(8, 8, Point(100, 60))
+    image.set_pixel(2, 2, "red")
+    series = Series.from_coords([0, 88, 10, 80, 20, 85], max_points=2)
+    group = Group([Circle(Point(20, 60), 5), Point(3, 3)])
+    return [Point(1, 1), box, Oval(Point(35, 5), Point(60, 20)),
+            Circle(Point(80, 15), 10), line,
+            Polygon([Point(70, 30), Point(100, 35), Point(80, 50)]),
+            Polyline([Point(60, 60), Point(70, 70), Point(80, 60)]),
+            series, text, image,
+            RectangleArray([[5, 50, 15, 60], [20, 50, 30, 60]]),
+            CircleArray([[40, 55], [50, 55]], 4),
+            LineArray([[5, 70, 30, 85]]), group]
+
+
+def pixels(obj):
+    # What obj looks like drawn alone in a headless window
+    win = Window("Pickle", 120, 90, backend="headless")
+    obj.draw(win)
+    return win.get_pixels()
+
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+@pytest.mark.parametrize("index", range(len(shapes())))
+def test_undrawn_object_round_trip(index):
+    obj = shapes()[index]
+    copy = round_trip(obj)
+    assert type(copy) is type(obj)
+    assert repr(copy) == repr(obj)
+    assert not copy.is_drawn()
+    assert pixels(copy) == pixels(obj)
+
+
+@pytest.mark.parametrize("index", range(len(shapes())))
+def test_drawn_object_pickles_undrawn(index):
+    obj = shapes()[index]
+    win = Window("Pickle", 120, 90, backend="headless")
+    obj.draw(win)
+    copy = round_trip(obj)
+    assert obj.is_drawn()
+    assert not copy.is_drawn()
+    assert pixels(copy) == win.get_pixels()
+
+
+def test_object_drawn_and_undrawn_round_trip():
+    win = Window("Pickle", 120, 90, backend="headless")
+    series = Series(max_points=3)
+    series.draw(win)
+    for i in range(6):
+        series.append(i * 10, 80 - i)
+    series.undraw()
+    copy = round_trip(series)
+    assert list(copy.get_coords()) == list(series.get_coords())
+    copy.draw(win)
+    copy.append(60, 70)
+    assert len(copy) == 3
+
+
+def test_entry_round_trip():
+    entry = Entry(Point(50, 50), 12)
+    entry.text = "pickled"
+    copy = round_trip(entry)
+    assert copy.text == "pickled"
+    assert repr(copy) == repr(entry)
+
+
+def make_boxes(row):
+    # Built in a worker process by build_parallel
+    return [Rectangle(Point(col * 10, row * 10),
+                      Point(col * 10 + 8, row * 10 + 8)) for col in range(5)]
+
+
+def test_build_parallel_draws_in_order():
+    win = Window("Pickle", 60, 60, backend="headless")
+    built = build_parallel(make_boxes, range(4), win, workers=2)
+    assert len(built) == 20
+    assert win.get_items() == built
+    assert [box.get_p1().y for box in built[::5]] == [0, 10, 20, 30]
+    expected = Window("Pickle", 60, 60, backend="headless")
+    for row in range(4):
+        for box in make_boxes(row):
+            box.draw(expected)
+    assert win.get_pixels() == expected.get_pixels()
@@ -0,0 +1,85 @@
+"""Tests for PixelImage, the image whose pixels are set one at a time."""
+
+import pytest
+
+from graphix import GraphixError, PixelImage, Window
+
+
+def shown(win, image):
+    # The pixels the window shows where the image is drawn at (0, 0)
+    data = win.get_pixels()
+    stride = win.width * 3
+    row_bytes = image.width * 3
+    return b"".join(data[row * stride:row * stride + row_bytes]
+                    for row in range(image.height))
+
+
+def drawn_image(width=20, height=10):
+    win = Window("Pixels", 40, 30, backend="headless")
+    image = PixelImage(width, height)
+    image.draw(win)
+    return win, image
+
+
+def test_set_pixel():
+    win, image = drawn_image()
+    image.set_pixel(3, 4, "red")
+    image.set_pixel(19, 9, (1, 2, 3))
+    assert image.get_pixel(3, 4) == (255, 0, 0)
+    assert shown(win, image) == bytes(image.get_buffer())
+    assert win.get_pixels()[(9 * 40 + 19) * 3:(9 * 40 + 20) * 3] == \
+        b"\x01\x02\x03"
+
+
+def test_set_pixel_outside_image():
+    image = PixelImage(20, 10)
+    with pytest.raises(GraphixError):
+        image.set_pixel(20, 0, "red")
+    with pytest.raises(GraphixError):
+        image.set_pixel(0.5, 0, "red")
+
+
+def test_set_region():
+    win, image = drawn_image()
+    image.set_region(2, 3, 4, 2, bytes(range(24)))
+    assert image.get_pixel(2, 3) == (0, 1, 2)
+    assert image.get_pixel(5, 4) == (21, 22, 23)
+    assert shown(win, image) == bytes(image.get_buffer())
+
+
+def test_set_region_rejects_bad_data():
+    image = PixelImage(20, 10)
+    with pytest.raises(GraphixError):
+        image.set_region(0, 0, 2, 2, "not bytes")
+    with pytest.raises(GraphixError):
+        image.set_region(0, 0, 2, 2, bytes(11))
+    with pytest.raises(GraphixError):
+        image.set_region(19, 0, 2, 1, bytes(6))
+    assert bytes(image.get_buffer()) == b"\xff" * (20 * 10 * 3)
+
+
+def test_get_array_and_mark_dirty():
+    win, image = drawn_image()
+    win.get_pixels()
+    pixels = image.get_array()
+    assert pixels.shape == (10, 20, 3)
+    pixels[2:4, 5:9] = (0, 128, 255)
+    image.mark_dirty(5, 2, 4, 2)
+    assert image.get_pixel(8, 3) == (0, 128, 255)
+    assert shown(win, image) == bytes(image.get_buffer())
+
+
+def test_mark_dirty_defaults_to_rest_of_image():
+    win, image = drawn_image()
+    win.get_pixels()
+    image.get_array()[9, 19] = (9, 9, 9)
+    image.mark_dirty(10, 5)
+    assert shown(win, image) == bytes(image.get_buffer())
+
+
+@pytest.mark.parametrize("region", [(30, 30), (0, 0, 21, 1), (-1, 0, 2, 2),
+                                    (0, 0, -1, 1), (0.5, 0), (0, 0, 1, "2")])
+def test_mark_dirty_rejects_bad_region(region):
+    image = PixelImage(20, 10)
+    with pytest.raises(GraphixError):
+        image.mark_dirty(*region)
@@ -0,0 +1,108 @@
+"""Tests for saving and loading scenes with save_scene and load_scene."""
+
+import io
+import struct
+
+import pytest
+
+import graphix
+from graphix import (Circle, CircleArray, Entry, GraphixError, Line,
+                     LineArray, Oval, PixelImage, Point, Polygon, Polyline,
+                     Rectangle, RectangleArray, Series, Text, Window)
+
+
+def draw_scene(win):
+    # One object of every kind that can be saved but Entry, which only Tk
+    #    windows can draw
+    win.background_colour = "LightYellow"
+    Point(3, 3).draw(win)
+    box = Rectangle(Point(5, 5), Point(30, 20))
+    box.fill_colour = "blue"
+    box.outline_width = 2
+    box.draw(win)
+    Oval(Point(35, 5), Point(60, 20)).draw(win)
+    circle = Circle(Point(80, 15), 10)
+    circle.fill_colour = "DarkSlateGray"
+    circle.draw(win)
+    line = Line(Point(5, 30), Point(60, 40))
+    line.arrow = "last"
+    line.draw(win)
+    Polygon([Point(70, 30), Point(100, 35), Point(80, 50)]).draw(win)
+    text = Text(Point(60, 80), "scene")
+    text.size = 14
+    text.draw(win)
+    image = PixelImage(8, 8, Point(100, 60))
+    image.set_pixel(2, 2, "red")
+    image.draw(win)
+    RectangleArray([[5, 50, 15, 60], [20, 50, 30, 60]]).draw(win)
+    CircleArray([[40, 55], [50, 55]], 4).draw(win)
+    LineArray([[5, 70, 30, 85]]).draw(win)
+    Polyline([Point(60, 60), Point(70, 70), Point(80, 60)]).draw(win)
+    series = Series.from_coords([0, 88, 10, 80, 20, 85], max_points=5)
+    series.draw(win)
+
+
+def saved_scene():
+    win = Window("Scene", 120, 90, backend="headless")
+    draw_scene(win)
+    scene_file = io.BytesIO()
+    win.save_scene(scene_file)
+    return win, scene_file.getvalue()
+
+
+def test_round_trip_keeps_every_kind(tmp_path):
+    win, _ = saved_scene()
+    path = tmp_path / "scene.grx"
+    win.save_scene(path)
+    loaded = Window.load_scene(path, backend="headless")
+    kinds = [type(obj) for obj in loaded.get_items()]
+    assert kinds == [type(obj) for obj in win.get_items()]
+    assert set(kinds) == set(graphix._scene_kinds()) - {Entry}
+    assert (loaded.width, loaded.height) == (120, 90)
+    assert loaded.background_colour == "LightYellow"
+    assert loaded.get_pixels() == win.get_pixels()
+
+
+def test_loaded_objects_can_be_changed():
+    _, data = saved_scene()
+    loaded = Window.load_scene(io.BytesIO(data), backend="headless")
+    series = loaded.get_items()[-1]
+    series.append(30, 70)
+    assert list(series.get_coords())[-2:] == [30, 70]
+
+
+def test_entry_round_trip(tk_window):
+    entry = Entry(Point(50, 50), 12)
+    entry.text = "saved"
+    entry.draw(tk_window)
+    scene_file = io.BytesIO()
+    tk_window.save_scene(scene_file)
+    scene_file.seek(0)
+    loaded = Window.load_scene(scene_file)
+    try:
+        [copy] = loaded.get_items()
+        assert copy.text == "saved"
+        assert copy.get_anchor().x == 50 and copy.get_anchor().y == 50
+    finally:
+        loaded.close()
+
+
+def test_bad_magic_number():
+    _, data = saved_scene()
+    with pytest.raises(GraphixError, match="Not a graphix scene file"):
+        Window.load_scene(io.BytesIO(b"GRXX" + data[4:]), backend="headless")
+
+
+def test_version_mismatch():
+    _, data = saved_scene()
+    data = data[:4] + struct.pack("<H", graphix._SCENE_VERSION + 1) + data[6:]
+    with pytest.raises(GraphixError, match="version"):
+        Window.load_scene(io.BytesIO(data), backend="headless")
+
+
+@pytest.mark.parametrize("fraction", [0.0, 0.1, 0.5, 0.9, 0.999])
+def test_truncated_file(fraction):
+    _, data = saved_scene()
+    size = max(5, int(len(data) * fraction))
+    with pytest.raises(GraphixError, match="truncated"):
+        Window.load_scene(io.BytesIO(data[:size]), backend="headless")
@@ -0,0 +1,66 @@
+"""Tests for Series, the appendable line for live charts."""
+
+import time
+
+from graphix import Group, Series, Window
+
+
+def settle(win):
+    # Lets any redraw waiting for its frame happen
+    time.sleep(0.03)
+    win._backend.update()
+
+
+def canvas_coords(series):
+    return list(series._canvas._backend.coords(series._id))
+
+
+def test_rolling_window_keeps_latest_points():
+    win = Window("Series", 100, 100, backend="headless")
+    series = Series(max_points=3)
+    series.draw(win)
+    for i in range(10):
+        series.append(i, i * 2)
+    assert len(series) == 3
+    assert list(series.get_coords()) == [7, 14, 8, 16, 9, 18]
+    settle(win)
+    assert canvas_coords(series) == [7, 14, 8, 16, 9, 18]
+
+
+def test_move_then_append_in_batch_moves_once():
+    win = Window("Series", 100, 100, backend="headless")
+    series = Series.from_coords([10, 10, 20, 20])
+    series.draw(win)
+    settle(win)
+    with win.batch():
+        series.move(5, 0)
+        series.append(30, 30)
+    settle(win)
+    assert list(series.get_coords()) == [15, 10, 25, 20, 30, 30]
+    assert canvas_coords(series) == [15, 10, 25, 20, 30, 30]
+
+
+def test_append_then_move_in_batch_moves_once():
+    win = Window("Series", 100, 100, backend="headless")
+    series = Series.from_coords([10, 10, 20, 20], fps=1000)
+    series.draw(win)
+    settle(win)
+    with win.batch():
+        series.append(30, 30)
+        series.move(5, 0)
+    settle(win)
+    assert canvas_coords(series) == list(series.get_coords())
+
+
+def test_group_move_in_batch_moves_series_once():
+    win = Window("Series", 100, 100, backend="headless")
+    series = Series.from_coords([10, 10, 20, 20])
+    group = Group([series])
+    group.draw(win)
+    settle(win)
+    with win.batch():
+        group.move(0, 5)
+        series.append(30, 30)
+    settle(win)
+    assert list(series.get_coords()) == [10, 15, 20, 25, 30, 30]
+    assert canvas_coords(series) == [10, 15, 20, 25, 30, 30]
@@ -0,0 +1,25 @@
+"""Tests for exporting windows as SVG images."""
+
+from graphix import Point, Rectangle, Window
+
+
+def draw_boxes(win):
+    for x, colour in ((0, "DarkSlateGray"), (20, "light sea green")):
+        box = Rectangle(Point(x, 0), Point(x + 19, 19))
+        box.fill_colour = colour
+        box.draw(win)
+
+
+def test_x11_colour_names_headless():
+    win = Window("SVG", 100, 100, backend="headless")
+    draw_boxes(win)
+    svg = win.export_svg_string()
+    assert 'fill="#2f4f4f"' in svg
+    assert 'fill="#20b2aa"' in svg
+
+
+def test_x11_colour_names_tk(tk_window):
+    draw_boxes(tk_window)
+    svg = tk_window.export_svg_string()
+    assert 'fill="#2f4f4f"' in svg
+    assert 'fill="#20b2aa"' in svg
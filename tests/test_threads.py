@@ -0,0 +1,94 @@
+"""Tests for drawing from other threads."""
+
+import sys
+import threading
+import time
+
+import graphix
+from graphix import PixelImage, Point, Rectangle, Window
+
+
+def pump(seconds):
+    # Handles Tk events for a while
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        graphix.update()
+        time.sleep(0.005)
+
+
+def test_idle_tk_window_backs_off(tk_window):
+    pump(1.0)
+    assert tk_window._drain_delay == graphix._DRAIN_IDLE_MS
+    shape = Rectangle(Point(1, 1), Point(5, 5))
+    worker = threading.Thread(target=shape.draw, args=(tk_window,))
+    worker.start()
+    worker.join()
+    # Queued calls still get made within one idle tick
+    pump(graphix._DRAIN_IDLE_MS / 1000 + 0.1)
+    assert shape in tk_window.get_items()
+
+
+def draw_from_thread(shape, win):
+    worker = threading.Thread(target=shape.draw, args=(win,))
+    worker.start()
+    worker.join()
+
+
+def test_move_before_queued_draw_is_made():
+    win = Window("Threads", 100, 100, autoflush=False, backend="headless")
+    win.find_at(Point(0, 0))
+    shape = Rectangle(Point(1, 1), Point(5, 5))
+    draw_from_thread(shape, win)
+    shape.move(10, 0)
+    assert win._backend.coords(shape._id) == [11, 1, 15, 5]
+    assert win.find_at(Point(13, 3)) == [shape]
+
+
+def test_calls_before_queued_draw_keep_their_order():
+    win = Window("Threads", 100, 100, autoflush=False, backend="headless")
+    shape = Rectangle(Point(1, 1), Point(5, 5))
+
+    def work():
+        shape.draw(win)
+        shape.fill_colour = "blue"
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join()
+    shape.fill_colour = "red"
+    assert win._backend._items[shape._id].options["fill"] == "red"
+
+
+def test_undraw_before_queued_draw_is_made():
+    win = Window("Threads", 100, 100, autoflush=False, backend="headless")
+    shape = Rectangle(Point(1, 1), Point(5, 5))
+    draw_from_thread(shape, win)
+    shape.undraw()
+    win.flush()
+    assert win.get_items() == []
+    assert win._backend.find_all() == ()
+
+
+def test_pixels_written_while_the_window_flushes_are_all_sent():
+    # A write that lands while the window's thread is sending the last
+    #    ones has to be sent too; many short bursts give it chances to
+    win = Window("Threads", 20, 20, autoflush=False, backend="headless")
+    image = PixelImage(20, 20)
+    image.draw(win)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for burst in range(200):
+            done = threading.Event()
+
+            def work():
+                for i in range(50):
+                    image.set_pixel(i % 20, burst % 20, (burst, i, 0))
+                done.set()
+            worker = threading.Thread(target=work)
+            worker.start()
+            while not done.is_set():
+                win.get_pixels()
+            worker.join()
+            assert win.get_pixels() == bytes(image.get_buffer())
+    finally:
+        sys.setswitchinterval(interval)
@@ -0,0 +1,39 @@
+"""Tests for the array-backed Polygon and Polyline."""
+
+import pytest
+
+from graphix import GraphixError, Point, Polygon, Polyline, Window
+
+
+def test_points_round_trip_after_move():
+    polygon = Polygon([Point(0, 0), Point(10, 0), Point(5, 8)])
+    polygon.move(2, 3)
+    assert [(p.x, p.y) for p in polygon.get_points()] == \
+        [(2, 3), (12, 3), (7, 11)]
+    assert list(polygon.get_coords()) == [2, 3, 12, 3, 7, 11]
+
+
+def test_points_must_be_points():
+    with pytest.raises(GraphixError):
+        Polygon([Point(0, 0), (1, 1)])
+    with pytest.raises(GraphixError):
+        Polyline((Point(0, 0), Point(1, 1)))
+
+
+def test_canvas_follows_moves():
+    win = Window("Vertices", 100, 100, backend="headless")
+    for count in (3, 60):
+        line = Polyline.from_coords(list(range(2 * count)))
+        line.draw(win)
+        line.move(1, -1)
+        assert win._backend.coords(line._id) == list(line.get_coords())
+
+
+def test_polyline_needs_two_points():
+    for points in ([], [Point(1, 1)]):
+        with pytest.raises(GraphixError, match="at least 2 points"):
+            Polyline(points)
+    for coords in ([], [1, 1]):
+        with pytest.raises(GraphixError, match="at least 2 points"):
+            Polyline.from_coords(coords)
+    assert len(Polyline.from_coords([1, 1, 2, 2]).get_points()) == 2